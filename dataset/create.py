@@ -13,7 +13,7 @@ from typing import Optional, Tuple, Type, Any
 import csv
 import copy
 import time
-import ast
+from src.services.utils import retry_delay_from_error
 # openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 class LLMSettings(BaseSettings):
@@ -94,7 +94,7 @@ def get_llm():
             max_tokens=max_new_tokens,
             is_chat_model=True,
             reuse_client=False,
-            max_retries=3,
+            max_retries=0,
             additional_kwargs={"extra_body": extra_arguments},
         )
     
@@ -110,7 +110,7 @@ def get_llm():
             max_tokens=max_new_tokens,
             is_chat_model=True,
             reuse_client=False,
-            max_retries=3,
+            max_retries=0,
             additional_kwargs={"extra_body": extra_arguments},
         )
 
@@ -225,20 +225,11 @@ if __name__ == "__main__":
             except Exception as e:
                 print(str(e))
 
-                error_str = e.args[0]
-
-                # Find the dictionary part (after "429 RESOURCE_EXHAUSTED. ")
-                dict_str = error_str.split("429 RESOURCE_EXHAUSTED. ", 1)[1]
-
-                error_dict = ast.literal_eval(dict_str)
-
-                retry = 0
-                for detail in error_dict['error']['details']:
-                    if detail.get('@type') == 'type.googleapis.com/google.rpc.RetryInfo':
-                        retry_delay = detail['retryDelay']
-                        print(f"Retry delay: {retry_delay}")
-
-                retry = int(retry_delay.split("s")[0])
+                # Honour the provider's RetryInfo / Retry-After delay, with exponential backoff otherwise
+                retry = retry_delay_from_error(e)
+                if retry is None:
+                    retry = 2 ** try_the_loop
+                print(f"Retry delay: {retry}s")
 
                 try_the_loop += 1 
 
@@ -1,18 +1,41 @@
 import os
 from fastapi import FastAPI, File, UploadFile, Request, Depends
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi import APIRouter
 from src.models.login import LoginForm
-from src.services.ui import return_gradio_ui
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi import HTTPException, status
+import re
 import json
+import unicodedata
+from urllib.parse import quote
 from datetime import datetime
 import uvicorn
+from contextlib import asynccontextmanager
+from src.services.clients import ashutdown_clients
+from src.services.core import INDEX_DIR, arender_documents, slugify
+from src.services.generate_resume import MEDIA_TYPES
+from src.services.rendering import RenderQueueFull, get_render_service
+from src.services.extract_skills import get_settings, get_stats
+from src.services.warmup import cancel_warm_up, readiness, start_warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so /health answers straight away; /ready reports when it is done
+    if get_settings().server.warmup:
+        start_warm_up()
+    else:
+        readiness.skip()
+    yield
+    cancel_warm_up()
+    # Release pooled LLM/provider connections on shutdown
+    await ashutdown_clients()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(SessionMiddleware, secret_key="super-secret-key")
 
 os.makedirs("static", exist_ok=True)
@@ -33,6 +56,19 @@ async def home():
     return {"health": "good"}
 
 
+@app.get("/ready")
+async def ready():
+    # 503 until warm-up has succeeded, so load balancers only route to warm workers
+    snapshot = readiness.snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+
+@app.get("/stats")
+def stats():
+    # Plain def: the cache counters read SQLite, so this runs in the threadpool
+    return {**get_stats(), "render_pool": get_render_service().snapshot()}
+
+
 router = APIRouter(prefix="/auth")
 
 @app.get("/", )
@@ -178,7 +214,62 @@ async def generate(request: Request, user_name = Depends(require_login)):
     return RedirectResponse(url="/resume_ai", status_code=status.HTTP_302_FOUND)
 
 
-app = return_gradio_ui(app= app, auth_dependency= require_login)
+def _chunks(data, size=64 * 1024):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+@app.post("/generate/{file_format}")
+async def generate_document(file_format: str, request: Request, user_name = Depends(require_login)):
+    """
+    Tailor a stored resume to a job and stream the DOCX or PDF straight from memory.
+    Form fields: job_name, job_description, input_file_name, tailoring_mode (optional)
+    and persist (optional, "true" also saves the documents under ./outputs).
+    """
+    if file_format not in MEDIA_TYPES:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown format {file_format!r}")
+    form = await request.form()
+    job_name = form.get("job_name") or "resume"
+    input_file_name = os.path.basename(form.get("input_file_name") or "")
+    if not os.path.isfile(os.path.join(INDEX_DIR, input_file_name)):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown resume {input_file_name!r}")
+    persist = form.get("persist")
+
+    try:
+        documents = await arender_documents(
+            job_description=form.get("job_description") or "",
+            job_name=job_name,
+            input_file_name=input_file_name,
+            formats=(file_format,),
+            persist=None if persist is None else persist.lower() in ("1", "true", "yes", "on"),
+            tailoring_mode=form.get("tailoring_mode") or None,
+        )
+    except RenderQueueFull as e:
+        # Back-pressure: the rendering pool is saturated, ask the client to come back later
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "5"})
+    data = documents[file_format]
+    return StreamingResponse(
+        _chunks(data),
+        media_type=MEDIA_TYPES[file_format],
+        headers={
+            "Content-Disposition": _content_disposition(slugify(job_name), file_format),
+            "Content-Length": str(len(data)),
+        },
+    )
+
+
+def _content_disposition(name, extension):
+    # RFC 6266: an ASCII fallback for old clients plus the UTF-8 name in filename*
+    fallback = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    fallback = re.sub(r"[^\w. -]+", "_", fallback).strip(" ._") or "resume"
+    return f"attachment; filename=\"{fallback}.{extension}\"; filename*=UTF-8''{quote(f'{name}.{extension}', safe='')}"
+
+
+if get_settings().server.gradio_ui:
+    # gradio dominates import time, so API-only workers can leave it out
+    from src.services.ui import return_gradio_ui
+
+    app = return_gradio_ui(app= app, auth_dependency= require_login)
 app.include_router(router= router)
 
 if __name__ == "__main__":
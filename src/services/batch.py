@@ -0,0 +1,175 @@
+import os
+import copy
+import json
+import time
+import threading
+from collections import Counter
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.services.core import load_resume_skeleton, slugify, tailor_resume_with_outcomes
+from src.services.extract_skills import get_settings
+from src.services.rendering import RenderService
+
+
+def _job_id(name, seen):
+    job_id = slugify(str(name), default="job")
+    # Two postings with the same title must not overwrite each other's output
+    base, n = job_id, 2
+    while job_id in seen:
+        job_id = f"{base}_{n}"
+        n += 1
+    seen.add(job_id)
+    return job_id
+
+
+def load_jobs(path):
+    """
+    Read job descriptions from a directory of text files (one posting per file, named
+    after the file) or from a JSONL file of {"job_name": ..., "job_description": ...} lines.
+
+    Returns a list of {"job_id", "job_name", "job_description"} dicts in input order.
+    """
+    seen = set()
+    jobs = []
+
+    if os.path.isdir(path):
+        for file_name in sorted(os.listdir(path)):
+            file_path = os.path.join(path, file_name)
+            if not os.path.isfile(file_path) or file_name.startswith("."):
+                continue
+            with open(file_path, "r", encoding="utf-8") as file:
+                description = file.read().strip()
+            if description:
+                name = os.path.splitext(file_name)[0]
+                jobs.append({"job_id": _job_id(name, seen), "job_name": name, "job_description": description})
+        return jobs
+
+    with open(path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            name = entry.get("job_name") or entry.get("name") or entry.get("id") or f"job_{line_number}"
+            description = entry.get("job_description") or entry.get("description") or ""
+            jobs.append({"job_id": _job_id(name, seen), "job_name": name, "job_description": description})
+    return jobs
+
+
+class Manifest:
+    """
+    Per-job status and timings for a batch run, rewritten atomically after every job
+    so an interrupted run can be resumed. Only "done" jobs are skipped on resume;
+    "degraded" (some sections kept their original content) and "failed" jobs run again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = {"jobs": {}}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                self.data = json.load(file)
+
+    def is_done(self, job_id):
+        entry = self.data["jobs"].get(job_id)
+        return bool(entry and entry["status"] == "done" and os.path.exists(entry["output"]))
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            self.data["jobs"].setdefault(job_id, {}).update(fields)
+            self.data["updated_at"] = datetime.now().isoformat(timespec="seconds")
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self.data, file, indent=4)
+            os.replace(temp_path, self.path)
+
+
+def _job_status(stages):
+    fallbacks = [name for name, outcome in stages.items() if outcome == "fallback"]
+    if not fallbacks:
+        return "done", None
+    if len(fallbacks) == len(stages):
+        return "failed", "every section kept its original content"
+    return "degraded", f"kept the original {', '.join(fallbacks)}"
+
+
+def _run_job(job, resume_skeleton, output_dir, renderers, manifest, generate_pdf, pipeline_options):
+    """
+    Tailor and render one job and return its manifest status: "done", "degraded" or "failed".
+    """
+    job_id = job["job_id"]
+    output_file = os.path.abspath(os.path.join(output_dir, f"{job_id}.docx"))
+    started = time.perf_counter()
+    manifest.update(job_id, job_name=job["job_name"], status="running", output=output_file, error=None, stages=None)
+
+    try:
+        # update_resume_with_* mutate the skeleton, so every job gets its own copy
+        resume, stages = tailor_resume_with_outcomes(job["job_description"], copy.deepcopy(resume_skeleton), **pipeline_options)
+        tailor_seconds = time.perf_counter() - started
+
+        render_start = time.perf_counter()
+        renderers.render(resume, output_file, generate_pdf=generate_pdf)
+        render_seconds = time.perf_counter() - render_start
+    except Exception as e:
+        print(f"[{job_id}] failed: {e}")
+        manifest.update(job_id, status="failed", error=str(e), total_seconds=round(time.perf_counter() - started, 3))
+        return "failed"
+
+    # The document is still written, but a job whose stages fell back is retried on resume
+    status, error = _job_status(stages)
+    total_seconds = time.perf_counter() - started
+    print(f"[{job_id}] {status} in {total_seconds:.2f}s (tailor {tailor_seconds:.2f}s, render {render_seconds:.2f}s)"
+          + (f": {error}" if error else ""))
+    manifest.update(
+        job_id,
+        status=status,
+        error=error,
+        stages=stages,
+        tailor_seconds=round(tailor_seconds, 3),
+        render_seconds=round(render_seconds, 3),
+        total_seconds=round(total_seconds, 3),
+    )
+    return status
+
+
+def run_batch(jobs_path, resume_file, output_dir="./outputs/batch", concurrency=4, render_workers=2,
+              manifest_path=None, generate_pdf=True, **pipeline_options):
+    """
+    Tailor one base resume to every job in `jobs_path`.
+
+    Up to `concurrency` jobs run their LLM stages at once (each in its own thread) and
+    DOCX/PDF rendering happens in a RenderService of `render_workers` processes. Jobs already
+    marked done in the manifest are skipped, so re-running the same command resumes
+    an interrupted batch. `pipeline_options` are passed on to `core.tailor_resume_with_outcomes`.
+
+    Returns the manifest data.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = Manifest(manifest_path or os.path.join(output_dir, "manifest.json"))
+    jobs = load_jobs(jobs_path)
+    pending = [job for job in jobs if not manifest.is_done(job["job_id"])]
+    print(f"batch: {len(jobs)} jobs, {len(jobs) - len(pending)} already done, {len(pending)} to run")
+
+    resume_skeleton = load_resume_skeleton(resume_file)
+    started = time.perf_counter()
+
+    # Every job thread can hold a rendering slot, so jobs never wait on the queue
+    renderers = RenderService(render_workers, max_pending=concurrency, docx_template=get_settings().render.docx_template)
+    try:
+        renderers.warm()
+        with ThreadPoolExecutor(concurrency) as workers:
+            futures = [
+                workers.submit(_run_job, job, resume_skeleton, output_dir, renderers, manifest, generate_pdf, pipeline_options)
+                for job in pending
+            ]
+            statuses = Counter(future.result() for future in as_completed(futures))
+    finally:
+        renderers.close()
+
+    print(
+        f"batch finished in {time.perf_counter() - started:.2f}s: "
+        f"{statuses['done']} done, {statuses['degraded']} degraded, {statuses['failed']} failed - manifest at {manifest.path}"
+    )
+    return manifest.data
@@ -0,0 +1,65 @@
+import inspect
+import threading
+
+
+class ClientRegistry:
+    """
+    Process-wide registry of long-lived clients.
+
+    Each client is created once per key by its factory and then shared by every
+    thread in the process, so connection pools and TLS sessions are reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clients = {}
+
+    def get(self, key, factory):
+        """
+        Return the client stored under `key`, creating it with `factory` on first use.
+        """
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = factory()
+                self._clients[key] = client
+        return client
+
+    def find(self, kind):
+        """
+        Return {rest of key: client} for every client registered under a key starting with `kind`.
+        """
+        with self._lock:
+            return {key[1:]: client for key, client in self._clients.items() if key[0] == kind}
+
+    def _pop_all(self):
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        return clients
+
+    async def aclose(self):
+        """
+        Close every registered client from inside a running event loop.
+        """
+        for key, client in self._pop_all().items():
+            close = getattr(client, "aclose", None) or getattr(client, "close", None)
+            if not callable(close):
+                continue
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"Failed to close client {key}: {e}")
+
+
+registry = ClientRegistry()
+
+
+async def ashutdown_clients():
+    """Close all pooled clients. Called from the FastAPI shutdown hook."""
+    await registry.aclose()
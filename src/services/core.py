@@ -3,15 +3,29 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 
 import os
+import re
 import json
+import time
+import asyncio
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from src.services.extract_skills import (
     extract_skills_from_job,
     extract_experiences_from_job,
     extract_summary_from_job,
-    extract_projects_from_job
+    extract_projects_from_job,
+    extract_all_from_job,
+    aextract_skills_from_job,
+    aextract_experiences_from_job,
+    astream_summary_from_job,
+    aextract_projects_from_job,
+    aextract_all_from_job,
+    get_settings,
+    get_job_cache,
+    job_cache_scope,
+    preselect_sections,
 )
-from src.services.generate_resume import generate_compact_resume
+from src.services.rendering import get_render_service
 from src.services.docx_utils import (
     update_resume_with_skills,
     update_resume_with_experience,
@@ -21,6 +35,17 @@ from src.services.docx_utils import (
 
 INDEX_DIR = "json_files"
 
+
+def slugify(name, default="resume"):
+    """A file-name-safe form of `name`: no separators, dots only inside, at most 100 characters."""
+    slug = re.sub(r"[^\w.-]+", "_", name or "").strip("._-")[:100]
+    return slug or default
+
+
+def output_file_name(job_name):
+    """Timestamped .docx name for a job, safe to join under ./outputs."""
+    return f"{slugify(job_name)}_" + str(datetime.now(ZoneInfo("Canada/Central")).strftime("%d-%m-%Y_%H-%M-%S")) + ".docx"
+
 def load_resume_skeleton(file_name:str = "") -> dict:
     """Load the resume skeleton from a JSON file."""
     global INDEX_DIR
@@ -30,63 +55,470 @@ def load_resume_skeleton(file_name:str = "") -> dict:
             return json.load(file)
 
 
-def main(job_description="", job_name="", input_file_name:str = "", it_check:bool = False):
+def _run_stage(name, func, args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"stage {name} finished in {time.perf_counter() - start:.2f}s")
+    return result
+
+
+def _run_sequential(stages):
+    results = {}
+    for name, (func, args, fallback) in stages.items():
+        try:
+            results[name] = _run_stage(name, func, args)
+        except Exception as e:
+            print(f"stage {name} failed: {e} - keeping the original section")
+            results[name] = fallback
+    return results
+
+
+def _run_threads(stages, timeout):
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=len(stages), thread_name_prefix="stage")
+    futures = {
+        name: executor.submit(_run_stage, name, func, args)
+        for name, (func, args, _) in stages.items()
+    }
+    # All stages start together, so each one gets `timeout` seconds from this point
+    deadline = time.monotonic() + timeout if timeout else None
+    try:
+        for name, future in futures.items():
+            fallback = stages[name][2]
+            remaining = max(0, deadline - time.monotonic()) if deadline else None
+            try:
+                results[name] = future.result(timeout=remaining)
+            except TimeoutError:
+                print(f"stage {name} timed out after {timeout}s - keeping the original section")
+                results[name] = fallback
+            except Exception as e:
+                print(f"stage {name} failed: {e} - keeping the original section")
+                results[name] = fallback
+    finally:
+        # Do not block on stages that timed out; their results are discarded
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def run_independent_stages(stages, execution_mode="threads", timeout=None):
+    """
+    Run stages that do not depend on each other and collect their results.
+
+    Args:
+        stages (dict): Maps a stage name to a (func, args, fallback) tuple.
+        execution_mode (str): "sequential" or "threads". The async pipeline (`amain`)
+            awaits the async stage functions directly instead.
+        timeout (float): Seconds each stage may take before its fallback is used.
+
+    Returns:
+        dict: Stage name to result. Failed or timed-out stages map to their fallback.
+    """
+    if execution_mode == "sequential":
+        return _run_sequential(stages)
+    if execution_mode == "threads":
+        return _run_threads(stages, timeout)
+    raise ValueError(f"Unknown execution_mode: {execution_mode}")
+
+
+def _original_sections(current_skills, current_projects, current_experiences, current_summary):
+    return {
+        "skills": {"skills": current_skills},
+        "projects": {"projects": current_projects},
+        "experiences": {"experiences": current_experiences},
+        "summary": {"summary": current_summary},
+    }
+
+
+def _section_outcomes(sections, fallbacks):
+    """
+    Map each section name to "tailored" when it came back from the LLM, or to "fallback"
+    when its stage failed or timed out and the original section was kept.
+    """
+    outcomes = {}
+    for name, fallback in fallbacks.items():
+        section = sections.get(name)
+        if section is fallback or not isinstance(section, dict) or name not in section:
+            outcomes[name] = "fallback"
+        elif not section[name] and fallback[name]:
+            outcomes[name] = "fallback"
+        else:
+            outcomes[name] = "tailored"
+    return outcomes
+
+
+def _fully_tailored(sections, fallbacks):
+    """
+    True when every section came back from the LLM, rather than from a fallback or a failed stage.
+    """
+    return all(outcome == "tailored" for outcome in _section_outcomes(sections, fallbacks).values())
+
+
+def _lookup_tailoring(job_description, resume_skeleton, tailoring_mode):
+    """
+    Look the job up in the job cache before the skeleton is modified.
+
+    Returns (job_cache, scope, sections); sections is the tailoring of an identical or
+    near-identical posting for the same base resume, or None on a miss.
+    """
+    job_cache = get_job_cache()
+    if job_cache is None:
+        return None, None, None
+    scope = job_cache_scope(resume_skeleton, tailoring_mode)
+    cached = job_cache.lookup(scope, job_description)
+    if cached is None:
+        return job_cache, scope, None
+    sections, similarity = cached
+    print(f"job cache hit (similarity {similarity:.2f}, hit rate {job_cache.stats()['hit_rate']:.0%}) - reusing tailored sections")
+    return job_cache, scope, sections
+
+
+def _store_tailoring(job_cache, scope, job_description, sections, fallbacks):
+    if job_cache is None:
+        return
+    if not _fully_tailored(sections, fallbacks):
+        print("some sections kept their original content - not adding this job to the job cache")
+        return
+    job_cache.store(scope, job_description, sections)
+
+
+def main(job_description="", job_name="", input_file_name:str = "", it_check:bool = False, execution_mode:str = None, stage_timeout:float = None, tailoring_mode:str = None):
     os.makedirs("./json_files", exist_ok=True)
-    file_name = (
-        f"{job_name}_" + str(datetime.now(ZoneInfo("Canada/Central")).strftime("%d-%m-%Y_%H-%M-%S")) + ".docx"
-    )
+    file_name = output_file_name(job_name)
 
     class Namespace:
         def __init__(self, **kwargs):
             self.__dict__.update(kwargs)
 
+    settings = get_settings()
     args = Namespace(
         job_description=job_description,
         output=f"./outputs/{file_name}",
         generate_pdf=True,
+        execution_mode=execution_mode or settings.pipeline.execution_mode,
+        stage_timeout=stage_timeout or settings.pipeline.stage_timeout or settings.llm.timeout,
+        tailoring_mode=tailoring_mode or settings.pipeline.tailoring_mode,
     )
 
     # Step 1: Load Resume Skeleton
     resume_skeleton = load_resume_skeleton(file_name= input_file_name)
 
-    # Step 2: Extract and Enhance Skills
-    current_skills = resume_skeleton["skills"]
+    # Steps 2-4: Tailor the sections to the job
+    updated_resume = tailor_resume(
+        args.job_description,
+        resume_skeleton,
+        execution_mode=args.execution_mode,
+        stage_timeout=args.stage_timeout,
+        tailoring_mode=args.tailoring_mode,
+    )
 
-    current_projects = resume_skeleton["projects"]
-    enhanced_projects = extract_projects_from_job(args.job_description, current_projects)
-    print("enhanced projects: ", enhanced_projects, "\n\n")
+    # Step 5: Generate Resume
+    get_render_service().render(
+        updated_resume, output_file=args.output, generate_pdf=args.generate_pdf
+    )
+
+    return os.path.abspath(args.output)
+
+
+def tailor_resume(job_description, resume_skeleton, execution_mode=None, stage_timeout=None, tailoring_mode=None):
+    """
+    Run the LLM stages for one job and return the updated resume skeleton (modified in place).
+    """
+    return tailor_resume_with_outcomes(job_description, resume_skeleton, execution_mode, stage_timeout, tailoring_mode)[0]
 
-    updated_resume = update_resume_with_project(resume_skeleton, enhanced_projects)
-    # updated_resume = update_resume_with_experience(resume_skeleton, {})
-    enhanced_experiences = ""
 
+def tailor_resume_with_outcomes(job_description, resume_skeleton, execution_mode=None, stage_timeout=None, tailoring_mode=None):
+    """
+    Like `tailor_resume`, but returns (updated_resume, outcomes) where outcomes maps each
+    section to "tailored", "cached" (reused from the job cache) or "fallback".
+    """
+    settings = get_settings()
+    args = argparse.Namespace(
+        job_description=job_description,
+        execution_mode=execution_mode or settings.pipeline.execution_mode,
+        stage_timeout=stage_timeout or settings.pipeline.stage_timeout or settings.llm.timeout,
+        tailoring_mode=tailoring_mode or settings.pipeline.tailoring_mode,
+    )
+
+    current_skills = resume_skeleton["skills"]
+    current_projects = resume_skeleton["projects"]
     current_experiences = resume_skeleton["experience"]
-    enhanced_experiences = extract_experiences_from_job(args.job_description, current_experiences)
+    current_summary = resume_skeleton["summary"]
+    fallbacks = _original_sections(current_skills, current_projects, current_experiences, current_summary)
+
+    # Re-posts of a job already tailored for this resume skip the LLM stages entirely
+    job_cache, scope, results = _lookup_tailoring(args.job_description, resume_skeleton, args.tailoring_mode)
+    if results is None:
+        results = _tailor_sections(args, current_skills, current_projects, current_experiences, current_summary, fallbacks)
+        _store_tailoring(job_cache, scope, args.job_description, results, fallbacks)
+        outcomes = _section_outcomes(results, fallbacks)
+    else:
+        outcomes = dict.fromkeys(fallbacks, "cached")
+
+    enhanced_projects = results["projects"]
+    print("enhanced projects: ", enhanced_projects, "\n\n")
+
+    enhanced_experiences = results["experiences"]
     print("enhanced experiences: ", enhanced_experiences, "\n\n")
 
+    enhanced_skills = results["skills"]
+    print("enhanced skills: ", enhanced_skills, "\n\n")
+
+    enhanced_summary = results["summary"]
+    print("enhanced summary: ", enhanced_summary, "\n\n")
+
+    # Step 4: Update Resume Skeleton with Enhanced Sections
+    updated_resume = update_resume_with_project(resume_skeleton, enhanced_projects)
     updated_resume = update_resume_with_experience(resume_skeleton, enhanced_experiences)
-    # updated_resume = update_resume_with_project(resume_skeleton, {})
-    # enhanced_projects = ""
+    updated_resume = update_resume_with_skills(resume_skeleton, enhanced_skills)
+    updated_resume = update_resume_with_summary(resume_skeleton, enhanced_summary)
+    return updated_resume, outcomes
+
+
+def _tailor_sections(args, current_skills, current_projects, current_experiences, current_summary, fallbacks):
+    """
+    Steps 2 and 3: tailor every section with the LLM and return them keyed by section name.
+    """
+    # Step 2: Extract and Enhance projects, experiences and skills independently
+    # Only the items closest to the job go into the prompts; fallbacks keep the full sections
+    candidate_skills, candidate_projects, candidate_experiences = preselect_sections(
+        args.job_description, current_skills, current_projects, current_experiences
+    )
+
+    if args.tailoring_mode == "combined":
+        # One structured request for every section, including the summary
+        results = run_independent_stages(
+            {
+                "combined": (
+                    extract_all_from_job,
+                    (args.job_description, candidate_skills, candidate_projects, candidate_experiences, current_summary),
+                    fallbacks,
+                ),
+            },
+            execution_mode=args.execution_mode,
+            timeout=args.stage_timeout,
+        )["combined"]
+    else:
+        results = run_independent_stages(
+            {
+                "projects": (extract_projects_from_job, (args.job_description, candidate_projects), fallbacks["projects"]),
+                "experiences": (extract_experiences_from_job, (args.job_description, candidate_experiences), fallbacks["experiences"]),
+                "skills": (extract_skills_from_job, (args.job_description, candidate_skills), fallbacks["skills"]),
+            },
+            execution_mode=args.execution_mode,
+            timeout=args.stage_timeout,
+        )
+
+    # Step 3: The summary depends on the enhanced sections
+    if "summary" not in results:
+        results.update(run_independent_stages(
+            {
+                "summary": (
+                    extract_summary_from_job,
+                    (args.job_description, results["skills"], results["projects"], results["experiences"], current_summary),
+                    fallbacks["summary"],
+                ),
+            },
+            execution_mode=args.execution_mode,
+            timeout=args.stage_timeout,
+        ))
+    return results
+
+
+async def _arun_stage(name, coro, timeout, fallback):
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(coro, timeout)
+        print(f"stage {name} finished in {time.perf_counter() - start:.2f}s")
+        return result
+    except asyncio.TimeoutError:
+        print(f"stage {name} timed out after {timeout}s - keeping the original section")
+    except Exception as e:
+        print(f"stage {name} failed: {e} - keeping the original section")
+    return fallback
+
+
+async def _named(name, coro):
+    return name, await coro
+
+
+async def astream_main(job_description="", job_name="", input_file_name:str = "", it_check:bool = False, stage_timeout:float = None, tailoring_mode:str = None):
+    """
+    Run the async pipeline and report progress as it goes.
+
+    Yields (event, value) tuples: ("progress", message) when a stage starts or finishes,
+    ("summary", text) with the partial summary while it streams, and finally
+    ("done", output_path).
+    """
+    os.makedirs("./json_files", exist_ok=True)
+    file_name = output_file_name(job_name)
+    output = f"./outputs/{file_name}"
+
+    async for event, value in astream_tailored_resume(job_description, input_file_name, stage_timeout, tailoring_mode):
+        if event == "resume":
+            updated_resume = value
+        else:
+            yield event, value
+
+    yield "progress", "Rendering DOCX and PDF..."
+    # DOCX/PDF rendering is CPU-bound: both formats render in parallel in the process pool
+    await get_render_service().arender(updated_resume, output_file=output, generate_pdf=True)
+
+    yield "done", os.path.abspath(output)
+
+
+async def astream_tailored_resume(job_description="", input_file_name:str = "", stage_timeout:float = None, tailoring_mode:str = None):
+    """
+    Load a resume skeleton and tailor it on the event loop. Yields the progress and
+    summary events of `astream_main`, then ("resume", updated_resume).
+    """
+    settings = get_settings()
+    stage_timeout = stage_timeout or settings.pipeline.stage_timeout or settings.llm.timeout
+    tailoring_mode = tailoring_mode or settings.pipeline.tailoring_mode
+
+    loop = asyncio.get_running_loop()
+    resume_skeleton = await loop.run_in_executor(None, load_resume_skeleton, input_file_name)
 
+    current_skills = resume_skeleton["skills"]
+    current_projects = resume_skeleton["projects"]
+    current_experiences = resume_skeleton["experience"]
     current_summary = resume_skeleton["summary"]
+    fallbacks = _original_sections(current_skills, current_projects, current_experiences, current_summary)
 
-    enhanced_skills = extract_skills_from_job(args.job_description, current_skills)
-    print("enhanced skills: ", enhanced_skills, "\n\n")
+    job_cache, scope, cached = await loop.run_in_executor(
+        None, _lookup_tailoring, job_description, resume_skeleton, tailoring_mode
+    )
+    if cached is not None:
+        yield "progress", "Reusing the tailoring of a near-identical job posting..."
+        results = cached
+    else:
+        async for event in _astream_sections(
+            job_description, current_skills, current_projects, current_experiences, current_summary,
+            fallbacks, stage_timeout, tailoring_mode,
+        ):
+            if event[0] == "results":
+                results = event[1]
+            else:
+                yield event
+        await loop.run_in_executor(None, _store_tailoring, job_cache, scope, job_description, results, fallbacks)
 
-    enhanced_summary = extract_summary_from_job(args.job_description, enhanced_skills, enhanced_projects, enhanced_experiences, current_summary)
+    enhanced_projects = results["projects"]
+    enhanced_experiences = results["experiences"]
+    enhanced_skills = results["skills"]
+    enhanced_summary = results["summary"]
+    print("enhanced projects: ", enhanced_projects, "\n\n")
+    print("enhanced experiences: ", enhanced_experiences, "\n\n")
+    print("enhanced skills: ", enhanced_skills, "\n\n")
     print("enhanced summary: ", enhanced_summary, "\n\n")
+    yield "summary", enhanced_summary["summary"]
 
-    # Step 3: Update Resume Skeleton with Enhanced Skills
+    updated_resume = update_resume_with_project(resume_skeleton, enhanced_projects)
+    updated_resume = update_resume_with_experience(resume_skeleton, enhanced_experiences)
     updated_resume = update_resume_with_skills(resume_skeleton, enhanced_skills)
     updated_resume = update_resume_with_summary(resume_skeleton, enhanced_summary)
-    
+    yield "resume", updated_resume
 
-    # Step 4: Generate Resume
-    generate_compact_resume(
-        updated_resume, output_file=args.output, generate_pdf=args.generate_pdf
+
+async def _astream_sections(job_description, current_skills, current_projects, current_experiences, current_summary,
+                            fallbacks, stage_timeout, tailoring_mode):
+    """
+    Tailor every section on the event loop. Yields the same progress and summary events
+    as `astream_main`, then ("results", sections).
+    """
+    loop = asyncio.get_running_loop()
+    candidate_skills, candidate_projects, candidate_experiences = await loop.run_in_executor(
+        None, preselect_sections, job_description, current_skills, current_projects, current_experiences
     )
 
-    return os.path.abspath(args.output)
+    if tailoring_mode == "combined":
+        yield "progress", "Tailoring skills, projects, experiences and summary in one request..."
+        results = await _arun_stage(
+            "combined",
+            aextract_all_from_job(job_description, candidate_skills, candidate_projects, candidate_experiences, current_summary),
+            stage_timeout,
+            fallbacks,
+        )
+        yield "progress", "Sections tailored."
+    else:
+        yield "progress", "Tailoring projects, experiences and skills..."
+        results = {}
+        for next_done in asyncio.as_completed([
+            _named("projects", _arun_stage("projects", aextract_projects_from_job(job_description, candidate_projects), stage_timeout, fallbacks["projects"])),
+            _named("experiences", _arun_stage("experiences", aextract_experiences_from_job(job_description, candidate_experiences), stage_timeout, fallbacks["experiences"])),
+            _named("skills", _arun_stage("skills", aextract_skills_from_job(job_description, candidate_skills), stage_timeout, fallbacks["skills"])),
+        ]):
+            name, result = await next_done
+            results[name] = result
+            yield "progress", f"{name.capitalize()} tailored."
+
+    if tailoring_mode != "combined":
+        yield "progress", "Writing summary..."
+        results["summary"] = fallbacks["summary"]
+        start = time.perf_counter()
+        deadline = loop.time() + stage_timeout
+        stream = astream_summary_from_job(job_description, results["skills"], results["projects"], results["experiences"], current_summary)
+        try:
+            summary_text = ""
+            while True:
+                try:
+                    summary_text = await asyncio.wait_for(stream.__anext__(), max(0, deadline - loop.time()))
+                except StopAsyncIteration:
+                    break
+                yield "summary", summary_text
+            if summary_text:
+                results["summary"] = {"summary": summary_text}
+            print(f"stage summary finished in {time.perf_counter() - start:.2f}s")
+        except asyncio.TimeoutError:
+            print(f"stage summary timed out after {stage_timeout}s - keeping the original section")
+        except Exception as e:
+            print(f"stage summary failed: {e} - keeping the original section")
+        finally:
+            await stream.aclose()
+
+    yield "results", results
+
+
+async def amain(job_description="", job_name="", input_file_name:str = "", it_check:bool = False, stage_timeout:float = None, tailoring_mode:str = None):
+    """
+    Async variant of `main`. LLM stages run on the event loop and rendering runs in an executor,
+    so a single worker can serve many generations at once.
+    """
+    async for event, value in astream_main(
+        job_description=job_description,
+        job_name=job_name,
+        input_file_name=input_file_name,
+        it_check=it_check,
+        stage_timeout=stage_timeout,
+        tailoring_mode=tailoring_mode,
+    ):
+        if event == "done":
+            return value
+
+
+def _persist_documents(documents, output):
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    for file_format, data in documents.items():
+        with open(f"{os.path.splitext(output)[0]}.{file_format}", "wb") as file:
+            file.write(data)
+
+
+async def arender_documents(job_description="", job_name="", input_file_name:str = "", formats=("docx", "pdf"), persist:bool = None, stage_timeout:float = None, tailoring_mode:str = None):
+    """
+    Tailor a resume and render it in memory, without writing to disk. Returns
+    {format: bytes}; with `persist` (default: server.persist_outputs) the documents
+    are also saved under ./outputs.
+    """
+    async for event, value in astream_tailored_resume(job_description, input_file_name, stage_timeout, tailoring_mode):
+        if event == "resume":
+            updated_resume = value
+
+    loop = asyncio.get_running_loop()
+    documents = await get_render_service().arender_bytes(updated_resume, tuple(formats))
+
+    if persist is None:
+        persist = get_settings().server.persist_outputs
+    if persist:
+        await loop.run_in_executor(None, _persist_documents, documents, f"./outputs/{output_file_name(job_name)}")
+    return documents
 
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+import io
+import os
+import functools
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Pt, RGBColor
+
+from src.services.layout import STYLES, TITLE_COLOR
+
+
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "docx", "compact.docx")
+
+# Layout style -> paragraph style a template must define
+PARAGRAPH_STYLES = {
+    "name": "Resume Name",
+    "contact": "Resume Contact",
+    "heading": "Resume Heading",
+    "text": "Resume Text",
+    "entry": "Resume Entry",
+    "skill": "Resume Skill",
+    "project": "Resume Project",
+    "bullet": "Resume Bullet",
+    "rule": "Resume Rule",
+}
+
+# Run formatting -> character style
+CHARACTER_STYLES = {
+    "bold": "Strong",
+    "italic": "Emphasis",
+    "bold_italic": "Resume Strong Emphasis",
+    "link": "Hyperlink",
+}
+
+# Built-in styles the template's paragraph styles derive from
+_BASE_STYLES = {"name": "Heading 1", "heading": "Heading 2", "bullet": "List Bullet"}
+
+
+def _bottom_border(style):
+    p_pr = style.element.get_or_add_pPr()
+    p_borders = OxmlElement("w:pBdr")
+    bottom_border = OxmlElement("w:bottom")
+    bottom_border.set(qn("w:val"), "single")
+    bottom_border.set(qn("w:sz"), "4")
+    bottom_border.set(qn("w:space"), "1")
+    bottom_border.set(qn("w:color"), "auto")
+    p_borders.append(bottom_border)
+    p_pr.append(p_borders)
+
+
+def _character_style(styles, name, bold=None, italic=None, color=None, underline=None):
+    if name in [style.name for style in styles]:
+        style = styles[name]
+    else:
+        style = styles.add_style(name, WD_STYLE_TYPE.CHARACTER)
+        style.base_style = styles["Default Paragraph Font"]
+    style.font.bold = bold
+    style.font.italic = italic
+    style.font.underline = underline
+    if color:
+        style.font.color.rgb = RGBColor.from_string(color)
+
+
+def build_template(path=DEFAULT_TEMPLATE):
+    """
+    Write the compact template: python-docx's default document plus the named styles
+    `render_docx` refers to, with the metrics of `layout.STYLES`.
+    """
+    doc = Document()
+    styles = doc.styles
+    for key, name in PARAGRAPH_STYLES.items():
+        style = styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+        style.base_style = styles[_BASE_STYLES.get(key, "Normal")]
+        style.quick_style = True
+        paragraph_format = style.paragraph_format
+        if key == "rule":
+            # An empty, hair-thin paragraph drawing the line under a section
+            style.font.size = Pt(2)
+            paragraph_format.space_before = Pt(0)
+            paragraph_format.space_after = Pt(4)
+            _bottom_border(style)
+            continue
+        spec = STYLES[key]
+        style.font.size = Pt(spec["size"])
+        if key != "heading":
+            paragraph_format.space_before = Pt(0)
+        paragraph_format.space_after = Pt(spec["space_after"])
+        paragraph_format.line_spacing = 1
+        if spec.get("centered"):
+            paragraph_format.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    styles[PARAGRAPH_STYLES["name"]].font.bold = True
+    styles[PARAGRAPH_STYLES["name"]].font.color.rgb = RGBColor.from_string(TITLE_COLOR.upper())
+
+    _character_style(styles, CHARACTER_STYLES["bold"], bold=True)
+    _character_style(styles, CHARACTER_STYLES["italic"], italic=True)
+    _character_style(styles, CHARACTER_STYLES["bold_italic"], bold=True, italic=True)
+    _character_style(styles, CHARACTER_STYLES["link"], color="0563C1", underline=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    doc.save(path)
+    return path
+
+
+@functools.lru_cache(maxsize=8)
+def load_template(path=DEFAULT_TEMPLATE):
+    """
+    Read and check a template once per process. Returns its bytes and the ids of its
+    styles keyed by layout style and run formatting. Any body content is dropped, so a
+    template can be edited and saved in Word with sample text in it.
+    """
+    doc = Document(path)
+    defined = {style.name for style in doc.styles}
+    missing = sorted((set(PARAGRAPH_STYLES.values()) | set(CHARACTER_STYLES.values())) - defined)
+    if missing:
+        raise ValueError(f"DOCX template {path} lacks the styles: {', '.join(missing)}")
+
+    body = doc.element.body
+    for element in list(body):
+        if element.tag != qn("w:sectPr"):
+            body.remove(element)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    style_ids = {key: doc.styles[name].style_id for key, name in {**PARAGRAPH_STYLES, **CHARACTER_STYLES}.items()}
+    return buffer.getvalue(), style_ids
+
+
+def new_document(path=None):
+    """
+    A fresh in-memory copy of the template at `path` (default: the compact template)
+    and the ids of its styles (see `load_template`).
+    """
+    data, style_ids = load_template(path or DEFAULT_TEMPLATE)
+    return Document(io.BytesIO(data)), style_ids
+
+
+if __name__ == "__main__":
+    print(f"Template written: {build_template()}")
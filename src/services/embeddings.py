@@ -0,0 +1,62 @@
+import json
+
+from src.services.cache import make_cache_key
+from src.services.tokens import compact_json
+
+
+def item_text(item) -> str:
+    """Text embedded for one resume item (experience, project or skill group)."""
+    return item if isinstance(item, str) else compact_json(item)
+
+
+def embed_cached(texts, embed, cache, model):
+    """
+    Return one vector per text, calling `embed(texts)` only for texts whose
+    embedding is not cached yet.
+    """
+    keys = [make_cache_key(model=model, text=text) for text in texts]
+    vectors = [None] * len(texts)
+    missing = []
+    for i, key in enumerate(keys):
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            vectors[i] = json.loads(cached)
+        else:
+            missing.append(i)
+
+    if missing:
+        # One batched request for everything that is not cached
+        fresh = embed([texts[i] for i in missing])
+        for i, vector in zip(missing, fresh):
+            vectors[i] = vector
+            if cache is not None:
+                cache.set(keys[i], json.dumps(vector))
+    return vectors
+
+
+def top_k_indices(query, vectors, k):
+    """
+    Indices of the `k` vectors most cosine-similar to `query`, in their original order.
+    """
+    import numpy as np
+
+    matrix = np.asarray(vectors, dtype=np.float32)
+    query = np.asarray(query, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    scores = (matrix @ query) / np.where(norms == 0, 1, norms)
+    best = np.argsort(-scores, kind="stable")[:k]
+    # The resume lists items in a meaningful (usually chronological) order; keep it
+    return sorted(best.tolist())
+
+
+def select_top_k(job_description, items, k, embed, cache=None, model=None):
+    """
+    Keep the `k` items closest to the job description. Lists that already fit are
+    returned unchanged without calling the embedding backend.
+    """
+    if not k or len(items) <= k:
+        return items
+
+    texts = [job_description] + [item_text(item) for item in items]
+    vectors = embed_cached(texts, embed, cache, model)
+    return [items[i] for i in top_k_indices(vectors[0], vectors[1:], k)]
@@ -1,24 +1,53 @@
 import time
-import json
 import re
-import openai
 import os
-from src.services.utils import retry_with_backoff
-from llama_index.core.llms import ChatMessage, MessageRole
-from llama_index.llms.openai_like import OpenAILike
-from pydantic import Field, model_validator
-from llama_index.llms.google_genai import GoogleGenAI
+import asyncio
+from src.services.utils import CircuitBreaker, RetryMetrics, RetryPolicy, call_with_retry, acall_with_retry, counts_against_backend
+from src.services.clients import registry
+from src.services.hedging import HedgeMetrics, HedgePolicy, LatencyTracker, ahedged_call, hedged_call
+from src.services.cache import CompletionCache, make_cache_key
+from src.services.embeddings import select_top_k
+from src.services.jobcache import JobCache
+from src.services.generators import SchemaStore, build_generator, schema_fingerprint
+from src.services.schemas import skills, Experiences, projects, tailored_sections, tailored_resume
+from src.services.structured import STRATEGIES, gemini_generation_config, parse_structured, response_format, schema_instruction
+from src.services.prompts import (
+    PROMPT_VERSION,
+    build_prompt,
+    SKILLS_TASK,
+    SKILLS_EXAMPLE,
+    EXPERIENCES_TASK,
+    EXPERIENCES_EXAMPLE,
+    PROJECTS_TASK,
+    PROJECTS_EXAMPLE,
+    SUMMARY_TASK,
+    SUMMARY_EXAMPLE,
+    COMBINED_TASK,
+    COMBINED_SUMMARY_TASK,
+    COMBINED_EXAMPLE,
+    COMBINED_SUMMARY_EXAMPLE,
+)
+from src.services.ratelimit import RateLimiter
+from src.services.usage import UsageStats, async_usage_hooks, stage_context, usage_hooks
+from src.services.replay import ReplayBackend, ReplayLLM, ReplayModel, record_response
+from src.services.tokens import (
+    PromptTooLongError,
+    compact_json,
+    count_tokens,
+    get_tokenizer,
+    truncate_to_tokens,
+)
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from pydantic_settings import (
     BaseSettings,
     PydanticBaseSettingsSource,
     SettingsConfigDict,
     TomlConfigSettingsSource,
 )
-from pydantic import BaseModel
 from typing import Optional, Tuple, Type, Any
-import outlines
-import ollama
-from google import genai
+
+# Provider SDKs (openai, ollama, google-genai, outlines, llama_index) are imported
+# inside the builders below, so only the configured backend is ever loaded.
 
 
 # openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -38,9 +67,20 @@ class LLMSettings(BaseSettings):
     tokenizer_path: Optional[str] = Field(default=None, description="Path to custom tokenizer.")
     tokenizer_model: Optional[str] = Field(default="gpt-4o", description="Name of the models supported by tiktoken.")
     extra_arguments: Optional[dict[str, Any]] = Field(default={}, description="Additional API call arguments.")
-    model_type: str = Field(default = "ChatGPT", description= "Which model to use Ollama or ChatGPT or Gemini")
+    model_type: str = Field(default = "ChatGPT", description= "Which model to use Ollama or ChatGPT or Gemini or Replay")
+    job_description_max_tokens: int = Field(default=2000, description="Job descriptions are truncated to this many tokens in prompts")
+    max_connections: int = Field(default=10, description="Maximum pooled HTTP connections per backend")
+    max_keepalive_connections: int = Field(default=5, description="Maximum idle connections kept alive per backend")
+    keepalive_expiry: float = Field(default=30, description="Seconds an idle connection is kept alive")
+    structured_output: str = Field(default="outlines", description="How structured stages get JSON: native (provider JSON schema mode), outlines, or json (plain prompt, repaired before validation)")
 
 
+    @model_validator(mode="after")
+    def check_structured_output(self):
+        if self.structured_output not in STRATEGIES:
+            raise ValueError(f"structured_output must be one of {', '.join(STRATEGIES)}")
+        return self
+
     @model_validator(mode="after")
     def check_embedding_requirements(self):
         if self.enable_embeddings:
@@ -51,8 +91,138 @@ class LLMSettings(BaseSettings):
         return self
 
 
+class SettingsSection(BaseModel):
+    """
+    A table of settings.toml below the top level. Sections are plain models, so only the
+    TOML file configures them and environment variables such as PATH never leak in.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+
+class StageLLMSettings(SettingsSection):
+    model_type: Optional[str] = Field(default=None, description="Backend for this stage: Ollama, ChatGPT, Gemini or Replay")
+    api_base: Optional[str] = Field(default=None, description="Base URL for this stage's backend")
+    model_name: Optional[str] = Field(default=None, description="Model used by this stage")
+    api_key: Optional[str] = Field(default=None, description="API key for this stage's backend")
+    context_length: Optional[int] = Field(default=None, description="Context length of this stage's model")
+    max_new_tokens: Optional[int] = Field(default=None, description="Maximum tokens for this stage's response")
+    temperature: Optional[float] = Field(default=None, description="Temperature")
+    timeout: Optional[float] = Field(default=None, description="Request timeout for this stage")
+    extra_arguments: Optional[dict[str, Any]] = Field(default=None, description="Additional API call arguments.")
+    max_connections: Optional[int] = Field(default=None, description="Maximum pooled HTTP connections for this stage's backend")
+    max_keepalive_connections: Optional[int] = Field(default=None, description="Maximum idle connections kept alive for this stage's backend")
+    structured_output: Optional[str] = Field(default=None, description="Structured-output strategy for this stage: native, outlines or json")
+
+
+class StagesSettings(SettingsSection):
+    """
+    Per-stage overrides of `[llm]`. Unset fields fall back to `[llm]`. A stage routed to
+    a different backend or model gets its own rate limiter and circuit breaker, and a
+    stage with any setting of its own gets its own clients.
+    """
+    skills: Optional[StageLLMSettings] = Field(default=None, description="Backend for selecting skills")
+    projects: Optional[StageLLMSettings] = Field(default=None, description="Backend for selecting projects")
+    experiences: Optional[StageLLMSettings] = Field(default=None, description="Backend for tailoring experiences")
+    summary: Optional[StageLLMSettings] = Field(default=None, description="Backend for writing the summary")
+    combined: Optional[StageLLMSettings] = Field(default=None, description="Backend for tailoring_mode = combined")
+
+
+class HedgeSettings(SettingsSection):
+    enabled: bool = Field(default=False, description="Send slow requests to a secondary backend as well and keep the first answer")
+    percentile: float = Field(default=95, description="Hedge once the primary is slower than this percentile of its recent latencies")
+    initial_delay_seconds: float = Field(default=10, description="Hedge delay used until min_samples latencies have been recorded")
+    min_delay_seconds: float = Field(default=0.5, description="Lower bound on the hedge delay")
+    min_samples: int = Field(default=20, description="Latencies needed before the percentile is trusted")
+    window: int = Field(default=200, description="Recent latencies kept per backend")
+    max_workers: int = Field(default=32, description="Threads running hedged synchronous requests")
+    secondary: StageLLMSettings = Field(default_factory=StageLLMSettings, description="Overrides of the stage's backend for the hedge (default: the same backend)")
+
+
+class PipelineSettings(SettingsSection):
+    tailoring_mode: str = Field(default="multi", description="multi: one request per section, combined: one request for all sections")
+    execution_mode: str = Field(default="threads", description="How independent stages of the synchronous pipeline run: sequential or threads")
+    stage_timeout: Optional[float] = Field(default=None, description="Seconds to wait for each concurrent stage (default: llm.timeout)")
+
+
+class CacheSettings(SettingsSection):
+    enabled: bool = Field(default=True, description="Cache chat completions on disk")
+    db_path: str = Field(default=".cache/completions.sqlite3", description="SQLite file holding cached completions")
+    max_entries: int = Field(default=1000, description="Least recently used entries are evicted above this size")
+    schema_path: Optional[str] = Field(default=None, description="JSON file persisting compiled structured-output schemas (default: memory only)")
+    ttl_seconds: Optional[float] = Field(default=7 * 24 * 3600, description="Seconds before a cached completion expires")
+
+
+class SelectionSettings(SettingsSection):
+    top_k_experiences: int = Field(default=5, description="Experiences sent to the LLM after embedding pre-selection")
+    top_k_projects: int = Field(default=5, description="Projects sent to the LLM after embedding pre-selection")
+    top_k_skills: int = Field(default=8, description="Skill groups sent to the LLM after embedding pre-selection")
+    cache_path: str = Field(default=".cache/embeddings.sqlite3", description="SQLite file holding cached item embeddings")
+    max_cache_entries: int = Field(default=10000, description="Least recently used embeddings are evicted above this size")
+
+
+class JobCacheSettings(SettingsSection):
+    enabled: bool = Field(default=True, description="Reuse tailored sections for near-duplicate job descriptions")
+    db_path: str = Field(default=".cache/jobs.sqlite3", description="SQLite file holding tailored sections per job description")
+    threshold: float = Field(default=0.85, description="Estimated Jaccard similarity of word shingles above which a cached tailoring is reused (1.0 = normalised text must match exactly)")
+    num_perm: int = Field(default=128, description="MinHash permutations; more gives a more precise similarity estimate")
+    shingle_size: int = Field(default=3, description="Words per shingle")
+    max_entries_per_scope: int = Field(default=500, description="Oldest postings per base resume and pipeline are evicted above this size")
+
+
+class ReplaySettings(SettingsSection):
+    recordings_path: Optional[str] = Field(default=None, description="JSONL file of recorded responses served by the Replay backend")
+    record_path: Optional[str] = Field(default=None, description="Append live provider responses to this JSONL file for later replay")
+    latency_distribution: str = Field(default="fixed", description="fixed, normal, lognormal or uniform")
+    latency_ms: float = Field(default=0, description="Mean simulated latency in milliseconds")
+    latency_stddev_ms: float = Field(default=0, description="Spread of the simulated latency in milliseconds")
+    error_rate: float = Field(default=0, description="Probability that a replayed request fails")
+    seed: int = Field(default=0, description="Seed for latency, failures and synthesised responses")
+
+
+class RateLimitSettings(SettingsSection):
+    requests_per_minute: Optional[int] = Field(default=None, description="Client-side request quota per backend (default: unlimited)")
+    tokens_per_minute: Optional[int] = Field(default=None, description="Client-side prompt token quota per backend (default: unlimited)")
+
+
+class RetrySettings(SettingsSection):
+    max_attempts: int = Field(default=3, description="Provider attempts per logical request, including the first")
+    deadline_seconds: Optional[float] = Field(default=None, description="Overall time budget per logical request (default: llm.timeout)")
+    backoff_seconds: float = Field(default=1, description="Base delay for jittered exponential backoff")
+    max_backoff_seconds: float = Field(default=30, description="Upper bound on a single backoff delay")
+    breaker_failure_threshold: int = Field(default=5, description="Consecutive failures that open a backend's circuit breaker")
+    breaker_reset_seconds: float = Field(default=30, description="Seconds an open circuit rejects calls before a trial request")
+
+
+class ServerSettings(SettingsSection):
+    gradio_ui: bool = Field(default=True, description="Mount the Gradio UI at /gradio_ui; disable for API-only workers to skip importing gradio")
+    warmup: bool = Field(default=True, description="Create clients, probe every configured backend and load the renderers at startup")
+    warmup_probe: bool = Field(default=True, description="Send a tiny completion to each backend during warm-up (loads Ollama models)")
+    warmup_timeout: float = Field(default=120, description="Seconds each backend probe may take")
+    ready_requires_backends: bool = Field(default=True, description="Report not ready while any backend probe has failed")
+    warmup_retry_seconds: float = Field(default=10, description="Seconds before a warm-up that left the worker unready runs again; doubles after each failure up to 5 minutes")
+    persist_outputs: bool = Field(default=False, description="Also save documents streamed by /generate/{format} under ./outputs")
+
+
+class RenderSettings(SettingsSection):
+    workers: int = Field(default=2, description="Rendering processes; 0 renders DOCX/PDF in the calling thread")
+    max_pending: int = Field(default=8, description="Resumes rendering or queued at once before new requests wait for a slot")
+    queue_timeout: float = Field(default=30, description="Seconds a request waits for a rendering slot before it is rejected")
+    docx_template: Optional[str] = Field(default=None, description="Prepared .docx defining the Resume styles (default: src/templates/docx/compact.docx)")
+
+
 class AppConfig(BaseSettings):
     llm: LLMSettings
+    stages: StagesSettings = Field(default_factory=StagesSettings)
+    hedge: HedgeSettings = Field(default_factory=HedgeSettings)
+    pipeline: PipelineSettings = Field(default_factory=PipelineSettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    selection: SelectionSettings = Field(default_factory=SelectionSettings)
+    job_cache: JobCacheSettings = Field(default_factory=JobCacheSettings)
+    replay: ReplaySettings = Field(default_factory=ReplaySettings)
+    rate_limit: RateLimitSettings = Field(default_factory=RateLimitSettings)
+    retry: RetrySettings = Field(default_factory=RetrySettings)
+    server: ServerSettings = Field(default_factory=ServerSettings)
+    render: RenderSettings = Field(default_factory=RenderSettings)
     
     model_config = SettingsConfigDict(toml_file="settings.toml", extra="allow")
 
@@ -76,22 +246,222 @@ def get_settings() -> AppConfig:
     return _settings
 
 
-def get_llm():
+def get_stage_llm_settings(stage=None) -> LLMSettings:
+    """
+    Return the LLM settings for a pipeline stage: `[llm]` with the stage's
+    `[stages.<stage>]` overrides applied.
+    """
     settings = get_settings()
+    overrides = getattr(settings.stages, stage, None) if stage else None
+    if overrides is None:
+        return settings.llm
+    return registry.get(
+        ("stage_llm", stage),
+        lambda: LLMSettings.model_validate({**settings.llm.model_dump(), **overrides.model_dump(exclude_none=True)}),
+    )
+
+
+def backend_id(llm_settings=None):
+    """
+    Identity of an LLM backend. Rate limiters, circuit breakers and latency and retry
+    metrics are keyed by it, so stages routed to different backends never share one.
+    """
+    llm_settings = llm_settings or get_settings().llm
+    return (llm_settings.model_type, llm_settings.api_base, llm_settings.model_name)
+
+
+def client_id(llm_settings=None):
+    """
+    Identity of a configured client: the backend plus every setting a client is built with.
+    Pooled HTTP and SDK clients, LLMs, outlines models and generators are keyed by it, so a
+    stage with its own temperature or max_new_tokens never reuses the `[llm]` instance.
+    """
+    llm_settings = llm_settings or get_settings().llm
+    return (*backend_id(llm_settings), llm_settings.model_dump_json())
+
+
+def get_http_limits(llm_settings=None):
+    import httpx
+
+    llm_settings = llm_settings or get_settings().llm
+    return httpx.Limits(
+        max_connections=llm_settings.max_connections,
+        max_keepalive_connections=llm_settings.max_keepalive_connections,
+        keepalive_expiry=llm_settings.keepalive_expiry,
+    )
+
+
+def get_http_client(llm_settings=None):
+    """
+    Return the pooled httpx client shared by the llama_index LLM and the provider SDK client.
+    """
+    import httpx
+
+    llm_settings = llm_settings or get_settings().llm
+    return registry.get(
+        ("http", client_id(llm_settings)),
+        lambda: httpx.Client(
+            timeout=llm_settings.timeout,
+            limits=get_http_limits(llm_settings),
+            event_hooks=usage_hooks(get_usage_stats()),
+        ),
+    )
+
+
+def get_async_http_client(llm_settings=None):
+    """
+    Return the pooled async httpx client for the running event loop.
+
+    Async connections are bound to the loop that opened them, so there is one pool per loop.
+    """
+    import httpx
+
+    llm_settings = llm_settings or get_settings().llm
+    return registry.get(
+        ("async_http", client_id(llm_settings), id(asyncio.get_running_loop())),
+        lambda: httpx.AsyncClient(
+            timeout=llm_settings.timeout,
+            limits=get_http_limits(llm_settings),
+            event_hooks=async_usage_hooks(get_usage_stats()),
+        ),
+    )
+
+
+def get_replay_backend():
+    """
+    Return the process-wide replay backend used when `llm.model_type = "Replay"`.
+    """
+    settings = get_settings()
+    return registry.get(
+        ("replay",),
+        lambda: ReplayBackend(
+            recordings_path=settings.replay.recordings_path,
+            latency_distribution=settings.replay.latency_distribution,
+            latency_ms=settings.replay.latency_ms,
+            latency_stddev_ms=settings.replay.latency_stddev_ms,
+            error_rate=settings.replay.error_rate,
+            seed=settings.replay.seed,
+        ),
+    )
+
+
+def get_genai_http_options(llm_settings=None):
+    from google import genai
+
+    # A single attempt per call; retries are owned by call_with_retry. Kept as a dict
+    # because llama_index JSON-serialises HttpOptions objects, which fails on httpx.Limits
+    return {
+        "client_args": {"limits": get_http_limits(llm_settings), "event_hooks": usage_hooks(get_usage_stats())},
+        "retry_options": genai.types.HttpRetryOptions(attempts=1),
+    }
+
+
+def _ollama_host(llm_settings):
+    # api_base points at Ollama's OpenAI-compatible /v1 endpoint for llama_index;
+    # the native client wants the bare host
+    return re.sub(r"/v1/?$", "", llm_settings.api_base) if llm_settings.api_base else None
+
+
+def _build_provider_client(llm_settings):
+    model_type = llm_settings.model_type
+
+    if model_type == "Ollama":
+        import ollama
+
+        return ollama.Client(
+            host=_ollama_host(llm_settings),
+            timeout=llm_settings.timeout,
+            limits=get_http_limits(llm_settings),
+            event_hooks=usage_hooks(get_usage_stats()),
+        )
+
+    if model_type == "ChatGPT":
+        import openai
+
+        return openai.OpenAI(
+            api_key=llm_settings.api_key or None,
+            base_url=llm_settings.api_base,
+            timeout=llm_settings.timeout,
+            max_retries=0,
+            http_client=get_http_client(llm_settings),
+        )
+
+    if model_type == "Gemini":
+        from google import genai
+
+        return genai.Client(
+            api_key=llm_settings.api_key or None,
+            http_options=get_genai_http_options(llm_settings),
+        )
+
+    return None
+
+
+def get_provider_client(llm_settings=None):
+    """
+    Return the pooled provider SDK client (openai, ollama or genai) for a backend.
+    """
+    llm_settings = llm_settings or get_settings().llm
+    return registry.get(("provider", client_id(llm_settings)), lambda: _build_provider_client(llm_settings))
+
+
+def _build_async_provider_client(llm_settings):
+    model_type = llm_settings.model_type
+
+    if model_type == "Ollama":
+        import ollama
+
+        return ollama.AsyncClient(
+            host=_ollama_host(llm_settings),
+            timeout=llm_settings.timeout,
+            limits=get_http_limits(llm_settings),
+            event_hooks=async_usage_hooks(get_usage_stats()),
+        )
+
+    if model_type == "ChatGPT":
+        import openai
+
+        return openai.AsyncOpenAI(
+            api_key=llm_settings.api_key or None,
+            base_url=llm_settings.api_base,
+            timeout=llm_settings.timeout,
+            max_retries=0,
+            http_client=get_async_http_client(llm_settings),
+        )
+
+    # outlines only wraps the synchronous genai client
+    return None
+
+
+def get_async_provider_client(llm_settings=None):
+    """
+    Return the pooled async provider SDK client for the running event loop.
+    """
+    llm_settings = llm_settings or get_settings().llm
+    return registry.get(
+        ("async_provider", client_id(llm_settings), id(asyncio.get_running_loop())),
+        lambda: _build_async_provider_client(llm_settings),
+    )
 
-    api_base = settings.llm.api_base
-    api_key = settings.llm.api_key 
-    model = settings.llm.model_name
-    temperature = settings.llm.temperature
-    timeout = settings.llm.timeout
-    context_length = settings.llm.context_length
-    max_new_tokens = settings.llm.max_new_tokens
+
+def _build_llm(llm_settings, async_http_client=None):
+    api_base = llm_settings.api_base
+    api_key = llm_settings.api_key 
+    model = llm_settings.model_name
+    temperature = llm_settings.temperature
+    timeout = llm_settings.timeout
+    context_length = llm_settings.context_length
+    max_new_tokens = llm_settings.max_new_tokens
     extra_arguments = (
-        settings.llm.extra_arguments or {}
+        llm_settings.extra_arguments or {}
     )
-    model_type = settings.llm.model_type
+    model_type = llm_settings.model_type
+
+    if model_type == "Replay":
+        llm = ReplayLLM(get_replay_backend())
+    elif model_type == "Gemini": 
+        from llama_index.llms.google_genai import GoogleGenAI
 
-    if model_type == "Gemini": 
         llm = GoogleGenAI(
             # api_base=api_base,
             api_key=api_key,
@@ -101,11 +471,13 @@ def get_llm():
             context_window=context_length,
             max_tokens=max_new_tokens,
             is_chat_model=True,
-            reuse_client=False,
-            max_retries=3,
+            max_retries=0,
+            http_options=get_genai_http_options(llm_settings),
             additional_kwargs={"extra_body": extra_arguments},
         )
     elif model_type == "ChatGPT" or model_type == "Ollama":
+        from llama_index.llms.openai_like import OpenAILike
+
         llm = OpenAILike(
             api_base=api_base,
             api_key=api_key,
@@ -115,49 +487,553 @@ def get_llm():
             context_window=context_length,
             max_tokens=max_new_tokens,
             is_chat_model=True,
-            reuse_client=False,
-            max_retries=3,
+            reuse_client=True,
+            http_client=get_http_client(llm_settings),
+            async_http_client=async_http_client,
+            max_retries=0,
             additional_kwargs={"extra_body": extra_arguments},
         )
 
     return llm
 
 
-    
+def get_llm(llm_settings=None):
+    """
+    Return the pooled llama_index LLM for a backend, built once per process.
+    """
+    llm_settings = llm_settings or get_settings().llm
+    return registry.get(("llm", client_id(llm_settings)), lambda: _build_llm(llm_settings))
 
 
-llm = get_llm()
-settings = get_settings()
+def get_async_llm(llm_settings=None):
+    """
+    Return the pooled llama_index LLM whose async calls use the running loop's connection pool.
+    """
+    llm_settings = llm_settings or get_settings().llm
+    if llm_settings.model_type not in ("ChatGPT", "Ollama"):
+        return get_llm(llm_settings)
+    return registry.get(
+        ("async_llm", client_id(llm_settings), id(asyncio.get_running_loop())),
+        lambda: _build_llm(llm_settings, async_http_client=get_async_http_client(llm_settings)),
+    )
+
 
-def get_client():
+def _build_client(llm_settings):
     model = None
-    if settings.llm.model_type == "Ollama":
-        client = ollama.Client()
+    client = get_provider_client(llm_settings)
+
+    if llm_settings.model_type == "Ollama":
+        import outlines
+
         model = outlines.from_ollama(
             client,
-            settings.llm.model_name,
+            llm_settings.model_name,
         )
     
-    if settings.llm.model_type == "ChatGPT":
-        client = openai.OpenAI()
+    if llm_settings.model_type == "ChatGPT":
+        import outlines
+
         model = outlines.from_openai(
             client,
-            settings.llm.model_name
+            llm_settings.model_name
         )
 
-    if settings.llm.model_type == "Gemini":
-        client = genai.Client()
+    if llm_settings.model_type == "Gemini":
+        import outlines
+
         model = outlines.from_gemini(
             client,
-            settings.llm.model_name
+            llm_settings.model_name
         )
+
+    if llm_settings.model_type == "Replay":
+        model = ReplayModel(get_replay_backend())
     
     return model
 
-@retry_with_backoff()
-def chat_completion(input, system_message=None, schema_cls=None) -> str:
-    llm = get_llm()
-    model = get_client()
+
+def get_client(llm_settings=None):
+    """
+    Return the pooled outlines model wrapping the provider client for a backend.
+    """
+    llm_settings = llm_settings or get_settings().llm
+    return registry.get(("outlines", client_id(llm_settings)), lambda: _build_client(llm_settings))
+
+
+def _build_async_client(llm_settings):
+    client = get_async_provider_client(llm_settings)
+
+    if llm_settings.model_type == "Ollama":
+        import outlines
+
+        return outlines.from_ollama(client, llm_settings.model_name)
+
+    if llm_settings.model_type == "ChatGPT":
+        import outlines
+
+        return outlines.from_openai(client, llm_settings.model_name)
+
+    if llm_settings.model_type == "Replay":
+        return ReplayModel(get_replay_backend(), is_async=True)
+
+    return None
+
+
+def get_async_client(llm_settings=None):
+    """
+    Return the pooled async outlines model for the running loop, or None when the
+    backend only has a synchronous outlines wrapper.
+    """
+    llm_settings = llm_settings or get_settings().llm
+    return registry.get(
+        ("async_outlines", client_id(llm_settings), id(asyncio.get_running_loop())),
+        lambda: _build_async_client(llm_settings),
+    )
+
+def get_schema_store():
+    settings = get_settings()
+    return registry.get(("schema_store", settings.cache.schema_path), lambda: SchemaStore(settings.cache.schema_path))
+
+
+def get_generator(schema_cls, llm_settings=None):
+    """
+    Return the outlines generator for `schema_cls`, compiled once per backend and schema.
+    """
+    llm_settings = llm_settings or get_settings().llm
+    return registry.get(
+        ("generator", client_id(llm_settings), schema_fingerprint(schema_cls)),
+        lambda: build_generator(get_client(llm_settings), schema_cls, get_schema_store()),
+    )
+
+
+def get_async_generator(schema_cls, llm_settings=None):
+    """
+    Return the async generator for `schema_cls` on the running loop, or None when the
+    backend has no async outlines model.
+    """
+    llm_settings = llm_settings or get_settings().llm
+    model = get_async_client(llm_settings)
+    if model is None:
+        return None
+    return registry.get(
+        ("async_generator", client_id(llm_settings), schema_fingerprint(schema_cls), id(asyncio.get_running_loop())),
+        lambda: build_generator(model, schema_cls, get_schema_store()),
+    )
+
+
+def get_rate_limiter(llm_settings=None):
+    """
+    Return the shared rate limiter for a backend.
+    """
+    settings = get_settings()
+    return registry.get(
+        ("rate_limiter", backend_id(llm_settings)),
+        lambda: RateLimiter(
+            requests_per_minute=settings.rate_limit.requests_per_minute,
+            tokens_per_minute=settings.rate_limit.tokens_per_minute,
+        ),
+    )
+
+
+def _pause_backend(llm_settings=None):
+    return lambda delay: get_rate_limiter(llm_settings).pause(delay)
+
+
+def get_retry_policy(llm_settings=None):
+    """
+    Return the retry budget applied to each logical LLM request.
+    """
+    settings = get_settings()
+    llm_settings = llm_settings or settings.llm
+    return RetryPolicy(
+        max_attempts=settings.retry.max_attempts,
+        deadline_seconds=settings.retry.deadline_seconds or llm_settings.timeout,
+        backoff_seconds=settings.retry.backoff_seconds,
+        max_backoff_seconds=settings.retry.max_backoff_seconds,
+    )
+
+
+def get_circuit_breaker(llm_settings=None):
+    """
+    Return the circuit breaker shared by every caller of a backend.
+    """
+    settings = get_settings()
+    return registry.get(
+        ("circuit_breaker", backend_id(llm_settings)),
+        lambda: CircuitBreaker(
+            failure_threshold=settings.retry.breaker_failure_threshold,
+            reset_seconds=settings.retry.breaker_reset_seconds,
+        ),
+    )
+
+
+def get_retry_metrics(llm_settings=None):
+    """
+    Return the retry counters for a backend.
+    """
+    return registry.get(("retry_metrics", backend_id(llm_settings)), RetryMetrics)
+
+
+def get_latency_tracker(llm_settings=None):
+    """
+    Return the rolling latency window of a backend.
+    """
+    settings = get_settings()
+    return registry.get(("latency", backend_id(llm_settings)), lambda: LatencyTracker(settings.hedge.window))
+
+
+def get_hedge_llm_settings(llm_settings=None):
+    """
+    Return the settings of the backend that hedges `llm_settings`, or None when hedging is off.
+    """
+    settings = get_settings()
+    if not settings.hedge.enabled:
+        return None
+    llm_settings = llm_settings or settings.llm
+    return registry.get(
+        ("hedge_llm", client_id(llm_settings)),
+        lambda: LLMSettings.model_validate({**llm_settings.model_dump(), **settings.hedge.secondary.model_dump(exclude_none=True)}),
+    )
+
+
+def get_hedge_policy():
+    settings = get_settings()
+    return HedgePolicy(
+        percentile=settings.hedge.percentile,
+        initial_delay_seconds=settings.hedge.initial_delay_seconds,
+        min_delay_seconds=settings.hedge.min_delay_seconds,
+        min_samples=settings.hedge.min_samples,
+    )
+
+
+def get_hedge_metrics(llm_settings=None):
+    return registry.get(("hedge_metrics", backend_id(llm_settings)), HedgeMetrics)
+
+
+def get_hedge_executor():
+    from concurrent.futures import ThreadPoolExecutor
+
+    settings = get_settings()
+    return registry.get(
+        ("hedge_executor",),
+        lambda: ThreadPoolExecutor(settings.hedge.max_workers, thread_name_prefix="hedge"),
+    )
+
+
+def get_usage_stats():
+    """
+    Return the prompt / provider-cached token totals, broken down by stage.
+    """
+    return registry.get(("usage",), UsageStats)
+
+
+def _backend_stats(kind, report):
+    stats = {}
+    for (backend, *_), client in registry.find(kind).items():
+        model_type, api_base, model_name = backend
+        stats[f"{model_type}:{model_name}@{api_base}"] = report(client)
+    return stats
+
+
+def get_stats() -> dict:
+    """
+    Counters of the completion and job caches, token usage per stage and, per backend
+    used so far, retry counts, circuit breaker state, latency percentiles and hedging.
+    """
+    completion_cache, job_cache = get_completion_cache(), get_job_cache()
+    return {
+        "completion_cache": completion_cache.stats() if completion_cache else None,
+        "job_cache": job_cache.stats() if job_cache else None,
+        "usage": get_usage_stats().snapshot(),
+        "retries": _backend_stats("retry_metrics", lambda metrics: metrics.snapshot()),
+        "circuit_breakers": _backend_stats("circuit_breaker", lambda breaker: breaker.state),
+        "latency": _backend_stats("latency", lambda tracker: tracker.snapshot()),
+        "hedging": _backend_stats("hedge_metrics", lambda metrics: metrics.snapshot()),
+    }
+
+
+def get_completion_cache():
+    """
+    Return the process-wide completion cache, or None when caching is disabled.
+    """
+    settings = get_settings()
+    if not settings.cache.enabled:
+        return None
+    return registry.get(
+        ("cache", settings.cache.db_path),
+        lambda: CompletionCache(
+            settings.cache.db_path,
+            max_entries=settings.cache.max_entries,
+            ttl_seconds=settings.cache.ttl_seconds,
+        ),
+    )
+
+
+def get_embedding_client():
+    """
+    Return the pooled OpenAI-compatible client for `llm.embedding_api_base`.
+    """
+    import openai
+
+    settings = get_settings()
+    return registry.get(
+        ("embedding", settings.llm.embedding_api_base),
+        lambda: openai.OpenAI(
+            api_key=settings.llm.embedding_api_key or os.getenv("OPENAI_API_KEY") or "EMPTY",
+            base_url=settings.llm.embedding_api_base,
+            timeout=settings.llm.timeout,
+            max_retries=0,
+        ),
+    )
+
+
+def get_embedding_cache():
+    settings = get_settings()
+    return registry.get(
+        ("embedding_cache", settings.selection.cache_path),
+        lambda: CompletionCache(settings.selection.cache_path, max_entries=settings.selection.max_cache_entries),
+    )
+
+
+def get_job_cache():
+    settings = get_settings()
+    if not settings.job_cache.enabled:
+        return None
+    return registry.get(
+        ("job_cache", settings.job_cache.db_path),
+        lambda: JobCache(
+            settings.job_cache.db_path,
+            threshold=settings.job_cache.threshold,
+            num_perm=settings.job_cache.num_perm,
+            shingle_size=settings.job_cache.shingle_size,
+            max_entries_per_scope=settings.job_cache.max_entries_per_scope,
+        ),
+    )
+
+
+def job_cache_scope(resume_skeleton, tailoring_mode):
+    """
+    Job cache scope for a base resume: tailorings are only shared between jobs that
+    start from the same resume and run through the same model, prompts and pipeline.
+    """
+    settings = get_settings()
+    return make_cache_key(
+        resume=resume_skeleton,
+        model_type=settings.llm.model_type,
+        model=settings.llm.model_name,
+        temperature=settings.llm.temperature,
+        prompt_version=PROMPT_VERSION,
+        tailoring_mode=tailoring_mode,
+        stages=settings.stages.model_dump(exclude_none=True),
+        selection=settings.selection.model_dump() if settings.llm.enable_embeddings else None,
+    )
+
+
+def embed_texts(texts):
+    """
+    Embed a batch of texts with the configured embedding model.
+    """
+    settings = get_settings()
+    response = call_with_retry(
+        lambda: get_embedding_client().embeddings.create(model=settings.llm.embedding_model_name, input=texts),
+        get_retry_policy(),
+    )
+    return [item.embedding for item in response.data]
+
+
+def preselect_sections(job_description, current_skills, current_projects, current_experiences):
+    """
+    Trim skills, projects and experiences to the top-K items closest to the job description.
+
+    Returns the sections unchanged when embeddings are disabled or the embedding backend fails.
+    """
+    settings = get_settings()
+    if not settings.llm.enable_embeddings:
+        return current_skills, current_projects, current_experiences
+
+    start = time.perf_counter()
+    try:
+        job_description = fit_job_description(job_description)
+        model = settings.llm.embedding_model_name
+        cache = get_embedding_cache()
+        selected = (
+            select_top_k(job_description, current_skills, settings.selection.top_k_skills, embed_texts, cache, model),
+            select_top_k(job_description, current_projects, settings.selection.top_k_projects, embed_texts, cache, model),
+            select_top_k(job_description, current_experiences, settings.selection.top_k_experiences, embed_texts, cache, model),
+        )
+    except Exception as e:
+        print(f"embedding pre-selection failed: {e} - sending every item")
+        return current_skills, current_projects, current_experiences
+
+    print(
+        f"pre-selection finished in {time.perf_counter() - start:.2f}s: "
+        f"skills {len(current_skills)}->{len(selected[0])}, "
+        f"projects {len(current_projects)}->{len(selected[1])}, "
+        f"experiences {len(current_experiences)}->{len(selected[2])}"
+    )
+    return selected
+
+
+def get_prompt_tokenizer():
+    settings = get_settings()
+    return get_tokenizer(settings.llm.tokenizer_path, settings.llm.tokenizer_model)
+
+
+def fit_job_description(job_description):
+    """
+    Truncate the job description to `llm.job_description_max_tokens` tokens.
+    """
+    settings = get_settings()
+    tokenizer = get_prompt_tokenizer()
+    fitted = truncate_to_tokens(job_description, settings.llm.job_description_max_tokens, tokenizer)
+    if fitted != job_description:
+        print(f"job description truncated to {settings.llm.job_description_max_tokens} tokens")
+    return fitted
+
+
+def check_prompt_budget(input, system_message=None, stage=None):
+    """
+    Count prompt tokens and refuse requests that would overflow the stage's
+    `context_length` once its `max_new_tokens` are reserved for the response.
+    """
+    llm_settings = get_stage_llm_settings(stage)
+    tokenizer = get_prompt_tokenizer()
+    prompt_tokens = count_tokens(input, tokenizer) + count_tokens(system_message, tokenizer)
+    print(f"stage {stage or 'chat'}: {prompt_tokens} prompt tokens")
+
+    budget = llm_settings.context_length - llm_settings.max_new_tokens
+    if prompt_tokens > budget:
+        raise PromptTooLongError(
+            f"Prompt for stage {stage or 'chat'} has {prompt_tokens} tokens, "
+            f"only {budget} fit in a context of {llm_settings.context_length}"
+        )
+    return prompt_tokens
+
+
+def chat_completion(input, system_message=None, schema_cls=None, use_cache=True, stage=None):
+    """
+    Run a chat completion, serving identical requests from the completion cache.
+
+    Pass `use_cache=False` to bypass the cache and always call the provider.
+    `stage` selects the backend configured under `[stages.<stage>]`, if any.
+    """
+    llm_settings = get_stage_llm_settings(stage)
+    cache = get_completion_cache() if use_cache else None
+    key, cached = _cache_lookup(cache, input, system_message, schema_cls, llm_settings)
+    if cached is not None:
+        return cached
+
+    prompt_tokens = check_prompt_budget(input, system_message, stage)
+    with stage_context(stage):
+        response = _chat_completion(input, system_message, schema_cls, prompt_tokens, llm_settings)
+    _store_response(cache, key, input, response, schema_cls, llm_settings)
+    return response
+
+
+async def achat_completion(input, system_message=None, schema_cls=None, use_cache=True, stage=None):
+    """
+    Async counterpart of `chat_completion` that never blocks the event loop on the provider.
+    """
+    llm_settings = get_stage_llm_settings(stage)
+    # The SQLite cache and tokenizing the prompt block, so they run in worker threads
+    cache = await asyncio.to_thread(get_completion_cache) if use_cache else None
+    key, cached = await asyncio.to_thread(_cache_lookup, cache, input, system_message, schema_cls, llm_settings)
+    if cached is not None:
+        return cached
+
+    prompt_tokens = await asyncio.to_thread(check_prompt_budget, input, system_message, stage)
+    with stage_context(stage):
+        response = await _achat_completion(input, system_message, schema_cls, prompt_tokens, llm_settings)
+    await asyncio.to_thread(_store_response, cache, key, input, response, schema_cls, llm_settings)
+    return response
+
+
+async def astream_chat_completion(input, system_message=None, use_cache=True, stage=None):
+    """
+    Stream a plain-text chat completion, yielding the accumulated text after every chunk.
+
+    A cached completion is yielded in one piece; a streamed one is cached once it finishes.
+    """
+    llm_settings = get_stage_llm_settings(stage)
+    cache = await asyncio.to_thread(get_completion_cache) if use_cache else None
+    key, cached = await asyncio.to_thread(_cache_lookup, cache, input, system_message, None, llm_settings)
+    if cached is not None:
+        yield cached
+        return
+
+    prompt_tokens = await asyncio.to_thread(check_prompt_budget, input, system_message, stage)
+    # Partial output has already been shown, so streams are not retried; they still feed the breaker
+    breaker = get_circuit_breaker(llm_settings)
+    trial = breaker.allow()
+    text = ""
+    try:
+        await get_rate_limiter(llm_settings).aacquire(prompt_tokens)
+        llm = get_async_llm(llm_settings)
+        async for chunk in await llm.astream_chat(_build_chat_list(input, system_message)):
+            if chunk.delta:
+                text += chunk.delta
+                yield text
+    except Exception as e:
+        if counts_against_backend(e):
+            breaker.record_failure()
+        raise
+    else:
+        breaker.record_success()
+    finally:
+        # A closed or cancelled stream and a fatal client error leave no verdict on the backend
+        if trial:
+            breaker.release_trial()
+
+    if text:
+        await asyncio.to_thread(_store_response, cache, key, input, text, llm_settings=llm_settings)
+
+
+def _cache_lookup(cache, input, system_message, schema_cls, llm_settings):
+    """
+    Return the completion cache key of a request and its cached response, or None on a miss.
+    """
+    key = _completion_cache_key(input, system_message, schema_cls, llm_settings)
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None and schema_cls:
+        return key, schema_cls.model_validate_json(cached)
+    return key, cached
+
+
+def _store_response(cache, key, input, response, schema_cls=None, llm_settings=None):
+    """
+    Save a provider response to the completion cache and, when configured, the replay recordings.
+    """
+    value = response.model_dump_json() if schema_cls else response
+    if cache is not None:
+        cache.set(key, value)
+
+    settings = get_settings()
+    llm_settings = llm_settings or settings.llm
+    if settings.replay.record_path and llm_settings.model_type != "Replay":
+        record_response(settings.replay.record_path, input, value, schema_cls)
+
+
+def _completion_cache_key(input, system_message, schema_cls, llm_settings=None):
+    # Keyed like the pooled clients, so backends or stages that differ in any setting never share completions
+    return make_cache_key(
+        client=client_id(llm_settings),
+        system_message=system_message,
+        input=input,
+        schema=schema_cls.model_json_schema() if schema_cls else None,
+    )
+
+
+async def aprobe_backend(llm_settings=None, prompt="Reply with the single word OK."):
+    """
+    Send one minimal chat request straight to a backend, bypassing the completion cache,
+    retries and rate limits, and return the reply text.
+    """
+    response = await get_async_llm(llm_settings).achat(_build_chat_list(prompt))
+    return _response_text(response)
+
+
+def _build_chat_list(input, system_message=None):
+    from llama_index.core.llms import ChatMessage, MessageRole
 
     chat_list: list[ChatMessage] = []
 
@@ -165,30 +1041,155 @@ def chat_completion(input, system_message=None, schema_cls=None) -> str:
         chat_list.append(ChatMessage(role=MessageRole.SYSTEM, content=system_message))
 
     chat_list.append(ChatMessage(role=MessageRole.USER, content=input))
+    return chat_list
 
-    if schema_cls:
-        # schema = schema_cls.model_json_schema()
-        # response_format = {
-        #     "type": "json_schema",
-        #     "json_schema": {"name": "json_structured_response", "schema": schema},
-        # }
-        # response = llm.chat(chat_list, response_format=response_format)
-
-        response = model(input, schema_cls)
-
-        result = schema_cls.model_validate_json(response)
-        return result
-
-    response = llm.chat(chat_list)
 
+def _response_text(response):
     if isinstance(response, str):
         return response
-    
+
     return str(
         response.message.content if hasattr(response, "message") else response.content
     )
 
 
+def _chat_completion(input, system_message=None, schema_cls=None, prompt_tokens=0, llm_settings=None):
+    """
+    Run one logical completion, hedged to the secondary backend when the primary is slow.
+    """
+    secondary = get_hedge_llm_settings(llm_settings)
+    if secondary is None:
+        return _backend_completion(input, system_message, schema_cls, prompt_tokens, llm_settings)
+    return hedged_call(
+        lambda: _backend_completion(input, system_message, schema_cls, prompt_tokens, llm_settings),
+        lambda: _backend_completion(input, system_message, schema_cls, prompt_tokens, secondary),
+        get_hedge_policy().delay(get_latency_tracker(llm_settings)),
+        get_hedge_executor(),
+        metrics=get_hedge_metrics(llm_settings),
+    )
+
+
+async def _achat_completion(input, system_message=None, schema_cls=None, prompt_tokens=0, llm_settings=None):
+    """
+    Async counterpart of `_chat_completion`.
+    """
+    secondary = get_hedge_llm_settings(llm_settings)
+    if secondary is None:
+        return await _abackend_completion(input, system_message, schema_cls, prompt_tokens, llm_settings)
+    return await ahedged_call(
+        lambda: _abackend_completion(input, system_message, schema_cls, prompt_tokens, llm_settings),
+        lambda: _abackend_completion(input, system_message, schema_cls, prompt_tokens, secondary),
+        get_hedge_policy().delay(get_latency_tracker(llm_settings)),
+        metrics=get_hedge_metrics(llm_settings),
+    )
+
+
+def _backend_completion(input, system_message=None, schema_cls=None, prompt_tokens=0, llm_settings=None):
+    """
+    Run one logical completion on one backend under its retry budget and circuit breaker.
+    """
+    start = time.perf_counter()
+    response = call_with_retry(
+        lambda: _chat_completion_attempt(input, system_message, schema_cls, prompt_tokens, llm_settings),
+        get_retry_policy(llm_settings),
+        breaker=get_circuit_breaker(llm_settings),
+        metrics=get_retry_metrics(llm_settings),
+        on_retry_after=_pause_backend(llm_settings),
+    )
+    get_latency_tracker(llm_settings).record(time.perf_counter() - start)
+    return response
+
+
+async def _abackend_completion(input, system_message=None, schema_cls=None, prompt_tokens=0, llm_settings=None):
+    """
+    Async counterpart of `_backend_completion`.
+    """
+    start = time.perf_counter()
+    response = await acall_with_retry(
+        lambda: _achat_completion_attempt(input, system_message, schema_cls, prompt_tokens, llm_settings),
+        get_retry_policy(llm_settings),
+        breaker=get_circuit_breaker(llm_settings),
+        metrics=get_retry_metrics(llm_settings),
+        on_retry_after=_pause_backend(llm_settings),
+    )
+    get_latency_tracker(llm_settings).record(time.perf_counter() - start)
+    return response
+
+
+def _structured_kwargs(llm_settings, schema_cls):
+    """
+    Extra chat() arguments that ask the backend for JSON matching `schema_cls`.
+    """
+    if llm_settings.model_type == "Replay":
+        # The replay backend synthesises schema-valid JSON whatever the strategy
+        return {"schema_cls": schema_cls}
+    if llm_settings.structured_output != "native":
+        return {}
+    if llm_settings.model_type == "Gemini":
+        return {"generation_config": gemini_generation_config(schema_cls)}
+    return {"response_format": response_format(schema_cls)}
+
+
+def _structured_chat_list(input, system_message, schema_cls, llm_settings):
+    if llm_settings.structured_output == "json":
+        # Appended rather than prepended so the prompt prefix stays shared between stages
+        input = input + schema_instruction(schema_cls)
+    return _build_chat_list(input, system_message)
+
+
+def _chat_completion_attempt(input, system_message=None, schema_cls=None, prompt_tokens=0, llm_settings=None) -> str:
+    llm_settings = llm_settings or get_settings().llm
+    get_rate_limiter(llm_settings).acquire(prompt_tokens)
+    llm = get_llm(llm_settings)
+
+    if schema_cls:
+        if llm_settings.structured_output == "outlines":
+            response = get_generator(schema_cls, llm_settings)(input)
+        else:
+            response = _response_text(llm.chat(
+                _structured_chat_list(input, system_message, schema_cls, llm_settings),
+                **_structured_kwargs(llm_settings, schema_cls),
+            ))
+        return parse_structured(response, schema_cls)
+
+    response = llm.chat(_build_chat_list(input, system_message))
+    return _response_text(response)
+
+
+async def _achat_completion_attempt(input, system_message=None, schema_cls=None, prompt_tokens=0, llm_settings=None) -> str:
+    llm_settings = llm_settings or get_settings().llm
+    await get_rate_limiter(llm_settings).aacquire(prompt_tokens)
+    llm = get_async_llm(llm_settings)
+
+    if schema_cls:
+        if llm_settings.structured_output == "outlines":
+            generator = get_async_generator(schema_cls, llm_settings)
+            if generator is not None:
+                response = await generator(input)
+            else:
+                response = await asyncio.to_thread(get_generator(schema_cls, llm_settings), input)
+        else:
+            response = _response_text(await llm.achat(
+                _structured_chat_list(input, system_message, schema_cls, llm_settings),
+                **_structured_kwargs(llm_settings, schema_cls),
+            ))
+        return parse_structured(response, schema_cls)
+
+    response = await llm.achat(_build_chat_list(input, system_message))
+    return _response_text(response)
+
+
+def _skills_request(job_description, current_skills):
+    prompt = build_prompt(
+        fit_job_description(job_description),
+        SKILLS_TASK,
+        SKILLS_EXAMPLE,
+        [("Current Skills", compact_json(current_skills))],
+    )
+
+    return prompt, skills
+
+
 def extract_skills_from_job(job_description, current_skills,):
     """
     Extract skills from a job description with a retry mechanism to handle API failures.
@@ -200,72 +1201,44 @@ def extract_skills_from_job(job_description, current_skills,):
         retry_delay (int): Time in seconds to wait before retrying.
 
     Returns:
-        dict: Enhanced skills in structured format or an empty dictionary on failure.
-    """
-    prompt = f"""
-        Below is a list of skills grouped by categories. 
-
-        Example format:
-        {{
-            "skills": [
-                {{
-                "name": "Customer-focused service and engagement",
-                "description": [
-                    "Ability to understand and respond to customer needs",
-                    "Friendly and helpful demeanor",
-                    "Efficient handling of customer inquiries"
-                ]
-                }},
-                {{
-                "name": "Strong communication and teamwork",
-                "description": [
-                    "Clearly communicates with team members",
-                    "Listens actively and respectfully",
-                    "Contributes ideas and supports team goals"
-                ]
-                }}
-            ]
-            }}
-
-
-        Current Skills:
-        {json.dumps(current_skills)}
-
-        Based on the following job description, extract both the original and any additional relevant technical and soft skills and selected the best 5 skills only.
-
-        Job Description:
-        {job_description}
-
-        Return the result strictly in JSON, using the format shown above.
-        """
-
-    class skill(BaseModel):
-        name: str
-        description: list[str]
-
-    class skills(BaseModel):
-        skills: list[skill]
+        dict: Enhanced section in structured format. Raises on failure so the pipeline
+        keeps the original section.
+    """
+    prompt, schema_cls = _skills_request(job_description, current_skills)
 
-    try:
-        response = chat_completion(
-            input = prompt,
-            schema_cls= skills
-        )
+    response = chat_completion(
+        input = prompt,
+        stage = "skills",
+        schema_cls= schema_cls
+    )
+
+    return response.model_dump()
+
+
+async def aextract_skills_from_job(job_description, current_skills):
+    """
+    Async variant of `extract_skills_from_job` for use inside an event loop.
+    """
+    prompt, schema_cls = await asyncio.to_thread(_skills_request, job_description, current_skills)
+
+    response = await achat_completion(
+        input = prompt,
+        stage = "skills",
+        schema_cls= schema_cls
+    )
+    return response.model_dump()
+
+
+def _experiences_request(job_description, current_experiences):
+    prompt = build_prompt(
+        fit_job_description(job_description),
+        EXPERIENCES_TASK,
+        EXPERIENCES_EXAMPLE,
+        [("Current Experience", compact_json(current_experiences))],
+    )
+
+    return prompt, Experiences
 
-        return response.model_dump()
-            
-        # response = str(
-        #     response.message.content if hasattr(response, "message") else response.content
-        # )
-        
-        # Extract raw content and JSON
-       
-             # Parse JSON response into Python dictionary
-        
-    except Exception as e:
-        print(str(e))         
-        return {"Skills": {}}  # Return an empty structure on failure
-            
 
 def extract_experiences_from_job(job_description, current_experiences, ):
     """
@@ -278,76 +1251,43 @@ def extract_experiences_from_job(job_description, current_experiences, ):
         retry_delay (int): Time in seconds to wait before retrying.
 
     Returns:
-        dict: Enhanced skills in structured format or an empty dictionary on failure.
+        dict: Enhanced section in structured format. Raises on failure so the pipeline
+        keeps the original section.
     """
-    
-    prompt = f"""
-        Below is a list of skills grouped by categories. 
-
-        Example format:
-        {{
-            "experience": [
-                {{
-                    "title": "Team Member",
-                    "company": "Value Village, Toronto, Canada",
-                    "duration": "Jul 2024",
-                    "responsibilities": [
-                        "Delivered excellent service by assisting customers with product selection and addressing inquiries.",
-                        "Maintained visually appealing displays and organized merchandise for easy navigation."
-                    ]
-                }},
-                {{
-                    "title": "Team Member",
-                    "company": "Wendy's, Toronto, ON",
-                    "duration": "Dec 2022 - Jun 2023",
-                    "responsibilities": [
-                        "Provided friendly and efficient service at the counter, managing orders with accuracy and speed.",
-                        "Operated POS system, processed payments, and ensured correct change was given."
-                    ]
-                }}
-            ]
-        }}
-
-        Current Experience:
-        {json.dumps(current_experiences)}
-
-        Based on the following job description, extract both the original and any additional relevant technical and soft experiences and selected the best 3 experiences only.
-
-        Job Description:
-        {job_description}
-
-        Return the result strictly in JSON, using the format shown above.
-        """
-
-    class Experience(BaseModel):
-        title: str
-        company: str
-        duration: str
-        responsibilities: list[str]
-
-    class Experiences(BaseModel):
-        experiences: list[Experience]
+    prompt, schema_cls = _experiences_request(job_description, current_experiences)
+
+    response = chat_completion(
+        input = prompt,
+        stage = "experiences",
+        schema_cls= schema_cls
+    )
+    return response.model_dump()
+
+
+async def aextract_experiences_from_job(job_description, current_experiences):
+    """
+    Async variant of `extract_experiences_from_job` for use inside an event loop.
+    """
+    prompt, schema_cls = await asyncio.to_thread(_experiences_request, job_description, current_experiences)
+
+    response = await achat_completion(
+        input = prompt,
+        stage = "experiences",
+        schema_cls= schema_cls
+    )
+    return response.model_dump()
+
+
+def _projects_request(job_description, current_projects):
+    prompt = build_prompt(
+        fit_job_description(job_description),
+        PROJECTS_TASK,
+        PROJECTS_EXAMPLE,
+        [("Current Projects", compact_json(current_projects))],
+    )
+
+    return prompt, projects
 
-    try:
-        
-        response = chat_completion(
-            input = prompt,
-            schema_cls= Experiences
-        )
-        return response.model_dump()
-        # # Extract raw content and JSON
-        # response = str(
-        #     response.message.content if hasattr(response, "message") else response.content
-        # )
-        # match = re.search(r"```json\n(.*?)\n```", response, re.DOTALL)
-        # if match:
-        #     json_content = match.group(1).strip()
-            
-        # return json.loads(json_content)  # Parse JSON response into Python dictionary
-        
-    except Exception as e:
-        print(str(e))         
-        return {"Skills": {}}  # Return an empty structure on failure
 
 def extract_projects_from_job(job_description, current_projects):
     """
@@ -360,67 +1300,48 @@ def extract_projects_from_job(job_description, current_projects):
         retry_delay (int): Time in seconds to wait before retrying.
 
     Returns:
-        dict: Enhanced skills in structured format or an empty dictionary on failure.
-    """
-    prompt = f"""
-        Below is a list of projects grouped by categories. 
-
-        Example format:
-        {{
-            "projects": [
-                {{
-                    "name": "Team Member",
-                    "description": "Delivered excellent service by assisting customers with product selection and addressing inquiries. Maintained visually appealing displays and organized merchandise for easy navigation."
-                }},
-                {{
-                    "name": "Team Member",
-                    "description": "Delivered excellent service by assisting customers with product selection and addressing inquiries. Maintained visually appealing displays and organized merchandise for easy navigation."
-                }}
-            ]
-        }}
-
-        Current Experience:
-        {json.dumps(current_projects)}
-
-        Based on the following job description, extract both the original and any additional relevant technical and soft projects and selected the best 3 projects only.
-
-        Job Description:
-        {job_description}
-
-        Return the result strictly in JSON, using the format shown above.
-        """
-    
-    class project(BaseModel):
-        name:str
-        description:str
+        dict: Enhanced section in structured format. Raises on failure so the pipeline
+        keeps the original section.
+    """
+    prompt, schema_cls = _projects_request(job_description, current_projects)
 
-    class projects(BaseModel):
-        projects: list[project]
-    
-    
-    try:
-        response = chat_completion(
-            input = prompt,
-            schema_cls= projects
-            )
-
-        return response.model_dump()
-        # # Extract raw content and JSON
-        # response = str(
-        #     response.message.content if hasattr(response, "message") else response.content
-        # )
-        # match = re.search(r"```json\n(.*?)\n```", response, re.DOTALL)
-        # if match:
-        #     json_content = match.group(1).strip()
-            
-        # return json.dumps(json_content)  # Parse JSON response into Python dictionary
+    response = chat_completion(
+        input = prompt,
+        stage = "projects",
+        schema_cls= schema_cls
+        )
+
+    return response.model_dump()
+
+
+async def aextract_projects_from_job(job_description, current_projects):
+    """
+    Async variant of `extract_projects_from_job` for use inside an event loop.
+    """
+    prompt, schema_cls = await asyncio.to_thread(_projects_request, job_description, current_projects)
+
+    response = await achat_completion(
+        input = prompt,
+        stage = "projects",
+        schema_cls= schema_cls
+    )
+    return response.model_dump()
+
+
+def _summary_request(job_description, enhanced_skills, enhanced_projects, enhanced_experiences, current_summary):
+    prompt = build_prompt(
+        fit_job_description(job_description),
+        SUMMARY_TASK,
+        SUMMARY_EXAMPLE,
+        [
+            ("Current Skills", compact_json(enhanced_skills)),
+            ("Current Experience", compact_json(enhanced_experiences)),
+            ("Current Projects", compact_json(enhanced_projects)),
+        ],
+    )
+
+    return prompt
 
-    
-    except Exception as e:
-        print(str(e))         
-        return {"projects": []}  # Return an empty structure on failure
-            
-      
 
 def extract_summary_from_job(job_description, enhanced_skills, enhanced_projects, enhanced_experiences, current_summary):
     """
@@ -433,44 +1354,110 @@ def extract_summary_from_job(job_description, enhanced_skills, enhanced_projects
         retry_delay (int): Time in seconds to wait before retrying.
 
     Returns:
-        dict: Enhanced skills in structured format or an empty dictionary on failure.
+        dict: Enhanced section in structured format. Raises on failure so the pipeline
+        keeps the original section.
     """
-    prompt = f"""
-        Below is a list of skills grouped by categories. 
+    prompt = _summary_request(job_description, enhanced_skills, enhanced_projects, enhanced_experiences, current_summary)
 
-        Example format:
-            "Friendly and engaging team member with strong experience in retail and food service environments, known for delivering exceptional customer experiences. Adept at handling transactions, assisting with product inquiries, and creating welcoming, clean, and organized spaces. Passionate about retail, with a positive attitude and a focus on building customer loyalty through helpful service and effective communication. Quick to adapt, eager to learn, and committed to supporting a collaborative team environment."
-        
+    response = chat_completion(
+        input = prompt,
+        stage = "summary",
+    )
 
+    return {"summary": response}
 
-        Current Skills:
-        {json.dumps(enhanced_skills)}
 
-        Current Experience:
-        {json.dumps(enhanced_experiences)}
+async def aextract_summary_from_job(job_description, enhanced_skills, enhanced_projects, enhanced_experiences, current_summary):
+    """
+    Async variant of `extract_summary_from_job` for use inside an event loop.
+    """
+    prompt = await asyncio.to_thread(_summary_request, job_description, enhanced_skills, enhanced_projects, enhanced_experiences, current_summary)
 
-        Current Projects:
-        {json.dumps(enhanced_projects)}
+    response = await achat_completion(
+        input = prompt,
+        stage = "summary",
+    )
+    return {"summary": response}
 
 
-        Based on the following job description, extract a suitable summary that is short ans sweet with a maximum of 3 sentences. availability: Monday to Friday (Weekdays) 5 pm to Closing ; Sunday, Saturday (Weekends) 8am to 11 pm
+async def astream_summary_from_job(job_description, enhanced_skills, enhanced_projects, enhanced_experiences, current_summary):
+    """
+    Stream the summary, yielding the partial summary text as it is generated.
+    """
+    prompt = await asyncio.to_thread(_summary_request, job_description, enhanced_skills, enhanced_projects, enhanced_experiences, current_summary)
+
+    async for text in astream_chat_completion(input = prompt, stage = "summary"):
+        yield text
+
+
+def _combined_request(job_description, current_skills, current_projects, current_experiences, current_summary=None, include_summary=True):
+    prompt = build_prompt(
+        fit_job_description(job_description),
+        COMBINED_TASK + (COMBINED_SUMMARY_TASK if include_summary else "") + " Return the result strictly in JSON, using the example format.",
+        COMBINED_EXAMPLE % (COMBINED_SUMMARY_EXAMPLE if include_summary else ""),
+        [
+            ("Current Skills", compact_json(current_skills)),
+            ("Current Projects", compact_json(current_projects)),
+            ("Current Experience", compact_json(current_experiences)),
+            ("Current Summary", compact_json(current_summary)),
+        ],
+    )
 
-        Job Description:
-        {job_description}
+    return prompt, tailored_resume if include_summary else tailored_sections
 
-        Return the result strictly in String, using the format shown above.
-        """
 
-    try:
-        response = chat_completion(
-            input = prompt,
-        )
-            
-        return {"summary": response}  # Parse JSON response into Python dictionary
+def _split_combined(data, include_summary):
+    """
+    Split a combined response into the section shapes returned by the extract_*_from_job functions.
+    """
+    sections = {
+        "skills": {"skills": data["skills"]},
+        "projects": {"projects": data["projects"]},
+        "experiences": {"experiences": data["experiences"]},
+    }
+    if include_summary:
+        sections["summary"] = {"summary": data["summary"]}
+    return sections
 
 
-    except Exception as e:
-        print(str(e))         
-        return {"summary": ""}  # Return an empty structure on failure
-            
+def extract_all_from_job(job_description, current_skills, current_projects, current_experiences, current_summary=None, include_summary=True):
+    """
+    Tailor skills, projects, experiences and optionally the summary with a single structured request.
 
+    Args:
+        job_description (str): The job description.
+        current_skills (list): Current skills data to be passed to the model.
+        current_projects (list): Current projects data to be passed to the model.
+        current_experiences (list): Current experiences data to be passed to the model.
+        current_summary (str): Current summary, used when include_summary is True.
+        include_summary (bool): Also generate the summary in the same request.
+
+    Returns:
+        dict: {"skills": ..., "projects": ..., "experiences": ..., "summary": ...} in the same
+        shapes as the individual extract_*_from_job functions. Raises on failure so the caller
+        can fall back to the multi-call mode or the original sections.
+    """
+    prompt, schema_cls = _combined_request(
+        job_description, current_skills, current_projects, current_experiences, current_summary, include_summary
+    )
+    response = chat_completion(
+        input = prompt,
+        stage = "combined",
+        schema_cls= schema_cls
+    )
+    return _split_combined(response.model_dump(), include_summary)
+
+
+async def aextract_all_from_job(job_description, current_skills, current_projects, current_experiences, current_summary=None, include_summary=True):
+    """
+    Async variant of `extract_all_from_job` for use inside an event loop.
+    """
+    prompt, schema_cls = await asyncio.to_thread(
+        _combined_request, job_description, current_skills, current_projects, current_experiences, current_summary, include_summary
+    )
+    response = await achat_completion(
+        input = prompt,
+        stage = "combined",
+        schema_cls= schema_cls
+    )
+    return _split_combined(response.model_dump(), include_summary)
@@ -1,211 +1,161 @@
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from textwrap import wrap
+from reportlab.pdfbase import pdfmetrics
 from reportlab.lib import colors
+import functools
+import re
 
+from src.services.layout import BULLET, Run
 
-def save_as_pdf(data, pdf_file="resume.pdf"):
+
+_WHITESPACE = re.compile(r"(\s+)")
+
+
+@functools.lru_cache(maxsize=65536)
+def token_width(token, font, size):
+    """
+    Width of a word (or character) in points, measured once per font, size and token.
+    """
+    return pdfmetrics.stringWidth(token, font, size)
+
+
+def _split_long_word(word, max_width, font, size):
+    # A word wider than the line is broken between characters
+    chunks, chunk, chunk_width = [], "", 0.0
+    for char in word:
+        char_width = token_width(char, font, size)
+        if chunk and chunk_width + char_width > max_width:
+            chunks.append((chunk, chunk_width))
+            chunk, chunk_width = "", 0.0
+        chunk += char
+        chunk_width += char_width
+    if chunk:
+        chunks.append((chunk, chunk_width))
+    return chunks
+
+
+def run_font(run):
+    """Helvetica variant for a layout run."""
+    if run.bold and run.italic:
+        return "Helvetica-BoldOblique"
+    if run.bold:
+        return "Helvetica-Bold"
+    if run.italic:
+        return "Helvetica-Oblique"
+    return "Helvetica"
+
+
+def wrap_runs(runs, max_width, size=12):
+    """
+    Greedy word wrap of styled layout runs into lines at most `max_width` points wide.
+
+    Each word is measured once and line widths are accumulated, so wrapping is linear in
+    the length of the text. Words longer than a line are broken across lines.
+
+    Returns lines as lists of (gap, fragments) words, where `gap` is the width of the
+    whitespace before the word and each fragment is (text, font, size, run, width).
+    Text of adjacent runs with no whitespace between them stays one word.
+    """
+    words, word, gap = [], [], 0.0
+    for run in runs:
+        font, run_size = run_font(run), run.size or size
+        for piece in _WHITESPACE.split(run.text):
+            if not piece:
+                continue
+            if not piece.isspace():
+                word.append((piece, font, run_size, run, token_width(piece, font, run_size)))
+                continue
+            if word:
+                words.append((gap, word))
+                word, gap = [], 0.0
+            gap += token_width(" ", font, run_size) * len(piece)
+    if word:
+        words.append((gap, word))
+
+    lines, line, line_width = [], [], 0.0
+    for gap, fragments in words:
+        word_width = sum(fragment[4] for fragment in fragments)
+        if word_width > max_width and len(fragments) == 1:
+            text, font, run_size, run, _ = fragments[0]
+            pieces = [(gap, [(chunk, font, run_size, run, chunk_width)])
+                      for chunk, chunk_width in _split_long_word(text, max_width, font, run_size)]
+        else:
+            pieces = [(gap, fragments)]
+        for piece_gap, piece in pieces:
+            piece_width = sum(fragment[4] for fragment in piece)
+            if line and line_width + piece_gap + piece_width <= max_width:
+                line.append((piece_gap, piece))
+                line_width += piece_gap + piece_width
+                continue
+            if line:
+                lines.append(line)
+            line, line_width = [(0.0, piece)], piece_width
+    if line:
+        lines.append(line)
+    return lines
+
+
+def line_segments(line, x):
     """
-    Generate a PDF directly using ReportLab with proper text wrapping, pagination, and empty headers for subsequent pages.
+    Merge the words of a wrapped line that belong to the same run into one string, so
+    each run is drawn with a single call. Yields (text, font, size, run, x, width).
+    """
+    segment = None
+    for gap, fragments in line:
+        for index, (text, font, size, run, fragment_width) in enumerate(fragments):
+            if index == 0:
+                x += gap
+            if segment and segment[3] is run:
+                spaces = " " * round(gap / token_width(" ", font, size)) if index == 0 else ""
+                segment[0] += spaces + text
+                segment[5] = x + fragment_width - segment[4]
+            else:
+                if segment:
+                    yield tuple(segment)
+                segment = [text, font, size, run, x, fragment_width]
+            x += fragment_width
+    if segment:
+        yield tuple(segment)
+
+
+def render_pdf(layout, pdf_file="resume.pdf"):
+    """
+    Draw a resume layout (see layout.layout_resume) with ReportLab, wrapping every
+    block and starting a new page whenever the next line would not fit. `pdf_file`
+    is a path or a binary file object such as `io.BytesIO`.
     """
     c = canvas.Canvas(pdf_file, pagesize=letter)
     width, height = letter
     margin = 35
+    bullet_indent = 10
     y = height - margin
-    first_page = True
-
-    def draw_empty_line():
-        """Draw a horizontal line."""
-        nonlocal y
-        c.line(0.0000, y, 0.0000, y)
-        y -= 20
-
-    def draw_line():
-        """Draw a horizontal line."""
-        nonlocal y
-        c.line(margin, y, width - margin, y)
-        y -= 20
-
-    def add_wrapped_text_with_styles(
-        prefix=None,
-        text="",
-        font="Helvetica",
-        size=12,
-        bold_prefix=False,
-        wrap_width=90,
-        indent=0,
-    ):
-        """
-        Add wrapped text with optional bold prefixes and accurate wrapping logic.
-        """
-        nonlocal y, first_page
-
-        # Ensure enough space for a new page
-        if y < margin + size + 10:
-            c.showPage()
-            y = height - margin
-            first_page = False
-            draw_empty_header()
-
-        c.setFont(font, size)
-
-        # Combine prefix and text, if applicable
-        full_text = f"{prefix}: {text}" if prefix else text
-
-        # Accurate wrapping
-        words = full_text.split(" ")
-        lines = []
-        current_line = ""
-        for word in words:
-            test_line = f"{current_line} {word}".strip()
-            if c.stringWidth(test_line, font, size) <= (width - 2 * margin - indent):
-                current_line = test_line
-            else:
-                lines.append(current_line)
-                current_line = word
-        if current_line:
-            lines.append(current_line)
-
-        # Draw each line
-        for line in lines:
-            x = margin + indent
-            if prefix and bold_prefix and line.startswith(f"{prefix}:"):
-                # Draw prefix in bold
-                c.setFont("Helvetica-Bold", size)
-                prefix_width = c.stringWidth(f"{prefix}: ", "Helvetica-Bold", size)
-                c.drawString(x, y, f"{prefix}: ")
+
+    for block in layout.blocks():
+        indent = bullet_indent if block.kind == BULLET else 0
+        runs = (Run("- "),) + block.runs if block.kind == BULLET else block.runs
+        for line in wrap_runs(runs, width - 2 * margin - indent, block.size):
+            line_size = max(fragment[2] for _, fragments in line for fragment in fragments)
+            if y < margin + line_size:
+                c.showPage()
+                y = height - margin
+            line_width = sum(gap + sum(fragment[4] for fragment in fragments) for gap, fragments in line)
+            x = (width - line_width) / 2 if block.centered else margin + indent
+            for text, font, size, run, x, segment_width in line_segments(line, x):
                 c.setFont(font, size)
-                c.drawString(x + prefix_width, y, line[len(f"{prefix}: ") :])
-            else:
-                c.drawString(x, y, line)
-            y -= size + 2
-
-    def draw_empty_header():
-        """Draw an empty header on pages after the first."""
-        nonlocal y
-        if not first_page:
-            y = height - margin
-
-    def add_contact_info():
-        """
-        Add contact information in one line with clickable hyperlinks.
-        """
-        nonlocal y
-        contact_text = f"P: {data['header']['contact']['phone']} | LinkedIn | Email"
-        text_width = c.stringWidth(contact_text, "Helvetica", 12)
-        x = 0 + 100
-        c.setFont("Helvetica", 12)
-
-        # Add Phone
-        c.drawString(x, y, f"P: {data['header']['contact']['phone']}")
-        x += c.stringWidth(
-            f"P: {data['header']['contact']['phone']} | ", "Helvetica", 12
-        ) + 20
-
-        # Add LinkedIn
-        c.setFillColor(colors.blue)
-        c.drawString(x, y, data["header"]["contact"]["linkedin"])
-        c.linkURL(
-            data["header"]["contact"]["linkedin"],
-            (x, y - 2, x + c.stringWidth("LinkedIn", "Helvetica", 10), y + 10),
-            relative=0,
-        )
-        x += c.stringWidth(data["header"]["contact"]["linkedin"], "Helvetica", 12) + 20
-
-        # Add Email
-        c.drawString(x, y, data["header"]["contact"]["email"])
-        c.linkURL(
-            f"mailto:{data['header']['contact']['email']}",
-            (x, y - 2, x + c.stringWidth("Email", "Helvetica", 10), y + 10),
-            relative=0,
-        )
-        c.setFillColor(colors.black)
-        y -= 15
-
-    # First Page Header
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(
-        (width - c.stringWidth(data["header"]["name"], "Helvetica-Bold", 16)) / 2,
-        y,
-        data["header"]["name"],
-    )
-    y -= 30
-
-    # Add contact info
-    add_contact_info()
-    draw_line()
-
-    # Summary Section
-    add_wrapped_text_with_styles(
-        "Summary", data["summary"], font="Helvetica", size=12, bold_prefix=True
-    )
-    draw_line()
-    # draw_empty_line()
-
-    # Education Section
-    add_wrapped_text_with_styles(
-        "Education", font="Helvetica", size=12, bold_prefix=True
-    )
-    for edu in data["education"]:
-        add_wrapped_text_with_styles(
-            f"{edu['degree']} - {edu['university']}", bold_prefix=True
-        )
-        add_wrapped_text_with_styles(
-            f"GPA: {edu.get('gpa', 'N/A')} ({edu.get('graduation_date', 'N/A')})"
-        )
-    draw_line()
-    # draw_empty_line()
-
-    # Technical Skills Section
-    add_wrapped_text_with_styles(
-        "Technical Skills", font="Helvetica", size=12, bold_prefix=True
-    )
-    skills_data = data["skills"].get("skills", [])
-    for skill in skills_data:
-        add_wrapped_text_with_styles(skill['name'], ", ".join(skill['description']), bold_prefix=True)
-    draw_line()
-    # draw_empty_line()
-
-    
-    if data.get("experience"):
-        # Work Experience Section
-        add_wrapped_text_with_styles(
-            "Work Experience", font="Helvetica", size=12, bold_prefix=True
-        )
-        for exp in data["experience"].get("experiences", []):
-            add_wrapped_text_with_styles(
-                f"{exp['title']} - {exp['company']} ({exp['duration']})", bold_prefix=True
-            )
-            for responsibility in exp.get("responsibilities", []):
-                add_wrapped_text_with_styles(f"- {responsibility}", indent=10)
-        draw_line()
-
-    if data.get("projects"):
-            # Project Experience Section
-        add_wrapped_text_with_styles("Project Experience", font="Helvetica", size=12, bold_prefix=True)
-        for project in data["projects"].get("projects", []):
-            add_wrapped_text_with_styles(project["name"], project["description"], bold_prefix=True)
-
-
-        # for project in data.get("projects", {}):
-        #     add_wrapped_text_with_styles(
-        #         f"{project['name']}", bold_prefix=True
-        #     )
-        #     for responsibility in project.get("description", []):
-        #         add_wrapped_text_with_styles(f"- {responsibility}", indent=10)
-        draw_line()
-    # draw_empty_line()
-
-    add_wrapped_text_with_styles(
-        "Availability",
-        data["availability"],
-        font="Helvetica",
-        size=12,
-        bold_prefix=True,
-    )
-
-    
+                if run.link:
+                    c.setFillColor(colors.blue)
+                    c.linkURL(run.link, (x, y - 2, x + segment_width, y + size), relative=0)
+                elif run.color:
+                    c.setFillColor(colors.HexColor(f"#{run.color}"))
+                c.drawString(x, y, text)
+                c.setFillColor(colors.black)
+            y -= line_size + 2
+        if block.rule_after:
+            c.line(margin, y + 4, width - margin, y + 4)
+            y -= 8
+        y -= block.space_after
 
     # Save the PDF
     c.save()
-    print(f"PDF generated: {pdf_file}")
+    if isinstance(pdf_file, str):
+        print(f"PDF generated: {pdf_file}")
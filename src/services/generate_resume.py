@@ -1,140 +1,74 @@
-from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from src.services.docx_utils import set_paragraph_spacing, add_hyperlink, add_horizontal_line
+from docx.shared import Pt
+from src.services.docx_utils import add_hyperlink
+from src.services.docx_template import new_document
 import pypandoc
 import os
-from src.services.generate_pdfs import save_as_pdf
-
-
-def generate_compact_resume(data, output_file="compact_resume.docx",generate_pdf=False):
-    """
-    Generate a compact Word document resume.
+from src.services.generate_pdfs import render_pdf
+from src.services.layout import STYLES, layout_resume
+
+
+def _character_style(item):
+    if item.bold and item.italic:
+        return "bold_italic"
+    if item.bold:
+        return "bold"
+    if item.italic:
+        return "italic"
+    return None
+
+
+def _add_runs(paragraph, block, style_ids):
+    for item in block.runs:
+        if item.link:
+            add_hyperlink(paragraph, item.text, item.link)
+            continue
+        run = paragraph.add_run(item.text)
+        character_style = _character_style(item)
+        if character_style:
+            run._r.style = style_ids[character_style]
+        # Only sizes that differ from the paragraph style are written on the run
+        if item.size and item.size != STYLES[block.style]["size"]:
+            run.font.size = Pt(item.size)
+
+
+# Output formats and their content types
+MEDIA_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+}
+
+
+def render_docx(layout, output_file="compact_resume.docx", template=None):
     """
-    doc = Document()
-
-    # Header Section
-    name = doc.add_heading(level=1)
-    name_run = name.add_run(data["header"]["name"])
-    name_run.bold = True
-    name_run.font.size = Pt(16)
-    name_run.color = RGBColor(0xff, 0x99, 0xcc)
-    name.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    set_paragraph_spacing(name, after=2)
-
-    header_paragraph = doc.add_paragraph()
-    header_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    header_paragraph.add_run("P: ").bold = True
-    header_paragraph.add_run(data["header"]["contact"]["phone"] + "    ")
-
-    # Add LinkedIn with hyperlink
-    add_hyperlink(header_paragraph, f'{data["header"]["contact"]["linkedin"]}', data["header"]["contact"]["linkedin"])
-    header_paragraph.add_run("    ")
-
-    # Add Email with hyperlink
-    add_hyperlink(header_paragraph, f"{data['header']['contact']['email']}", f"mailto:{data['header']['contact']['email']}")
-    set_paragraph_spacing(header_paragraph, after=2)
-
-    # Add horizontal line below header
-    add_horizontal_line(header_paragraph)
-
-    # Summary Section
-    doc.add_heading("Summary", level=2)
-    summary_paragraph = doc.add_paragraph(data["summary"])
-    summary_paragraph.style.font.size = Pt(11)
-    set_paragraph_spacing(summary_paragraph, after=6)
-    # Add horizontal line below header
-    add_horizontal_line(summary_paragraph)
-    
-    # Education Section
-    doc.add_heading("Education", level=2)
-    for edu in data["education"]:
-        education_paragraph = doc.add_paragraph()
-        education_paragraph.add_run(f"{edu['degree']} - {edu['university']} | ").bold = True
-        education_paragraph.add_run(f"GPA: {edu.get('gpa', 'N/A')} ").italic = True
-        education_paragraph.add_run(f"({edu.get('graduation_date', 'N/A')})")
-        set_paragraph_spacing(education_paragraph, after=2)
-    # Add horizontal line below header
-    add_horizontal_line(education_paragraph)
-
-    
-    if data.get("skills"):
-        # Technical Skills Section
-        doc.add_heading("Technical Skills", level=2)
-        # Access the nested dictionary under the "Skills" key
-        skills_data = data['skills'].get("skills", [])  # Get the nested dictionary or an empty one if missing
-        if not skills_data:
-            print("No skills data found. Skipping Technical Skills section.")
-        else:
-            # Add each category and its skills in a single line
-            for skill in skills_data:
-            # Create a new paragraph for each category and skills
-                skills_paragraph = doc.add_paragraph()
-                # Add the category in bold
-                category_run = skills_paragraph.add_run(f"{skill['name']}: ")
-                category_run.bold = True
-                category_run.font.size = Pt(10)
-                # Add the skills in regular font
-                skills_run = skills_paragraph.add_run(", ".join(skill['description']))
-                skills_run.font.size = Pt(10)
-                # Adjust spacing
-                set_paragraph_spacing(skills_paragraph, after=1)
-
-            # Add horizontal line below header
-            add_horizontal_line(skills_paragraph)
+    Write a resume layout (see layout.layout_resume) to a Word document, given a path
+    or a binary file object such as `io.BytesIO`.
 
-    if data.get("projects"):
-        # Project Experience Section
-        doc.add_heading("Project Experience", level=2)
-        project_data = data['projects'].get("projects", [])
-        for project in project_data:
-            # Create a paragraph for the project
-            project_paragraph = doc.add_paragraph()
-
-            # Add the project name in bold
-            project_name_run = project_paragraph.add_run(f"{project['name']}: ")
-            project_name_run.bold = True
-            project_name_run.font.size = Pt(11)
-
-            # Add the project description in regular font
-            project_description_run = project_paragraph.add_run(project["description"])
-            project_description_run.font.size = Pt(10)
-
-            # Adjust spacing
-            set_paragraph_spacing(project_paragraph, after=2)
-
-    if data.get("experience"):
+    Paragraphs and runs only reference the named styles of `template` (a prepared .docx,
+    see docx_template; default: the compact template), so fonts, sizes, spacing and
+    section lines come from the template and can be swapped without code changes.
+    """
+    doc, style_ids = new_document(template)
+    # Style ids are written directly: python-docx's style setters search the whole
+    # styles part for the default style on every assignment
+    for block in layout.blocks():
+        paragraph = doc.add_paragraph()
+        paragraph._p.style = style_ids[block.style]
+        _add_runs(paragraph, block, style_ids)
+        if block.rule_after:
+            doc.add_paragraph()._p.style = style_ids["rule"]
 
-        # Work Experience Section
-        doc.add_heading("Work Experience", level=2)
-        for exp in data["experience"].get("experiences", []):
-            work_heading = doc.add_paragraph()
-            
-            work_heading.add_run(f"{exp['title']} - {exp['company']} | ").bold = True
-            work_heading.add_run(f"({exp['duration']})").italic = True
-            set_paragraph_spacing(work_heading, after=2)
-            for responsibility in exp.get("responsibilities", []):
-                responsibility_paragraph = doc.add_paragraph(f"{responsibility}", style="List Bullet")
-                responsibility_paragraph.style.font.size = Pt(10)
-                set_paragraph_spacing(responsibility_paragraph, after=1)
-        # Add horizontal line below header
-        add_horizontal_line(responsibility_paragraph)
-    
+    doc.save(output_file)
+    if isinstance(output_file, str):
+        print(f"Resume generated: {output_file}")
 
-     # Availability Section
-    doc.add_heading("Availability", level=2)
-    availability_paragraph = doc.add_paragraph(data["availability"])
-    availability_paragraph.style.font.size = Pt(11)
-    set_paragraph_spacing(availability_paragraph, after=6)
-    # Add horizontal line below header
-    add_horizontal_line(availability_paragraph)
-    
-    
 
-    # Save the document
-    doc.save(output_file)
-    print(f"Resume generated: {output_file}")
+def generate_compact_resume(data, output_file="compact_resume.docx",generate_pdf=False, template=None):
+    """
+    Generate a compact Word document resume, and the matching PDF when `generate_pdf` is set.
+    Both are drawn from the same layout, built once.
+    """
+    layout = layout_resume(data)
+    render_docx(layout, output_file, template)
     # Convert to PDF if required
     if generate_pdf:
-        save_as_pdf(data, pdf_file=os.path.splitext(output_file)[0] + ".pdf")
-
+        render_pdf(layout, pdf_file=os.path.splitext(output_file)[0] + ".pdf")
@@ -0,0 +1,96 @@
+import os
+import json
+import functools
+import threading
+
+from src.services.cache import make_cache_key
+from src.services.replay import ReplayModel
+
+
+@functools.lru_cache(maxsize=None)
+def schema_json(schema_cls) -> str:
+    """
+    Return the JSON schema of a pydantic class as a canonical string, derived once per class.
+    """
+    return json.dumps(schema_cls.model_json_schema(), sort_keys=True, separators=(",", ":"))
+
+
+@functools.lru_cache(maxsize=None)
+def schema_fingerprint(schema_cls) -> str:
+    return make_cache_key(schema=schema_json(schema_cls))
+
+
+class SchemaStore:
+    """
+    Compiled structured-output artifacts keyed by schema fingerprint.
+
+    Holds the JSON schema string and, for locally decoded models, the regex that
+    constrained decoding is built from. When `path` is set the artifacts are kept
+    in a JSON file so later processes skip compiling them.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    self._entries = json.load(file)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable schema store {path}: {e}")
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self._entries, file)
+        os.replace(temp_path, self.path)
+
+    def _get(self, schema_cls, field, build):
+        fingerprint = schema_fingerprint(schema_cls)
+        with self._lock:
+            entry = self._entries.setdefault(fingerprint, {})
+            if field not in entry:
+                entry[field] = build()
+                if self.path:
+                    self._save()
+            return entry[field]
+
+    def json_schema(self, schema_cls) -> str:
+        return self._get(schema_cls, "schema", lambda: schema_json(schema_cls))
+
+    def regex(self, schema_cls) -> str:
+        from outlines_core.json_schema import build_regex_from_schema
+
+        schema = self.json_schema(schema_cls)
+        return self._get(schema_cls, "regex", lambda: build_regex_from_schema(schema))
+
+
+def build_generator(model, schema_cls, store):
+    """
+    Build a reusable generator for `schema_cls`, compiling the output type once.
+
+    Calling the result with a prompt returns the raw JSON text.
+    """
+    if isinstance(model, ReplayModel):
+        # The replay stand-in is not an outlines model and takes the schema class directly
+        return functools.partial(model, schema_cls=schema_cls)
+
+    import outlines
+    from outlines.models import SteerableModel, BlackBoxModel, AsyncBlackBoxModel
+    from outlines.types import JsonSchema, Regex
+
+    if isinstance(model, SteerableModel):
+        # Local models compile the regex into a decoding automaton once per generator
+        return outlines.Generator(model, Regex(store.regex(schema_cls)))
+
+    if isinstance(model, (BlackBoxModel, AsyncBlackBoxModel)):
+        if isinstance(model, outlines.models.Gemini):
+            # The genai adapter wants a python type and would rebuild one from a JsonSchema
+            return outlines.Generator(model, schema_cls)
+        return outlines.Generator(model, JsonSchema(store.json_schema(schema_cls)))
+
+    raise TypeError(f"No structured-output generator for {type(model).__name__}")
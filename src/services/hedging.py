@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+class LatencyTracker:
+    """
+    Rolling window of the most recent successful call latencies of one backend.
+    """
+
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, p):
+        """Nearest-rank `p`th percentile of the window, or None when it is empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(0, min(len(samples) - 1, int(round(p / 100 * len(samples))) - 1))
+        return samples[rank]
+
+    def snapshot(self) -> dict:
+        return {
+            "samples": len(self),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class HedgePolicy:
+    """
+    How long to wait for the primary backend before sending the same request to the secondary.
+    """
+
+    def __init__(self, percentile=95, initial_delay_seconds=10, min_delay_seconds=0.5, min_samples=20):
+        self.percentile = percentile
+        self.initial_delay_seconds = initial_delay_seconds
+        self.min_delay_seconds = min_delay_seconds
+        self.min_samples = min_samples
+
+    def delay(self, tracker):
+        # Too few samples for a meaningful percentile: fall back to a fixed delay
+        if len(tracker) < self.min_samples:
+            return self.initial_delay_seconds
+        return max(self.min_delay_seconds, tracker.percentile(self.percentile))
+
+
+class HedgeMetrics:
+    """
+    Counts of calls, hedges sent for slowness, failovers after a primary error and
+    calls the secondary won.
+    """
+
+    def __init__(self):
+        self._counts = {"calls": 0, "hedged": 0, "failovers": 0, "secondary_wins": 0}
+        self._lock = threading.Lock()
+
+    def incr(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+
+def _start_secondary(delay, error, metrics):
+    if error is None:
+        print(f"primary backend slower than {delay:.2f}s - hedging to the secondary backend")
+    else:
+        print(f"primary backend failed ({error}) - failing over to the secondary backend")
+    if metrics is not None:
+        metrics.incr("hedged" if error is None else "failovers")
+
+
+def _first_success(futures, metrics):
+    error = None
+    while futures:
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = futures.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            for loser in futures:
+                loser.cancel()
+            if name == "secondary" and metrics is not None:
+                metrics.incr("secondary_wins")
+            return result
+    raise error
+
+
+def hedged_call(primary, secondary, delay, executor, metrics=None):
+    """
+    Call `primary()`; if it has not returned after `delay` seconds, or fails before
+    then, also call `secondary()` and return whichever succeeds first. Only fails
+    when both do.
+
+    Both callables run in `executor` with the caller's context variables. A losing
+    call that already started cannot be interrupted from another thread; it runs
+    to completion in the background and its result is discarded.
+    """
+    if metrics is not None:
+        metrics.incr("calls")
+    first = executor.submit(contextvars.copy_context().run, primary)
+    done, _ = wait([first], timeout=delay)
+    if done and first.exception() is None:
+        return first.result()
+
+    _start_secondary(delay, first.exception() if done else None, metrics)
+    second = executor.submit(contextvars.copy_context().run, secondary)
+    return _first_success({first: "primary", second: "secondary"}, metrics)
+
+
+async def ahedged_call(primary, secondary, delay, metrics=None):
+    """
+    Async counterpart of `hedged_call`. `primary` and `secondary` return coroutines;
+    the losing task is cancelled.
+    """
+    if metrics is not None:
+        metrics.incr("calls")
+    first = asyncio.ensure_future(primary())
+    tasks = {first: "primary"}
+    error = None
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done and first.exception() is None:
+            return first.result()
+
+        _start_secondary(delay, first.exception() if done else None, metrics)
+        tasks[asyncio.ensure_future(secondary())] = "secondary"
+
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks.pop(task)
+                if task.exception() is not None:
+                    error = error or task.exception()
+                    continue
+                if name == "secondary" and metrics is not None:
+                    metrics.incr("secondary_wins")
+                return task.result()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
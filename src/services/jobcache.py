@@ -0,0 +1,176 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+from src.services.cache import make_cache_key
+
+
+_NOISE_PATTERNS = [
+    r"https?://\S+|www\.\S+",                                   # links and tracking parameters
+    r"\S+@\S+\.\S+",                                           # contact e-mails
+    r"\b(?:re)?posted\b[^.\n]*",                               # "Posted 3 days ago", "Reposted on ..."
+    r"\b\d+\+?\s*(?:minute|hour|day|week|month)s?\s+ago\b",
+    r"\b\d{1,4}[/.-]\d{1,2}[/.-]\d{1,4}\b",                      # 2024-05-01, 01/05/24
+    r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+\d{1,2}(?:st|nd|rd|th)?,?\s*(?:\d{4})?\b",
+    r"\b\d{1,2}(?:st|nd|rd|th)?\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?,?\s*(?:\d{4})?\b",
+]
+_NOISE = re.compile("|".join(f"(?:{pattern})" for pattern in _NOISE_PATTERNS), re.IGNORECASE)
+
+
+def normalise_job_description(text) -> str:
+    """
+    Lower-case a posting and strip what changes between re-posts of the same job:
+    links, e-mails, posting dates and "N days ago" text, punctuation and whitespace.
+    """
+    text = _NOISE.sub(" ", (text or "").lower())
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def shingles(text, size=3):
+    """Set of overlapping `size`-word shingles of normalised text."""
+    words = text.split()
+    size = max(1, min(size, len(words)))
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _permutations(num_perm, seed=1):
+    import numpy as np
+
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, _MAX_HASH, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, _MAX_HASH, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signature(shingle_set, num_perm=128):
+    """
+    MinHash signature of a shingle set: the minimum of `num_perm` universal hashes.
+    The fraction of equal positions in two signatures estimates their Jaccard similarity.
+    """
+    import numpy as np
+
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingle_set),
+        dtype=np.uint64,
+        count=len(shingle_set),
+    )
+    if hashes.size == 0:
+        return np.full(num_perm, _MAX_HASH, dtype=np.uint64)
+    a, b = _permutations(num_perm)
+    # 32-bit inputs keep a * x + b below 2**64, so the uint64 arithmetic cannot overflow
+    permuted = ((hashes[:, None] * a + b) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=0)
+
+
+class JobCache:
+    """
+    Tailored sections cached per (base resume, pipeline) scope and looked up by
+    near-duplicate job description.
+
+    Exact matches after normalisation hit directly; otherwise the stored posting with
+    the highest MinHash similarity is reused when it reaches `threshold`.
+    """
+
+    def __init__(self, path, threshold=0.85, num_perm=128, shingle_size=3, max_entries_per_scope=500):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_entries_per_scope = max_entries_per_scope
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_cache ("
+            "scope TEXT NOT NULL, text_hash TEXT NOT NULL, signature BLOB NOT NULL, "
+            "sections TEXT NOT NULL, created_at REAL NOT NULL, PRIMARY KEY (scope, text_hash))"
+        )
+        self._conn.commit()
+
+    def _fingerprint(self, job_description):
+        import numpy as np
+
+        text = normalise_job_description(job_description)
+        text_hash = make_cache_key(text=text)
+        signature = minhash_signature(shingles(text, self.shingle_size), self.num_perm)
+        return text_hash, np.ascontiguousarray(signature, dtype=np.uint64)
+
+    def lookup(self, scope, job_description):
+        """
+        Return (sections, similarity) for the closest cached posting in `scope`, or None.
+        """
+        import numpy as np
+
+        text_hash, signature = self._fingerprint(job_description)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sections FROM job_cache WHERE scope = ? AND text_hash = ?", (scope, text_hash)
+            ).fetchone()
+            if row is not None:
+                self.hits += 1
+                return json.loads(row[0]), 1.0
+
+            rows = self._conn.execute(
+                "SELECT signature, sections FROM job_cache WHERE scope = ?", (scope,)
+            ).fetchall()
+            if rows:
+                signatures = np.frombuffer(b"".join(r[0] for r in rows), dtype=np.uint64).reshape(len(rows), -1)
+                similarities = (signatures == signature).mean(axis=1)
+                best = int(similarities.argmax())
+                if similarities[best] >= self.threshold:
+                    self.hits += 1
+                    self.near_hits += 1
+                    return json.loads(rows[best][1]), float(similarities[best])
+
+            self.misses += 1
+            return None
+
+    def store(self, scope, job_description, sections):
+        text_hash, signature = self._fingerprint(job_description)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_cache (scope, text_hash, signature, sections, created_at) VALUES (?, ?, ?, ?, ?)",
+                (scope, text_hash, signature.tobytes(), json.dumps(sections), time.time()),
+            )
+            if self.max_entries_per_scope:
+                self._conn.execute(
+                    "DELETE FROM job_cache WHERE scope = ? AND text_hash NOT IN "
+                    "(SELECT text_hash FROM job_cache WHERE scope = ? ORDER BY created_at DESC LIMIT ?)",
+                    (scope, scope, self.max_entries_per_scope),
+                )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM job_cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM job_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "near_duplicate_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,190 @@
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+
+# Block kinds understood by every renderer
+TITLE, CONTACT, HEADING, PARAGRAPH, BULLET = "title", "contact", "heading", "paragraph", "bullet"
+
+TITLE_COLOR = "ff99cc"
+
+# Named paragraph styles: every block refers to one, and the metrics here are shared by
+# the PDF renderer and the .docx template builder
+STYLES = {
+    "name": dict(size=16, centered=True, space_after=2),
+    "contact": dict(size=11, centered=True, space_after=2),
+    "heading": dict(size=13, space_after=2),
+    "text": dict(size=11, space_after=6),
+    "entry": dict(size=11, space_after=2),
+    "skill": dict(size=10, space_after=1),
+    "project": dict(size=10, space_after=2),
+    "bullet": dict(size=10, space_after=1),
+}
+
+
+@dataclass(frozen=True)
+class Run:
+    """A span of text with one style. `link` makes it a hyperlink; `size` is in points."""
+    text: str
+    bold: bool = False
+    italic: bool = False
+    size: Optional[float] = None
+    link: Optional[str] = None
+    color: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Block:
+    """
+    One paragraph-level element. Runs without a size use the block's `size`;
+    `rule_after` draws a horizontal line under the block.
+    """
+    kind: str
+    runs: Tuple[Run, ...]
+    style: str = "entry"
+    size: float = 11
+    centered: bool = False
+    space_after: float = 0
+    rule_after: bool = False
+
+    @property
+    def text(self) -> str:
+        return "".join(run.text for run in self.runs)
+
+
+@dataclass(frozen=True)
+class Section:
+    """A titled group of blocks; the header section has no title."""
+    title: Optional[str]
+    blocks: Tuple[Block, ...]
+
+
+@dataclass(frozen=True)
+class ResumeLayout:
+    sections: Tuple[Section, ...]
+
+    def blocks(self):
+        """Every block in reading order, section headings included."""
+        for section in self.sections:
+            if section.title:
+                yield block(HEADING, "heading", (Run(section.title, bold=True),))
+            yield from section.blocks
+
+
+def block(kind, style, runs) -> Block:
+    """A block drawn with the metrics of the named style."""
+    return Block(kind, tuple(runs), style, **STYLES[style])
+
+
+def clean(value, default="") -> str:
+    """Text of a resume field with whitespace collapsed; lists are joined with commas."""
+    if value is None:
+        return default
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(clean(item) for item in value if clean(item))
+    text = " ".join(str(value).split())
+    return text or default
+
+
+def _entries(section, key):
+    # Tailored sections are wrapped ({"skills": [...]}); skeleton sections may be bare lists
+    if isinstance(section, dict):
+        section = section.get(key, [])
+    if not isinstance(section, list):
+        return []
+    return [entry for entry in section if isinstance(entry, dict)]
+
+
+def _ruled(blocks):
+    # Sections end with a horizontal line under their last block
+    if blocks:
+        blocks[-1] = replace(blocks[-1], rule_after=True)
+    return blocks
+
+
+def _header(data):
+    header = data.get("header") or {}
+    contact = header.get("contact") or {}
+    blocks = [block(TITLE, "name", (Run(clean(header.get("name")), bold=True, color=TITLE_COLOR),))]
+
+    runs = []
+    phone, linkedin, email = clean(contact.get("phone")), clean(contact.get("linkedin")), clean(contact.get("email"))
+    if phone:
+        runs += [Run("P: ", bold=True), Run(phone)]
+    if linkedin:
+        runs += [Run("    ")] if runs else []
+        runs.append(Run(linkedin, link=linkedin))
+    if email:
+        runs += [Run("    ")] if runs else []
+        runs.append(Run(email, link=f"mailto:{email}"))
+    if runs:
+        blocks.append(block(CONTACT, "contact", runs))
+    return Section(None, tuple(_ruled(blocks)))
+
+
+def _text_section(title, text):
+    text = clean(text)
+    blocks = [block(PARAGRAPH, "text", (Run(text),))] if text else []
+    return Section(title, tuple(_ruled(blocks)))
+
+
+def _education(data):
+    blocks = []
+    for edu in _entries(data.get("education"), "education"):
+        blocks.append(block(PARAGRAPH, "entry", (
+            Run(f"{clean(edu.get('degree'))} - {clean(edu.get('university'))} | ", bold=True),
+            Run(f"GPA: {clean(edu.get('gpa'), 'N/A')} ", italic=True),
+            Run(f"({clean(edu.get('graduation_date'), 'N/A')})"),
+        )))
+    return Section("Education", tuple(_ruled(blocks)))
+
+
+def _skills(data):
+    blocks = []
+    for skill in _entries(data.get("skills"), "skills"):
+        description = clean(skill.get("description"))
+        if description:
+            blocks.append(block(PARAGRAPH, "skill", (Run(f"{clean(skill.get('name'))}: ", bold=True), Run(description))))
+    return Section("Technical Skills", tuple(_ruled(blocks)))
+
+
+def _projects(data):
+    blocks = []
+    for project in _entries(data.get("projects"), "projects"):
+        blocks.append(block(PARAGRAPH, "project", (
+            Run(f"{clean(project.get('name'))}: ", bold=True, size=11),
+            Run(clean(project.get("description"))),
+        )))
+    return Section("Project Experience", tuple(_ruled(blocks)))
+
+
+def _experience(data):
+    blocks = []
+    for exp in _entries(data.get("experience"), "experiences"):
+        blocks.append(block(PARAGRAPH, "entry", (
+            Run(f"{clean(exp.get('title'))} - {clean(exp.get('company'))} | ", bold=True),
+            Run(f"({clean(exp.get('duration'))})", italic=True),
+        )))
+        responsibilities = exp.get("responsibilities") or []
+        if isinstance(responsibilities, str):
+            responsibilities = [responsibilities]
+        for responsibility in responsibilities:
+            if clean(responsibility):
+                blocks.append(block(BULLET, "bullet", (Run(clean(responsibility)),)))
+    return Section("Work Experience", tuple(_ruled(blocks)))
+
+
+def layout_resume(data) -> ResumeLayout:
+    """
+    Single pass over a tailored resume dict producing the layout every renderer draws.
+    Fields are normalised here and empty sections are dropped.
+    """
+    sections = (
+        _header(data),
+        _text_section("Summary", data.get("summary")),
+        _education(data),
+        _skills(data),
+        _projects(data),
+        _experience(data),
+        _text_section("Availability", data.get("availability")),
+    )
+    return ResumeLayout(tuple(section for section in sections if section.blocks))
@@ -0,0 +1,157 @@
+# Prompt layout, from most to least shareable:
+#
+#   1. PROMPT_PREFIX   - static and identical for every stage and every job
+#   2. job description - identical for every stage of the same job
+#   3. task + example  - static per stage
+#   4. section data    - changes with every resume
+#
+# Providers cache prompt prefixes (OpenAI / Gemini implicit caching, Ollama KV reuse),
+# so keeping 1 and 2 byte-identical lets the later stages of a job reuse the work of
+# the first. Bump PROMPT_VERSION whenever the prefix or the task wording changes.
+
+PROMPT_VERSION = "1"
+
+PROMPT_PREFIX = f"""Resume tailoring prompt v{PROMPT_VERSION}.
+You tailor the sections of a candidate's resume to a job description.
+The job description comes first, followed by the task for one resume section, an example of the expected output and the candidate's current data.
+Keep the candidate's original facts, only add relevant and truthful detail, and answer with nothing but the requested output.
+"""
+
+SKILLS_TASK = (
+    "Based on the job description, extract both the original and any additional relevant technical and soft skills "
+    "and select the best 5 skills only. Return the result strictly in JSON, using the example format."
+)
+
+SKILLS_EXAMPLE = """{
+    "skills": [
+        {
+            "name": "Customer-focused service and engagement",
+            "description": [
+                "Ability to understand and respond to customer needs",
+                "Friendly and helpful demeanor",
+                "Efficient handling of customer inquiries"
+            ]
+        },
+        {
+            "name": "Strong communication and teamwork",
+            "description": [
+                "Clearly communicates with team members",
+                "Listens actively and respectfully",
+                "Contributes ideas and supports team goals"
+            ]
+        }
+    ]
+}"""
+
+EXPERIENCES_TASK = (
+    "Based on the job description, extract both the original and any additional relevant technical and soft experiences "
+    "and select the best 3 experiences only. Return the result strictly in JSON, using the example format."
+)
+
+EXPERIENCES_EXAMPLE = """{
+    "experiences": [
+        {
+            "title": "Team Member",
+            "company": "Value Village, Toronto, Canada",
+            "duration": "Jul 2024",
+            "responsibilities": [
+                "Delivered excellent service by assisting customers with product selection and addressing inquiries.",
+                "Maintained visually appealing displays and organized merchandise for easy navigation."
+            ]
+        },
+        {
+            "title": "Team Member",
+            "company": "Wendy's, Toronto, ON",
+            "duration": "Dec 2022 - Jun 2023",
+            "responsibilities": [
+                "Provided friendly and efficient service at the counter, managing orders with accuracy and speed.",
+                "Operated POS system, processed payments, and ensured correct change was given."
+            ]
+        }
+    ]
+}"""
+
+PROJECTS_TASK = (
+    "Based on the job description, extract both the original and any additional relevant technical and soft projects "
+    "and select the best 3 projects only. Return the result strictly in JSON, using the example format."
+)
+
+PROJECTS_EXAMPLE = """{
+    "projects": [
+        {
+            "name": "Team Member",
+            "description": "Delivered excellent service by assisting customers with product selection and addressing inquiries. Maintained visually appealing displays and organized merchandise for easy navigation."
+        }
+    ]
+}"""
+
+SUMMARY_TASK = (
+    "Based on the job description, write a suitable summary that is short and sweet with a maximum of 3 sentences. "
+    "availability: Monday to Friday (Weekdays) 5 pm to Closing ; Sunday, Saturday (Weekends) 8am to 11 pm. "
+    "Return the result strictly as a plain string, using the example format."
+)
+
+SUMMARY_EXAMPLE = (
+    '"Friendly and engaging team member with strong experience in retail and food service environments, known for '
+    "delivering exceptional customer experiences. Adept at handling transactions, assisting with product inquiries, and "
+    "creating welcoming, clean, and organized spaces. Passionate about retail, with a positive attitude and a focus on "
+    'building customer loyalty through helpful service and effective communication."'
+)
+
+COMBINED_TASK = (
+    "Based on the job description, extract both the original and any additional relevant technical and soft skills, "
+    "projects and experiences. Select the best 5 skills, the best 3 projects and the best 3 experiences only."
+)
+
+COMBINED_SUMMARY_TASK = (
+    " Also write a suitable summary that is short and sweet with a maximum of 3 sentences, based on the selected "
+    "skills, projects and experiences."
+)
+
+COMBINED_EXAMPLE = """{
+    "skills": [
+        {
+            "name": "Customer-focused service and engagement",
+            "description": [
+                "Ability to understand and respond to customer needs",
+                "Friendly and helpful demeanor"
+            ]
+        }
+    ],
+    "projects": [
+        {
+            "name": "Team Member",
+            "description": "Delivered excellent service by assisting customers with product selection and addressing inquiries."
+        }
+    ],
+    "experiences": [
+        {
+            "title": "Team Member",
+            "company": "Value Village, Toronto, Canada",
+            "duration": "Jul 2024",
+            "responsibilities": [
+                "Delivered excellent service by assisting customers with product selection and addressing inquiries."
+            ]
+        }
+    ]%s
+}"""
+
+COMBINED_SUMMARY_EXAMPLE = """,
+    "summary": "Friendly and engaging team member with strong experience in retail and food service environments, known for delivering exceptional customer experiences.\""""
+
+
+def build_prompt(job_description, task, example, sections) -> str:
+    """
+    Assemble a stage prompt in cache-friendly order.
+
+    `sections` is a list of (label, text) pairs with the candidate's current data;
+    it goes last because it is the only part that differs between resumes.
+    """
+    parts = [
+        PROMPT_PREFIX,
+        f"Job Description:\n{job_description}\n",
+        f"Task:\n{task}\n",
+        f"Example format:\n{example}\n",
+    ]
+    parts.extend(f"{label}:\n{text}\n" for label, text in sections)
+    return "\n".join(parts)
@@ -0,0 +1,78 @@
+import time
+import asyncio
+import threading
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate_per_minute`.
+    """
+
+    def __init__(self, rate_per_minute):
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount=1):
+        """
+        Take `amount` tokens and return how many seconds the caller must wait before using them.
+        """
+        # A single request larger than the bucket can never fit; let it through once the bucket is full
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Client-side limiter for one backend: requests per minute, tokens per minute and a
+    shared cool-down set from provider retry-after hints.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds):
+        """
+        Hold back every caller for `seconds`, e.g. after a 429 with a RetryInfo delay.
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def _reserve(self, tokens):
+        wait = 0.0
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        with self._lock:
+            wait = max(wait, self._blocked_until - time.monotonic())
+        return wait
+
+    def acquire(self, tokens=0):
+        """Block until one request carrying `tokens` prompt tokens may be sent."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            print(f"rate limiter: waiting {wait:.2f}s")
+            time.sleep(wait)
+
+    async def aacquire(self, tokens=0):
+        """Async counterpart of `acquire`."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            print(f"rate limiter: waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
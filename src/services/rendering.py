@@ -0,0 +1,223 @@
+import io
+import os
+import time
+import asyncio
+import weakref
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from src.services.clients import registry
+from src.services.layout import layout_resume
+
+
+# Small resume in the tailored shape, rendered once so python-docx, ReportLab and
+# their fonts and templates are loaded before the first real request
+WARMUP_RESUME = {
+    "header": {"name": "Warm Up", "contact": {"phone": "000", "email": "warm@up.test", "linkedin": "linkedin.com/in/warmup"}},
+    "summary": "Warm-up resume.",
+    "education": [{"university": "University", "degree": "Degree", "gpa": "4.0", "graduation_date": "2024"}],
+    "skills": {"skills": [{"name": "Skill", "description": ["One", "Two"]}]},
+    "projects": {"projects": [{"name": "Project", "description": "Description."}]},
+    "experience": {"experiences": [{"title": "Title", "company": "Company", "duration": "2024", "responsibilities": ["Responsibility."]}]},
+    "availability": "Weekdays",
+}
+
+
+class RenderQueueFull(RuntimeError):
+    """Every rendering slot stayed busy for longer than the queue timeout."""
+
+
+def render_layout(layout, file_format, output_file=None, template=None):
+    """
+    Render one format of a layout to `output_file`, or return its bytes when no file is
+    given. `template` is the .docx template for the DOCX format.
+    """
+    from src.services.generate_pdfs import render_pdf
+    from src.services.generate_resume import render_docx
+
+    renderer = {"docx": lambda layout, output: render_docx(layout, output, template), "pdf": render_pdf}[file_format]
+    if output_file is not None:
+        renderer(layout, output_file)
+        return None
+    buffer = io.BytesIO()
+    renderer(layout, buffer)
+    return buffer.getvalue()
+
+
+def _init_worker(template=None):
+    # Pay for the imports, the .docx template and the font metrics once per worker
+    layout = layout_resume(WARMUP_RESUME)
+    render_layout(layout, "docx", template=template)
+    render_layout(layout, "pdf")
+
+
+def _worker_pid():
+    return os.getpid()
+
+
+def _output_files(output_file, formats):
+    base = os.path.splitext(output_file)[0]
+    return {file_format: output_file if file_format == "docx" else f"{base}.{file_format}" for file_format in formats}
+
+
+class RenderService:
+    """
+    Renders resumes in a bounded pool of pre-initialised processes, each format of a
+    resume as its own task so DOCX and PDF render in parallel.
+
+    At most `max_pending` resumes are rendering or queued at once; further callers
+    wait up to `queue_timeout` seconds for a slot and then get RenderQueueFull. Sync
+    callers block on a threading semaphore; async callers wait on the event loop, with
+    their own `max_pending` slots per loop, so no executor thread is held. With
+    `workers=0` everything renders in the calling thread. `docx_template` is the
+    prepared .docx every DOCX is rendered from (default: the compact template).
+    """
+
+    def __init__(self, workers=2, max_pending=8, queue_timeout=30, docx_template=None):
+        self.workers = workers
+        self.docx_template = docx_template
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._async_slots = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._counts = {"rendered": 0, "failed": 0, "rejected": 0, "in_flight": 0}
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None and self.workers > 0:
+                # spawn: forking a process that already runs LLM worker threads is not safe
+                self._pool = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker, initargs=(self.docx_template,),
+                )
+            return self._pool
+
+    def warm(self):
+        """
+        Start every worker process and wait for their initialisation. Returns the seconds taken.
+        """
+        start = time.perf_counter()
+        pool = self._get_pool()
+        if pool is None:
+            _init_worker(self.docx_template)
+        else:
+            # Tasks submitted while no worker is idle each start a new process
+            for future in [pool.submit(_worker_pid) for _ in range(self.workers)]:
+                future.result()
+        return time.perf_counter() - start
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            self._counts[name] += delta
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._count("rejected")
+            raise RenderQueueFull(f"all {self.max_pending} rendering slots busy for {self.queue_timeout}s")
+        self._count("in_flight")
+
+    async def _aacquire(self):
+        # asyncio primitives belong to one event loop, so each loop gets its own slots
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._async_slots.setdefault(loop, asyncio.BoundedSemaphore(self.max_pending))
+        try:
+            await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._count("rejected")
+            raise RenderQueueFull(f"all {self.max_pending} rendering slots busy for {self.queue_timeout}s") from None
+        self._count("in_flight")
+        return slots
+
+    def _release(self, outcome, slots=None):
+        self._count("in_flight", -1)
+        if outcome:
+            self._count(outcome)
+        (slots or self._slots).release()
+
+    def _submit(self, layout, targets):
+        pool = self._get_pool()
+        return {
+            file_format: pool.submit(render_layout, layout, file_format, output, self.docx_template)
+            for file_format, output in targets.items()
+        }
+
+    def _render(self, data, targets):
+        self._acquire()
+        outcome = "failed"
+        try:
+            layout = layout_resume(data)
+            if self._get_pool() is None:
+                results = {
+                    file_format: render_layout(layout, file_format, output, self.docx_template)
+                    for file_format, output in targets.items()
+                }
+            else:
+                results = {file_format: future.result() for file_format, future in self._submit(layout, targets).items()}
+            outcome = "rendered"
+            return results
+        finally:
+            self._release(outcome)
+
+    async def _arender(self, data, targets):
+        loop = asyncio.get_running_loop()
+        slots = await self._aacquire()
+        outcome = "failed"
+        try:
+            layout = layout_resume(data)
+            if self._get_pool() is None:
+                results = {}
+                for file_format, output in targets.items():
+                    results[file_format] = await loop.run_in_executor(
+                        None, render_layout, layout, file_format, output, self.docx_template
+                    )
+            else:
+                futures = self._submit(layout, targets)
+                rendered = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures.values()))
+                results = dict(zip(futures, rendered))
+            outcome = "rendered"
+            return results
+        finally:
+            self._release(outcome, slots)
+
+    def render(self, data, output_file="compact_resume.docx", generate_pdf=False):
+        """
+        Process-pool counterpart of `generate_compact_resume`: the DOCX at `output_file`
+        and, when `generate_pdf` is set, the PDF next to it.
+        """
+        formats = ("docx", "pdf") if generate_pdf else ("docx",)
+        self._render(data, _output_files(output_file, formats))
+
+    async def arender(self, data, output_file="compact_resume.docx", generate_pdf=False):
+        formats = ("docx", "pdf") if generate_pdf else ("docx",)
+        await self._arender(data, _output_files(output_file, formats))
+
+    def render_bytes(self, data, formats=("docx", "pdf")):
+        """Render in memory; returns {format: bytes}."""
+        return self._render(data, dict.fromkeys(formats))
+
+    async def arender_bytes(self, data, formats=("docx", "pdf")):
+        return await self._arender(data, dict.fromkeys(formats))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"workers": self.workers, "max_pending": self.max_pending, **self._counts}
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_render_service():
+    from src.services.extract_skills import get_settings
+
+    settings = get_settings().render
+    return registry.get(
+        ("render_service",),
+        lambda: RenderService(settings.workers, settings.max_pending, settings.queue_timeout, settings.docx_template),
+    )
@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+
+
+# Structured-output schemas for the tailoring requests. They are defined once at
+# module level so every request reuses the same classes (and the same cached
+# outlines generators); class names are part of the JSON schema, so keep them stable.
+
+
+class skill(BaseModel):
+    name: str
+    description: list[str]
+
+
+class skills(BaseModel):
+    skills: list[skill]
+
+
+class Experience(BaseModel):
+    title: str
+    company: str
+    duration: str
+    responsibilities: list[str]
+
+
+class Experiences(BaseModel):
+    experiences: list[Experience]
+
+
+class project(BaseModel):
+    name: str
+    description: str
+
+
+class projects(BaseModel):
+    projects: list[project]
+
+
+class tailored_sections(BaseModel):
+    skills: list[skill]
+    projects: list[project]
+    experiences: list[Experience]
+
+
+class tailored_resume(tailored_sections):
+    summary: str
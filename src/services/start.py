@@ -15,7 +15,6 @@ def main():
     parser.add_argument(
         "-j", "--job_description",
         type=str,
-        required=True,
         help="Job description to enhance resume skills."
     )
     parser.add_argument(
@@ -29,7 +28,69 @@ def main():
         action="store_true",
         help="Generate a PDF version of the resume."
     )
+    parser.add_argument(
+        "--jobs",
+        type=str,
+        help="Batch mode: a directory of job description files or a JSONL file of {job_name, job_description} lines."
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        help="Batch mode: base resume JSON file (relative to json_files/ or absolute)."
+    )
+    parser.add_argument(
+        "--output_dir",
+        type=str,
+        default="./outputs/batch",
+        help="Batch mode: directory for the generated resumes and manifest.json."
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="Batch mode: manifest path (default: <output_dir>/manifest.json). Re-running resumes from it."
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Batch mode: jobs tailored at the same time."
+    )
+    parser.add_argument(
+        "--render_workers",
+        type=int,
+        default=2,
+        help="Batch mode: processes rendering DOCX/PDF files."
+    )
+    parser.add_argument(
+        "--tailoring_mode",
+        type=str,
+        choices=["multi", "combined"],
+        default=None,
+        help="Batch mode: override pipeline.tailoring_mode."
+    )
     args = parser.parse_args()
+
+    if args.jobs:
+        if not args.resume:
+            parser.error("--resume is required with --jobs")
+        from src.services.batch import run_batch
+
+        run_batch(
+            args.jobs,
+            args.resume,
+            output_dir=args.output_dir,
+            concurrency=args.concurrency,
+            render_workers=args.render_workers,
+            manifest_path=args.manifest,
+            generate_pdf=args.generate_pdf,
+            tailoring_mode=args.tailoring_mode,
+        )
+        return
+
+    if not args.job_description:
+        parser.error("either --job_description or --jobs is required")
+
     # Step 1: Load Resume Skeleton
     resume_skeleton = load_resume_skeleton()
 
@@ -0,0 +1,58 @@
+import re
+
+from src.services.generators import schema_json
+
+
+# native:   provider-enforced JSON schema (OpenAI-compatible response_format, Gemini response schema)
+# outlines: the outlines generator wrapping the provider client
+# json:     plain chat request, the schema appended to the prompt, answer repaired before validation
+STRATEGIES = ("native", "outlines", "json")
+
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+
+
+def response_format(schema_cls) -> dict:
+    """OpenAI-compatible `response_format` asking for JSON that matches `schema_cls`."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": schema_cls.__name__, "schema": schema_cls.model_json_schema()},
+    }
+
+
+def gemini_generation_config(schema_cls) -> dict:
+    """Gemini `generation_config` asking for JSON that matches `schema_cls`."""
+    return {"response_mime_type": "application/json", "response_json_schema": schema_cls.model_json_schema()}
+
+
+def schema_instruction(schema_cls) -> str:
+    """Prompt suffix for the json strategy, which has no provider-side enforcement."""
+    return f"\nAnswer with a single JSON object that matches this JSON schema:\n{schema_json(schema_cls)}\n"
+
+
+def repair_json(text) -> str:
+    """
+    Undo the usual formatting slips of a model asked for JSON: code fences, prose
+    around the object and trailing commas.
+    """
+    text = _FENCE.sub("", text.strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        text = text[start:end + 1]
+    return _TRAILING_COMMA.sub(r"\1", text)
+
+
+def parse_structured(text, schema_cls):
+    """
+    Parse and validate a model's JSON answer in one pass with pydantic's JSON parser,
+    repairing the text only when that fails.
+    """
+    from pydantic import ValidationError
+
+    try:
+        return schema_cls.model_validate_json(text)
+    except ValidationError:
+        repaired = repair_json(text)
+        if repaired == text:
+            raise
+        return schema_cls.model_validate_json(repaired)
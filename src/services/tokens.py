@@ -0,0 +1,107 @@
+import os
+import json
+import threading
+
+
+class PromptTooLongError(ValueError):
+    """Raised when a prompt plus the reserved response tokens would overflow the context window."""
+
+
+class _HeuristicTokenizer:
+    """Roughly four characters per token; used when no real tokenizer can be loaded."""
+
+    def encode(self, text):
+        return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+class _HFTokenizer:
+    def __init__(self, tokenizer):
+        self._tokenizer = tokenizer
+
+    def encode(self, text):
+        return self._tokenizer.encode(text, add_special_tokens=False).ids
+
+    def decode(self, tokens):
+        return self._tokenizer.decode(tokens)
+
+
+_tokenizers = {}
+_lock = threading.Lock()
+
+
+def _load_tokenizer(tokenizer_path=None, tokenizer_model=None):
+    if tokenizer_path:
+        try:
+            from tokenizers import Tokenizer
+
+            file_path = tokenizer_path
+            if os.path.isdir(file_path):
+                file_path = os.path.join(file_path, "tokenizer.json")
+            return _HFTokenizer(Tokenizer.from_file(file_path))
+        except Exception as e:
+            print(f"Could not load tokenizer from {tokenizer_path}: {e}")
+
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(tokenizer_model or "gpt-4o")
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"Could not load tiktoken encoding for {tokenizer_model}: {e} - estimating tokens")
+        return _HeuristicTokenizer()
+
+
+def get_tokenizer(tokenizer_path=None, tokenizer_model=None):
+    """
+    Return a tokenizer with encode/decode, loaded once per (path, model).
+
+    A local HuggingFace tokenizer.json is preferred, then tiktoken, then a character estimate.
+    """
+    key = (tokenizer_path, tokenizer_model)
+    tokenizer = _tokenizers.get(key)
+    if tokenizer is None:
+        with _lock:
+            tokenizer = _tokenizers.get(key)
+            if tokenizer is None:
+                tokenizer = _load_tokenizer(tokenizer_path, tokenizer_model)
+                _tokenizers[key] = tokenizer
+    return tokenizer
+
+
+def count_tokens(text, tokenizer):
+    return len(tokenizer.encode(text or ""))
+
+
+def truncate_to_tokens(text, max_tokens, tokenizer):
+    """
+    Cut `text` down to at most `max_tokens` tokens.
+    """
+    tokens = tokenizer.encode(text or "")
+    if len(tokens) <= max_tokens:
+        return text
+    return tokenizer.decode(tokens[:max_tokens])
+
+
+def drop_empty(data):
+    """
+    Recursively remove None, empty strings, lists and dicts from JSON-like data.
+    """
+    if isinstance(data, dict):
+        cleaned = {key: drop_empty(value) for key, value in data.items()}
+        return {key: value for key, value in cleaned.items() if value not in (None, "", [], {})}
+    if isinstance(data, list):
+        cleaned = [drop_empty(value) for value in data]
+        return [value for value in cleaned if value not in (None, "", [], {})]
+    return data
+
+
+def compact_json(data) -> str:
+    """
+    Serialise `data` for a prompt without whitespace or empty fields.
+    """
+    return json.dumps(drop_empty(data), separators=(",", ":"), ensure_ascii=False)
@@ -1,13 +1,21 @@
 import gradio as gr
 import os
-from src.services.core import main
+from src.services.core import astream_main
 
 INDEX_DIR = "json_files"
 
-def generate_resume(job_name, job_description, input_file_name, ):
-    final_path = main(job_description=job_description, job_name=job_name, input_file_name = input_file_name, )
-    
-    return "Hello your new Resume has been created in " + final_path
+async def generate_resume(job_name, job_description, input_file_name, tailoring_mode=None, ):
+    """Yield (progress, summary) updates while the resume is generated."""
+    progress = []
+    summary = ""
+    async for event, value in astream_main(job_description=job_description, job_name=job_name, input_file_name = input_file_name, tailoring_mode=tailoring_mode, ):
+        if event == "progress":
+            progress.append(value)
+        elif event == "summary":
+            summary = value
+        elif event == "done":
+            progress.append("Hello your new Resume has been created in " + value)
+        yield "\n".join(progress), summary
     
 def list_folders():
     """List folders inside INDEX_DIR for dropdown."""
@@ -21,9 +29,6 @@ def list_folders():
     except Exception as e:
         return [f"Error: Unable to list folders {str(e)}"]
 
-folder_dropdown = gr.Dropdown(choices=list_folders(), label="Select Folder", value=None)
-
-
 
 def ui():
     with gr.Blocks(title="CSAM demo application") as demo:
@@ -35,14 +40,16 @@ def ui():
         
         with gr.Row():
             folder_dropdown = gr.Dropdown(choices=list_folders(), label="Select Folder", value=None)
+            tailoring_mode_radio = gr.Radio(choices=["multi", "combined"], label="Tailoring Mode", value="multi")
         
         output_text = gr.Textbox(label="Output")
+        summary_text = gr.Textbox(label="Summary")
         
         generate_button = gr.Button("Generate Resume")
         generate_button.click(
             fn=generate_resume,
-            inputs=[job_name_input, job_description_input, folder_dropdown, ],
-            outputs=output_text
+            inputs=[job_name_input, job_description_input, folder_dropdown, tailoring_mode_radio, ],
+            outputs=[output_text, summary_text]
         )
         def update_items():
             folders = list_folders()
@@ -0,0 +1,104 @@
+import threading
+import contextvars
+from contextlib import contextmanager
+
+
+# Stage of the LLM request running in the current thread / task, for attributing usage
+current_stage = contextvars.ContextVar("current_stage", default=None)
+
+
+@contextmanager
+def stage_context(stage):
+    token = current_stage.set(stage)
+    try:
+        yield
+    finally:
+        current_stage.reset(token)
+
+
+def parse_usage(body):
+    """
+    Return (prompt_tokens, cached_tokens) from a provider JSON response, or None.
+
+    Understands OpenAI-compatible `usage`, Gemini `usageMetadata` and Ollama's native
+    counters. Ollama only reports the prompt tokens it had to evaluate, so a KV-cache
+    hit shows up as a lower prompt count and cached_tokens is None.
+    """
+    if not isinstance(body, dict):
+        return None
+
+    usage = body.get("usage")
+    if isinstance(usage, dict) and "prompt_tokens" in usage:
+        details = usage.get("prompt_tokens_details") or {}
+        return usage["prompt_tokens"], details.get("cached_tokens") or 0
+
+    metadata = body.get("usageMetadata")
+    if isinstance(metadata, dict) and "promptTokenCount" in metadata:
+        return metadata["promptTokenCount"], metadata.get("cachedContentTokenCount") or 0
+
+    if "prompt_eval_count" in body:
+        return body["prompt_eval_count"], None
+
+    return None
+
+
+class UsageStats:
+    """
+    Prompt and provider-cached token totals per stage.
+    """
+
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, prompt_tokens, cached_tokens):
+        stage = stage or "other"
+        with self._lock:
+            totals = self._stages.setdefault(stage, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0})
+            totals["calls"] += 1
+            totals["prompt_tokens"] += prompt_tokens or 0
+            totals["cached_tokens"] += cached_tokens or 0
+        if cached_tokens is None:
+            print(f"stage {stage}: {prompt_tokens} prompt tokens evaluated by the provider")
+        else:
+            print(f"stage {stage}: {cached_tokens}/{prompt_tokens} prompt tokens served from the provider cache")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {stage: dict(totals) for stage, totals in self._stages.items()}
+
+
+def _is_json(response):
+    # Streamed bodies (SSE / NDJSON) must be left for the SDK to consume
+    return response.headers.get("content-type", "").startswith("application/json")
+
+
+def _record(stats, response):
+    try:
+        usage = parse_usage(response.json())
+    except ValueError:
+        return
+    if usage is not None:
+        stats.record(current_stage.get(), *usage)
+
+
+def usage_hooks(stats):
+    """
+    httpx `event_hooks` that record token usage from every JSON provider response.
+    """
+    def on_response(response):
+        if _is_json(response):
+            response.read()
+            _record(stats, response)
+
+    return {"response": [on_response]}
+
+
+def async_usage_hooks(stats):
+    """Async counterpart of `usage_hooks` for httpx.AsyncClient."""
+    async def on_response(response):
+        if _is_json(response):
+            await response.aread()
+            _record(stats, response)
+
+    return {"response": [on_response]}
@@ -1,31 +1,301 @@
-
-from functools import wraps
-import requests
+from email.utils import parsedate_to_datetime
+import sys
 import time
 import random
+import asyncio
+import threading
+import re
+
+from src.services.tokens import PromptTooLongError
+
+
+def _parse_seconds(value):
+    """Parse "12s", "1.5s" or "12" into seconds."""
+    if value is None:
+        return None
+    try:
+        return float(str(value).strip().rstrip("s"))
+    except ValueError:
+        return None
+
+
+def _retry_info_delay(details):
+    if isinstance(details, dict):
+        details = details.get("error", details).get("details", [])
+    for detail in details or []:
+        if isinstance(detail, dict) and str(detail.get("@type", "")).endswith("google.rpc.RetryInfo"):
+            return _parse_seconds(detail.get("retryDelay"))
+    return None
+
+
+def retry_delay_from_error(error):
+    """
+    Return the retry delay in seconds requested by the provider in `error`, or None.
+
+    Reads Retry-After / retry-after-ms headers (openai, httpx) and google.rpc.RetryInfo
+    details (genai), falling back to a retryDelay found in the error message.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        delay = _parse_seconds(headers.get("retry-after-ms"))
+        if delay is not None:
+            return delay / 1000
+        retry_after = headers.get("retry-after")
+        delay = _parse_seconds(retry_after)
+        if delay is not None:
+            return delay
+        if retry_after:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    delay = _retry_info_delay(getattr(error, "details", None))
+    if delay is not None:
+        return delay
+
+    match = re.search(r"retryDelay['\"]?\s*:\s*['\"]?([\d.]+)s", str(error))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while a backend's circuit breaker is open."""
+
+
+def _status_code(error):
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _timeout_types():
+    # An error can only come from an HTTP library that has already been imported
+    types = [TimeoutError]
+    if "requests" in sys.modules:
+        types.append(sys.modules["requests"].Timeout)
+    if "httpx" in sys.modules:
+        types.append(sys.modules["httpx"].TimeoutException)
+    return tuple(types)
+
+
+def is_timeout(error):
+    return isinstance(error, _timeout_types()) or type(error).__name__.endswith("TimeoutError")
+
+
+def is_retryable(error):
+    """
+    Classify a failed attempt. Rate limits, 5xx, connection errors and malformed model
+    output are retryable; timeouts, other 4xx responses and oversized prompts are fatal.
+    """
+    if isinstance(error, CircuitOpenError) or is_timeout(error):
+        return False
+    if isinstance(error, PromptTooLongError):
+        return False
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return True
+
+
+class RetryPolicy:
+    """
+    Retry budget for one logical request: attempt cap, overall deadline and jittered
+    exponential backoff capped at `max_backoff_seconds`.
+    """
+
+    def __init__(self, max_attempts=3, deadline_seconds=None, backoff_seconds=1, max_backoff_seconds=30):
+        self.max_attempts = max_attempts
+        self.deadline_seconds = deadline_seconds
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+
+    def backoff(self, attempt):
+        # Full jitter keeps many workers from retrying in lockstep
+        ceiling = min(self.max_backoff_seconds, self.backoff_seconds * (2 ** attempt))
+        return random.uniform(ceiling / 2, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Per-backend circuit breaker. Opens after `failure_threshold` consecutive failures,
+    rejects calls for `reset_seconds`, then lets a single trial call through. A trial
+    whose outcome is not recorded must be handed back with `release_trial`.
+    """
+
+    def __init__(self, failure_threshold=5, reset_seconds=30):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        """
+        Raise CircuitOpenError unless a call may go to the backend now. Returns True when
+        the call is the half-open trial.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if time.monotonic() - self._opened_at >= self.reset_seconds and not self._trial_running:
+                self._trial_running = True
+                return True
+        raise CircuitOpenError(f"Circuit open after {self.failure_threshold} consecutive failures")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def release_trial(self):
+        """Let another trial through after one that ended without a verdict on backend health."""
+        with self._lock:
+            self._trial_running = False
+
+
+class RetryMetrics:
+    """Counters for logical calls, provider attempts, retries issued and outcomes."""
+
+    def __init__(self):
+        self.counts = {"calls": 0, "attempts": 0, "retries": 0, "successes": 0, "failures": 0, "fatal": 0, "rejected": 0}
+        self._lock = threading.Lock()
+
+    def incr(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+def _next_wait(policy, attempt, error, started, on_retry_after):
+    """
+    Return seconds to wait before the next attempt, or None when the budget is spent.
+    """
+    if attempt + 1 >= policy.max_attempts or not is_retryable(error):
+        return None
+    wait = policy.backoff(attempt)
+    hint = retry_delay_from_error(error)
+    if hint is not None:
+        # The provider knows when quota frees up; never retry sooner than it asked
+        wait = max(wait, hint)
+        if on_retry_after:
+            on_retry_after(hint)
+    if policy.deadline_seconds and time.monotonic() - started + wait > policy.deadline_seconds:
+        return None
+    return wait
+
 
+def counts_against_backend(error):
+    # Client-side errors say nothing about backend health
+    return is_retryable(error) or is_timeout(error)
 
 
-def retry_with_backoff(max_retries=3, backoff_seconds=1):
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            last_exception = None
-            for attempt in range(max_retries):
-                try:
-                    return func(*args, **kwargs)
-                except requests.Timeout as e:
-                    # Raise immediately on timeout
-                    raise Exception(f"API request failed due to: {e}")
+def _on_failure(error, breaker, metrics):
+    if metrics:
+        metrics.incr("attempts")
+        metrics.incr("fatal" if not is_retryable(error) else "failures")
+    if breaker and counts_against_backend(error):
+        breaker.record_failure()
 
-                except Exception as e:
-                    last_exception = e
-                    wait = backoff_seconds * (2 * attempt) + random.uniform(0, 0.1)
-                    print(f"Retry {attempt + 1} failed: {e} - retrying in {wait:.2f}s")
-                    time.sleep(wait)
 
-            raise Exception(f"API request failed after {max_retries} retries: {last_exception}")
+def call_with_retry(func, policy, breaker=None, metrics=None, on_retry_after=None):
+    """
+    Call `func()` under a single retry budget, consulting the circuit breaker before each attempt.
+    """
+    started = time.monotonic()
+    if metrics:
+        metrics.incr("calls")
+    for attempt in range(policy.max_attempts):
+        try:
+            trial = breaker.allow() if breaker else False
+        except CircuitOpenError:
+            if metrics:
+                metrics.incr("rejected")
+            raise
+        try:
+            result = func()
+        except Exception as e:
+            _on_failure(e, breaker, metrics)
+            wait = _next_wait(policy, attempt, e, started, on_retry_after)
+            if wait is None:
+                raise Exception(f"API request failed after {attempt + 1} attempt(s): {e}") from e
+            if metrics:
+                metrics.incr("retries")
+            print(f"Retry {attempt + 1} failed: {e} - retrying in {wait:.2f}s")
+            time.sleep(wait)
+        else:
+            if metrics:
+                metrics.incr("attempts")
+                metrics.incr("successes")
+            if breaker:
+                breaker.record_success()
+            return result
+        finally:
+            # Fatal client errors and cancellation leave no verdict; never wedge the breaker half-open
+            if trial:
+                breaker.release_trial()
 
-        return wrapper
 
-    return decorator
\ No newline at end of file
+async def acall_with_retry(func, policy, breaker=None, metrics=None, on_retry_after=None):
+    """
+    Async counterpart of `call_with_retry`; `func()` must return an awaitable.
+    """
+    started = time.monotonic()
+    if metrics:
+        metrics.incr("calls")
+    for attempt in range(policy.max_attempts):
+        try:
+            trial = breaker.allow() if breaker else False
+        except CircuitOpenError:
+            if metrics:
+                metrics.incr("rejected")
+            raise
+        try:
+            result = await func()
+        except Exception as e:
+            _on_failure(e, breaker, metrics)
+            wait = _next_wait(policy, attempt, e, started, on_retry_after)
+            if wait is None:
+                raise Exception(f"API request failed after {attempt + 1} attempt(s): {e}") from e
+            if metrics:
+                metrics.incr("retries")
+            print(f"Retry {attempt + 1} failed: {e} - retrying in {wait:.2f}s")
+            await asyncio.sleep(wait)
+        else:
+            if metrics:
+                metrics.incr("attempts")
+                metrics.incr("successes")
+            if breaker:
+                breaker.record_success()
+            return result
+        finally:
+            # Fatal client errors and cancellation leave no verdict; never wedge the breaker half-open
+            if trial:
+                breaker.release_trial()
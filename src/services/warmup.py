@@ -0,0 +1,247 @@
+import os
+import time
+import asyncio
+import tempfile
+
+from src.services.extract_skills import (
+    aprobe_backend,
+    backend_id,
+    get_async_generator,
+    get_async_llm,
+    get_completion_cache,
+    get_generator,
+    get_hedge_llm_settings,
+    get_job_cache,
+    get_llm,
+    get_prompt_tokenizer,
+    get_settings,
+    get_stage_llm_settings,
+)
+from src.services.rendering import WARMUP_RESUME, get_render_service
+from src.services.schemas import skills, Experiences, projects, tailored_sections, tailored_resume
+
+
+# Structured-output schemas requested by each stage
+STAGE_SCHEMAS = {
+    "skills": [skills],
+    "projects": [projects],
+    "experiences": [Experiences],
+    "summary": [],
+    "combined": [tailored_sections, tailored_resume],
+}
+
+def backend_label(llm_settings):
+    model_type, api_base, model_name = backend_id(llm_settings)
+    return f"{model_type}:{model_name}@{api_base}"
+
+
+def configured_backends():
+    """
+    Every backend a request may use: each stage's backend and, with hedging on, its
+    secondary. Returns {label: (llm_settings, stages, schemas)}.
+    """
+    backends = {}
+    for stage, schemas in STAGE_SCHEMAS.items():
+        llm_settings = get_stage_llm_settings(stage)
+        for candidate in (llm_settings, get_hedge_llm_settings(llm_settings)):
+            if candidate is None:
+                continue
+            _, stages, stage_schemas = backends.setdefault(backend_label(candidate), (candidate, [], []))
+            stages.append(stage)
+            stage_schemas.extend(schema for schema in schemas if schema not in stage_schemas)
+    return backends
+
+
+class Readiness:
+    """
+    Warm-up progress reported by the /ready endpoint.
+    """
+
+    def __init__(self):
+        self.warming = False
+        self.finished = False
+        self.attempts = 0
+        self.next_attempt_at = None
+        self.started_at = None
+        self.seconds = None
+        self.backends = {}
+        self.rendering = None
+
+    @property
+    def ready(self) -> bool:
+        if not self.finished or not (self.rendering or {}).get("ok"):
+            return False
+        if get_settings().server.ready_requires_backends:
+            return all(backend["ok"] for backend in self.backends.values())
+        return True
+
+    def skip(self):
+        """Mark the worker ready without warming up, for `server.warmup = false`."""
+        self.warming = False
+        self.finished = True
+        self.backends = {}
+        self.rendering = {"ok": True, "skipped": True}
+
+    def snapshot(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warming": self.warming,
+            "warmup_attempts": self.attempts,
+            "next_warmup_at": self.next_attempt_at,
+            "warmup_seconds": self.seconds,
+            "backends": self.backends,
+            "rendering": self.rendering,
+            "render_pool": get_render_service().snapshot(),
+        }
+
+
+readiness = Readiness()
+
+
+def _outlines_schemas(llm_settings, schemas):
+    # Only the outlines strategy compiles generators
+    return schemas if llm_settings.structured_output == "outlines" else []
+
+
+def _prepare_backend(llm_settings, schemas):
+    # Sync clients and compiled generators are shared by every worker thread
+    get_llm(llm_settings)
+    for schema_cls in _outlines_schemas(llm_settings, schemas):
+        get_generator(schema_cls, llm_settings)
+
+
+async def warm_backend(llm_settings, stages, schemas, probe=True, timeout=None):
+    """
+    Create a backend's clients and generators and, when `probe` is set, time one
+    tiny completion. Returns the status reported by /ready.
+    """
+    loop = asyncio.get_running_loop()
+    status = {"stages": stages, "ok": False, "setup_ms": None, "probe_ms": None, "error": None}
+    start = time.perf_counter()
+    try:
+        await loop.run_in_executor(None, _prepare_backend, llm_settings, schemas)
+        # Async clients are bound to an event loop; this is the loop that serves requests
+        get_async_llm(llm_settings)
+        for schema_cls in _outlines_schemas(llm_settings, schemas):
+            get_async_generator(schema_cls, llm_settings)
+        status["setup_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+        if probe:
+            probe_start = time.perf_counter()
+            await asyncio.wait_for(aprobe_backend(llm_settings), timeout)
+            status["probe_ms"] = round((time.perf_counter() - probe_start) * 1000, 1)
+        status["ok"] = True
+    except Exception as e:
+        status["error"] = f"{type(e).__name__}: {e}"
+    return status
+
+
+def warm_rendering():
+    """
+    Render WARMUP_RESUME to DOCX and PDF in a temporary directory and return the time taken.
+    """
+    from src.services.generate_resume import generate_compact_resume
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as directory:
+        generate_compact_resume(
+            WARMUP_RESUME, output_file=os.path.join(directory, "warmup.docx"), generate_pdf=True,
+            template=get_settings().render.docx_template,
+        )
+    return time.perf_counter() - start
+
+
+def _warm_local():
+    # Tokenizer files and the SQLite caches are loaded lazily on the first request
+    get_prompt_tokenizer()
+    get_completion_cache()
+    get_job_cache()
+    # Starts the rendering processes, which load python-docx and ReportLab themselves
+    return warm_rendering() + get_render_service().warm()
+
+
+async def warm_up(state=readiness):
+    """
+    Warm every configured backend and the renderers concurrently, updating `state` as
+    each part finishes.
+    """
+    settings = get_settings()
+    loop = asyncio.get_running_loop()
+    state.warming = True
+    state.attempts += 1
+    state.next_attempt_at = None
+    state.started_at = time.time()
+    start = time.perf_counter()
+    backends = configured_backends()
+    state.backends = {label: {"stages": stages, "ok": False} for label, (_, stages, _) in backends.items()}
+
+    async def backend(label, llm_settings, stages, schemas):
+        state.backends[label] = await warm_backend(
+            llm_settings, stages, schemas, probe=settings.server.warmup_probe, timeout=settings.server.warmup_timeout
+        )
+
+    async def rendering():
+        try:
+            seconds = await loop.run_in_executor(None, _warm_local)
+            state.rendering = {"ok": True, "ms": round(seconds * 1000, 1)}
+        except Exception as e:
+            state.rendering = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    try:
+        await asyncio.gather(
+            rendering(),
+            *(backend(label, *entry) for label, entry in backends.items()),
+        )
+    finally:
+        state.warming = False
+        state.finished = True
+        state.seconds = round(time.perf_counter() - start, 3)
+
+    for label, status in state.backends.items():
+        if status["ok"]:
+            print(f"warm-up {label}: setup {status['setup_ms']} ms, probe {status['probe_ms']} ms")
+        else:
+            print(f"warm-up {label} failed: {status['error']}")
+    print(f"warm-up finished in {state.seconds:.2f}s - ready: {state.ready}")
+    return state.snapshot()
+
+
+MAX_RETRY_SECONDS = 300
+
+_tasks = set()
+
+
+async def warm_up_until_ready(state=readiness):
+    """
+    Run `warm_up` until the worker is ready, waiting `server.warmup_retry_seconds`
+    (doubling up to MAX_RETRY_SECONDS) after each attempt that left it unready, so a
+    backend that was down at startup is probed again and the worker can recover.
+    """
+    delay = get_settings().server.warmup_retry_seconds
+    while True:
+        await warm_up(state)
+        if state.ready:
+            return
+        state.next_attempt_at = time.time() + delay
+        print(f"not ready after warm-up - warming up again in {delay:.0f}s")
+        await asyncio.sleep(delay)
+        delay = min(MAX_RETRY_SECONDS, delay * 2)
+
+
+def start_warm_up(state=readiness):
+    """
+    Run `warm_up_until_ready` in the background unless it is already running. Returns
+    the task or None.
+    """
+    if _tasks:
+        return None
+    state.warming = True
+    task = asyncio.create_task(warm_up_until_ready(state))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+def cancel_warm_up():
+    for task in list(_tasks):
+        task.cancel()
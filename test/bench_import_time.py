@@ -0,0 +1,82 @@
+"""
+Cold-start import benchmark.
+
+Imports each entry point in a fresh interpreter under `python -X importtime`, keeps the
+best of several runs and fails when a module is over its budget or pulls in a provider
+SDK at import time. Run from the repository root:
+
+    python test/bench_import_time.py [--runs 5] [--scale 1.0]
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+
+# Cumulative import time budgets in seconds for each entry point
+BUDGETS = {
+    "src.services.extract_skills": 0.5,
+    "src.services.core": 1.0,
+    "src.services.start": 1.0,
+    "main": 2.0,
+}
+
+# Must only be loaded once a request is made for the configured backend
+LAZY_MODULES = ["openai", "ollama", "outlines", "google.genai", "llama_index.core", "httpx"]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module):
+    """
+    Return (seconds, eagerly loaded lazy modules) for one cold import of `module`.
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # Lines look like "import time:  self [us] | cumulative | name"
+    seconds = None
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            seconds = int(parts[1]) / 1e6
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return seconds, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check cold-start import time against budgets.")
+    parser.add_argument("--runs", type=int, default=5, help="Imports per module; the fastest is kept.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, e.g. on slow CI machines.")
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in BUDGETS.items():
+        budget *= args.scale
+        try:
+            runs = [measure(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{module:32} ERROR  {e}")
+            failed = True
+            continue
+
+        seconds = min(run[0] for run in runs)
+        loaded = runs[0][1]
+        ok = seconds <= budget and not loaded
+        failed = failed or not ok
+        note = f"  eagerly imports {', '.join(loaded)}" if loaded else ""
+        print(f"{module:32} {'ok  ' if ok else 'FAIL'}  {seconds:.3f}s / {budget:.3f}s{note}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
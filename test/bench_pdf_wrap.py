@@ -0,0 +1,104 @@
+"""
+PDF text wrapping micro-benchmark.
+
+Wraps a large synthetic experience section with the previous wrapping loop (which
+re-measured the whole growing line for every word) and with `generate_pdfs.wrap_runs`,
+the wrapping render_pdf uses, checks both produce the same lines and reports throughput. Run from the repository root:
+
+    python test/bench_pdf_wrap.py [--experiences 50] [--bullets 8] [--words 40] [--paragraph_words 2000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase import pdfmetrics
+
+from src.services.generate_pdfs import line_segments, token_width, wrap_runs
+from src.services.layout import Run
+
+
+# Same line width as an indented bullet in render_pdf
+MAX_WIDTH = letter[0] - 2 * 35 - 10
+FONT, SIZE = "Helvetica", 12
+
+VOCABULARY = (
+    "delivered maintained developed customer service retail team members inventory "
+    "Python APIs FastAPI PostgreSQL deployed Kubernetes reduced latency improved "
+    "accuracy trained new hires operated POS system processed payments organised "
+    "displays collaborated with stakeholders automated reports dashboards"
+).split()
+
+
+def legacy_wrap(text, max_width, font, size):
+    """The wrapping loop save_as_pdf used before wrap_runs."""
+    lines, current_line = [], ""
+    for word in text.split(" "):
+        test_line = f"{current_line} {word}".strip()
+        if pdfmetrics.stringWidth(test_line, font, size) <= max_width:
+            current_line = test_line
+        else:
+            lines.append(current_line)
+            current_line = word
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+def wrap_plain(text, max_width, font, size):
+    """Wrap one plain run with wrap_runs and merge each line into text, as render_pdf draws it."""
+    return [
+        "".join(segment[0] for segment in line_segments(line, 0))
+        for line in wrap_runs([Run(text)], max_width, size)
+    ]
+
+
+def make_bullets(experiences, bullets, words, rng):
+    return [
+        "- " + " ".join(rng.choice(VOCABULARY) for _ in range(words))
+        for _ in range(experiences * bullets)
+    ]
+
+
+def run(wrap, texts, repeat):
+    best, lines = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        lines = [wrap(text, MAX_WIDTH, FONT, SIZE) for text in texts]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, lines
+
+
+def report(name, texts, repeat):
+    words = sum(len(text.split()) for text in texts)
+    legacy_seconds, legacy_lines = run(legacy_wrap, texts, repeat)
+    token_width.cache_clear()
+    cold_seconds, _ = run(wrap_plain, texts, 1)
+    warm_seconds, lines = run(wrap_plain, texts, repeat)
+    same = "same lines" if lines == legacy_lines else "LINES DIFFER"
+    print(f"{name} ({len(texts)} texts, {words} words) - {same}")
+    for label, seconds in (("legacy", legacy_seconds), ("wrap_runs cold", cold_seconds), ("wrap_runs warm", warm_seconds)):
+        print(f"  {label:16} {seconds * 1000:9.2f} ms  {words / seconds / 1e6:7.2f} M words/s  {legacy_seconds / seconds:6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PDF text wrapping throughput.")
+    parser.add_argument("--experiences", type=int, default=50, help="Experiences in the synthetic section.")
+    parser.add_argument("--bullets", type=int, default=8, help="Responsibilities per experience.")
+    parser.add_argument("--words", type=int, default=40, help="Words per responsibility.")
+    parser.add_argument("--paragraph_words", type=int, default=2000, help="Words in the single long paragraph case.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the fastest is kept.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    report("experience bullets", make_bullets(args.experiences, args.bullets, args.words, rng), args.repeat)
+    report("long paragraph", [" ".join(rng.choice(VOCABULARY) for _ in range(args.paragraph_words))], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
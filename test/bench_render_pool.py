@@ -0,0 +1,85 @@
+"""
+Rendering throughput benchmark.
+
+Renders the same resume to DOCX and PDF `--requests` times from `--concurrency`
+threads, first with `generate_compact_resume` (both formats serially in the calling
+thread, as before the rendering service) and then through `RenderService`, and reports
+wall time and per-request latency. Run from the repository root:
+
+    python test/bench_render_pool.py [--resume demo.json] [--requests 40] [--concurrency 8] [--workers 4]
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.generate_resume import generate_compact_resume
+from src.services.rendering import WARMUP_RESUME, RenderService
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p / 100 * len(samples)))]
+
+
+def load_resume(name):
+    if not name:
+        return WARMUP_RESUME
+    with open(os.path.join("json_files", name), "r") as file:
+        return json.load(file)
+
+
+def run(render, resume, requests, concurrency, directory):
+    def one(i):
+        start = time.perf_counter()
+        render(resume, os.path.join(directory, f"resume_{i}.docx"))
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as threads:
+        latencies = list(threads.map(one, range(requests)))
+    return time.perf_counter() - start, latencies
+
+
+def report(name, wall, latencies):
+    print(
+        f"{name:24} wall {wall:7.2f}s  {len(latencies) / wall:7.1f} resumes/s  "
+        f"p50 {percentile(latencies, 50) * 1000:8.1f} ms  p95 {percentile(latencies, 95) * 1000:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare in-thread rendering with the rendering process pool.")
+    parser.add_argument("--resume", default="", help="Resume JSON in json_files/ (default: the warm-up resume).")
+    parser.add_argument("--requests", type=int, default=40, help="Resumes to render per case.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Threads submitting renders at once.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Rendering processes.")
+    args = parser.parse_args()
+
+    resume = load_resume(args.resume)
+    service = RenderService(workers=args.workers, max_pending=args.concurrency)
+    print(f"{args.requests} resumes, {args.concurrency} concurrent, {args.workers} rendering processes")
+    print(f"pool started in {service.warm():.2f}s\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Untimed: the in-thread path loads python-docx and ReportLab on first use
+        generate_compact_resume(resume, os.path.join(directory, "warmup.docx"), generate_pdf=True)
+        report(
+            "in-thread (serial)",
+            *run(lambda data, path: generate_compact_resume(data, path, generate_pdf=True), resume, args.requests, args.concurrency, directory),
+        )
+        report(
+            "render service",
+            *run(lambda data, path: service.render(data, path, generate_pdf=True), resume, args.requests, args.concurrency, directory),
+        )
+    print(f"\n{service.snapshot()}")
+    service.close()
+
+
+if __name__ == "__main__":
+    main()
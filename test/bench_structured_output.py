@@ -0,0 +1,130 @@
+"""
+Structured-output strategy benchmark.
+
+Sends the same skills request through each structured-output strategy on the backend
+configured for `--stage` in settings.toml (set `model_type = "Replay"` for an offline
+run) and reports latency, failures and retries per strategy, then times the validating
+parser on clean and repaired answers. Run from the repository root:
+
+    python test/bench_structured_output.py [--requests 30] [--strategies native,outlines,json] [--stage skills]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.extract_skills import LLMSettings, _chat_completion, get_retry_metrics, get_stage_llm_settings
+from src.services.prompts import SKILLS_EXAMPLE, SKILLS_TASK, build_prompt
+from src.services.schemas import skills
+from src.services.structured import STRATEGIES, parse_structured
+from src.services.tokens import compact_json
+from src.services.usage import stage_context
+
+
+JOB_DESCRIPTION = (
+    "Backend developer. Build and maintain REST APIs in Python with FastAPI and PostgreSQL, "
+    "write automated tests, review code and deploy services with Docker and Kubernetes."
+)
+
+CURRENT_SKILLS = [
+    {"name": "Programming", "description": ["Python", "SQL", "JavaScript"]},
+    {"name": "Web", "description": ["FastAPI", "REST APIs", "HTML"]},
+    {"name": "Tools", "description": ["Git", "Docker", "Linux"]},
+    {"name": "Customer service", "description": ["POS systems", "Cash handling"]},
+]
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p / 100 * len(samples)))]
+
+
+def request(strategy, i):
+    # A different job per request so nothing is served from a cache
+    return build_prompt(
+        f"{JOB_DESCRIPTION} ({strategy} request {i})", SKILLS_TASK, SKILLS_EXAMPLE,
+        [("Current Skills", compact_json(CURRENT_SKILLS))],
+    )
+
+
+def complete(prompt, stage, llm_settings):
+    # chat_completion would use the stage's shared settings; send this strategy's copy uncached instead
+    with stage_context(stage):
+        return _chat_completion(prompt, schema_cls=skills, llm_settings=llm_settings)
+
+
+def bench_strategy(strategy, stage, requests):
+    # A validated copy: the cached stage settings stay untouched and unknown strategies fail here
+    llm_settings = LLMSettings.model_validate({**get_stage_llm_settings(stage).model_dump(), "structured_output": strategy})
+    # Untimed: the first call pays for lazy imports, clients and generator compilation
+    try:
+        complete(request(strategy, "warm-up"), stage, llm_settings)
+    except Exception as e:
+        print(f"  {strategy}: warm-up request failed: {type(e).__name__}: {e}")
+    before = get_retry_metrics(llm_settings).snapshot()
+
+    latencies, failures = [], 0
+    for i in range(requests):
+        prompt = request(strategy, i)
+        start = time.perf_counter()
+        try:
+            complete(prompt, stage, llm_settings)
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            failures += 1
+            print(f"  {strategy}: request {i} failed: {type(e).__name__}: {e}")
+
+    after = get_retry_metrics(llm_settings).snapshot()
+    return {
+        "ok": len(latencies),
+        "failed": failures,
+        "retries": after.get("retries", 0) - before.get("retries", 0),
+        "p50": percentile(latencies, 50) if latencies else None,
+        "p95": percentile(latencies, 95) if latencies else None,
+    }
+
+
+def bench_parser(iterations):
+    clean = skills.model_validate({"skills": CURRENT_SKILLS}).model_dump_json()
+    sloppy = "Here you go:\n```json\n" + json.dumps({"skills": CURRENT_SKILLS}, indent=2).replace("]\n", "],\n", 1) + "\n```"
+    cases = {
+        "json.loads + model_validate": lambda: skills.model_validate(json.loads(clean)),
+        "parse_structured (clean)": lambda: parse_structured(clean, skills),
+        "parse_structured (repaired)": lambda: parse_structured(sloppy, skills),
+    }
+    results = {}
+    for name, parse in cases.items():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            parse()
+        results[name] = (time.perf_counter() - start) / iterations * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare structured-output strategies on the configured backend.")
+    parser.add_argument("--requests", type=int, default=30, help="Requests per strategy.")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help="Comma-separated strategies to compare.")
+    parser.add_argument("--stage", default="skills", help="Stage whose backend is used ([stages.<stage>] or [llm]).")
+    parser.add_argument("--parser_iterations", type=int, default=5000, help="Parses per parser case.")
+    args = parser.parse_args()
+
+    llm_settings = get_stage_llm_settings(args.stage)
+    print(f"backend {llm_settings.model_type}:{llm_settings.model_name}, {args.requests} requests per strategy\n")
+    print(f"{'strategy':10} {'ok':>4} {'failed':>7} {'retries':>8} {'p50 ms':>9} {'p95 ms':>9}")
+    for strategy in args.strategies.split(","):
+        result = bench_strategy(strategy.strip(), args.stage, args.requests)
+        p50 = f"{result['p50'] * 1000:9.1f}" if result["p50"] is not None else f"{'-':>9}"
+        p95 = f"{result['p95'] * 1000:9.1f}" if result["p95"] is not None else f"{'-':>9}"
+        print(f"{strategy:10} {result['ok']:4} {result['failed']:7} {result['retries']:8} {p50} {p95}")
+
+    print()
+    for name, micros in bench_parser(args.parser_iterations).items():
+        print(f"{name:30} {micros:8.1f} us/parse")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services import batch
+from src.services.batch import Manifest, _run_job
+
+JOB = {"job_id": "python_dev", "job_name": "Python dev", "job_description": "Python developer"}
+
+
+class FakeRenderer:
+    def render(self, resume, output_file, generate_pdf=True):
+        with open(output_file, "w") as file:
+            file.write("docx")
+
+
+def run(monkeypatch, tmp_path, outcomes):
+    monkeypatch.setattr(batch, "tailor_resume_with_outcomes", lambda job_description, resume, **options: (resume, outcomes))
+    manifest = Manifest(str(tmp_path / "manifest.json"))
+    status = _run_job(JOB, {}, str(tmp_path), FakeRenderer(), manifest, False, {})
+    return status, Manifest(manifest.path)
+
+
+def test_fully_tailored_job_is_done(monkeypatch, tmp_path):
+    outcomes = {"skills": "tailored", "projects": "tailored", "experiences": "cached", "summary": "tailored"}
+    status, manifest = run(monkeypatch, tmp_path, outcomes)
+    assert status == "done"
+    assert manifest.is_done("python_dev")
+    assert manifest.data["jobs"]["python_dev"]["stages"] == outcomes
+
+
+def test_job_with_fallback_stages_is_degraded_and_retried(monkeypatch, tmp_path):
+    outcomes = {"skills": "fallback", "projects": "tailored", "experiences": "tailored", "summary": "tailored"}
+    status, manifest = run(monkeypatch, tmp_path, outcomes)
+    assert status == "degraded"
+    assert manifest.data["jobs"]["python_dev"]["error"] == "kept the original skills"
+    assert not manifest.is_done("python_dev")
+
+
+def test_job_whose_every_stage_fell_back_failed(monkeypatch, tmp_path):
+    status, manifest = run(monkeypatch, tmp_path, dict.fromkeys(("skills", "projects", "experiences", "summary"), "fallback"))
+    assert status == "failed"
+    assert not manifest.is_done("python_dev")
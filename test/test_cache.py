@@ -0,0 +1,90 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services import cache as cache_module, extract_skills
+from src.services.cache import CompletionCache
+from src.services.extract_skills import LLMSettings, _completion_cache_key, chat_completion, get_settings
+from src.services.structured import STRATEGIES
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        # Every call is a distinct instant, so access order is unambiguous
+        self.now += 1
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = CompletionCache(str(tmp_path / "completions.sqlite3"), max_entries=2, ttl_seconds=100)
+    yield cache
+    cache.close()
+
+
+def test_hits_and_misses_are_counted(cache):
+    assert cache.get("a") is None
+    cache.set("a", "response")
+    assert cache.get("a") == "response"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+
+
+def test_expired_entries_are_dropped(cache, clock):
+    cache.set("a", "1")
+    clock.now += 100
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_entries_survive_a_restart(tmp_path, clock):
+    path = str(tmp_path / "completions.sqlite3")
+    first = CompletionCache(path)
+    first.set("a", "1")
+    first.close()
+    second = CompletionCache(path)
+    assert second.get("a") == "1"
+    second.close()
+
+
+def test_key_covers_every_backend_setting():
+    base = get_settings().llm
+    key = _completion_cache_key("prompt", None, None, base)
+    assert key == _completion_cache_key("prompt", None, None, LLMSettings.model_validate(base.model_dump()))
+    for update in ({"max_new_tokens": base.max_new_tokens + 1}, {"api_base": "http://other:8000/v1"},
+                   {"structured_output": next(s for s in STRATEGIES if s != base.structured_output)}, {"extra_arguments": {"top_k": 5}}):
+        other = LLMSettings.model_validate({**base.model_dump(), **update})
+        assert _completion_cache_key("prompt", None, None, other) != key
+
+
+def test_use_cache_false_bypasses_the_cache(monkeypatch, cache):
+    calls = []
+    monkeypatch.setattr(extract_skills, "get_completion_cache", lambda: cache)
+    monkeypatch.setattr(extract_skills, "check_prompt_budget", lambda *args: 0)
+    monkeypatch.setattr(extract_skills, "_chat_completion", lambda *args: calls.append(args) or f"response {len(calls)}")
+
+    assert chat_completion("prompt") == "response 1"
+    assert chat_completion("prompt") == "response 1"
+    assert chat_completion("prompt", use_cache=False) == "response 2"
+    assert len(calls) == 2
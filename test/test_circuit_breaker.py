@@ -0,0 +1,145 @@
+import os
+import sys
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.utils import (
+    CircuitBreaker, CircuitOpenError, RetryMetrics, RetryPolicy, acall_with_retry, call_with_retry,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def half_open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    assert breaker.state == "half-open"
+    return breaker
+
+
+def raise_(error):
+    raise error
+
+
+def flaky(*outcomes):
+    # Each call returns the next outcome, raising it when it is an exception
+    outcomes = iter(outcomes)
+
+    def call():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return call
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr("src.services.utils.time.sleep", lambda seconds: None)
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow() is False
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_lets_a_single_trial_through():
+    breaker = half_open_breaker()
+    assert breaker.allow() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_retries_until_success_and_counts_attempts():
+    breaker = CircuitBreaker(failure_threshold=5)
+    metrics = RetryMetrics()
+    call = flaky(StatusError(503), StatusError(429), "ok")
+    assert call_with_retry(call, RetryPolicy(max_attempts=3), breaker=breaker, metrics=metrics) == "ok"
+    assert breaker.state == "closed"
+    assert metrics.snapshot() == {
+        "calls": 1, "attempts": 3, "retries": 2, "successes": 1, "failures": 2, "fatal": 0, "rejected": 0,
+    }
+
+
+def test_client_errors_are_not_retried_or_counted_against_the_backend():
+    breaker = CircuitBreaker(failure_threshold=1)
+    metrics = RetryMetrics()
+    with pytest.raises(Exception, match="after 1 attempt"):
+        call_with_retry(flaky(StatusError(400), "ok"), RetryPolicy(max_attempts=3), breaker=breaker, metrics=metrics)
+    assert breaker.state == "closed"
+    assert metrics.snapshot()["fatal"] == 1
+
+
+def test_open_breaker_rejects_without_calling_the_backend():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    metrics = RetryMetrics()
+    # The circuit opens mid-retry and the third attempt is never sent
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(flaky(StatusError(500), StatusError(500)), RetryPolicy(max_attempts=3), breaker=breaker)
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(flaky(), RetryPolicy(max_attempts=3), breaker=breaker, metrics=metrics)
+    assert metrics.snapshot()["rejected"] == 1
+    assert metrics.snapshot()["attempts"] == 0
+
+
+def test_fatal_error_in_half_open_trial_releases_it():
+    breaker = half_open_breaker()
+    with pytest.raises(Exception, match="HTTP 400"):
+        call_with_retry(lambda: raise_(StatusError(400)), RetryPolicy(max_attempts=1), breaker=breaker)
+
+    # The 400 says nothing about the backend: the next call is a fresh trial, and it closes the circuit
+    assert call_with_retry(lambda: "ok", RetryPolicy(max_attempts=1), breaker=breaker) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_cancelled_half_open_trial_releases_it():
+    breaker = half_open_breaker()
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def cancel_trial():
+        task = asyncio.create_task(acall_with_retry(hang, RetryPolicy(max_attempts=1), breaker=breaker))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+    assert breaker.allow() is True
+
+
+def test_failed_half_open_trial_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    breaker._opened_at -= 60
+    with pytest.raises(Exception, match="HTTP 503"):
+        call_with_retry(lambda: raise_(StatusError(503)), RetryPolicy(max_attempts=1), breaker=breaker)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
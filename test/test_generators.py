@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.generators import SchemaStore, build_generator, schema_fingerprint
+from src.services.replay import ReplayBackend, ReplayModel
+from src.services.schemas import skills, projects
+
+
+def test_replay_model_gets_a_schema_bound_generator_even_with_outlines_imported():
+    pytest.importorskip("outlines")
+    generator = build_generator(ReplayModel(ReplayBackend()), skills, SchemaStore())
+    assert skills.model_validate_json(generator("Tailor the skills."))
+
+
+def test_unknown_models_are_rejected():
+    with pytest.raises(TypeError):
+        build_generator(lambda prompt: "{}", skills, SchemaStore())
+
+
+def test_schema_store_persists_compiled_schemas(tmp_path):
+    path = str(tmp_path / "schemas.json")
+    SchemaStore(path).json_schema(skills)
+    store = SchemaStore(path)
+    assert schema_fingerprint(skills) in store._entries
+    assert schema_fingerprint(skills) != schema_fingerprint(projects)
@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.hedging import HedgeMetrics, HedgePolicy, LatencyTracker, ahedged_call, hedged_call
+
+
+def fail():
+    raise RuntimeError("primary down")
+
+
+def test_failing_primary_fails_over_without_waiting_for_the_delay():
+    metrics = HedgeMetrics()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(2) as executor:
+        assert hedged_call(fail, lambda: "secondary", 10, executor, metrics=metrics) == "secondary"
+    assert time.perf_counter() - start < 5
+    assert metrics.snapshot() == {"calls": 1, "hedged": 0, "failovers": 1, "secondary_wins": 1}
+
+
+def test_slow_primary_is_hedged():
+    metrics = HedgeMetrics()
+    with ThreadPoolExecutor(2) as executor:
+        result = hedged_call(lambda: time.sleep(1) or "primary", lambda: "secondary", 0.05, executor, metrics=metrics)
+    assert result == "secondary"
+    assert metrics.snapshot()["hedged"] == 1
+
+
+def test_fast_primary_is_not_hedged():
+    metrics = HedgeMetrics()
+    with ThreadPoolExecutor(2) as executor:
+        assert hedged_call(lambda: "primary", lambda: "secondary", 10, executor, metrics=metrics) == "primary"
+    assert metrics.snapshot() == {"calls": 1, "hedged": 0, "failovers": 0, "secondary_wins": 0}
+
+
+def test_async_failing_primary_fails_over_without_waiting_for_the_delay():
+    metrics = HedgeMetrics()
+
+    async def primary():
+        fail()
+
+    async def secondary():
+        return "secondary"
+
+    async def run():
+        return await asyncio.wait_for(ahedged_call(primary, secondary, 10, metrics=metrics), timeout=5)
+
+    assert asyncio.run(run()) == "secondary"
+    assert metrics.snapshot()["failovers"] == 1
+
+
+def test_async_call_fails_when_both_backends_do():
+    async def primary():
+        fail()
+
+    async def secondary():
+        raise RuntimeError("secondary down")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(ahedged_call(primary, secondary, 10))
+
+
+def test_policy_uses_the_initial_delay_until_enough_samples():
+    tracker = LatencyTracker(window=10)
+    policy = HedgePolicy(percentile=50, initial_delay_seconds=10, min_delay_seconds=0.5, min_samples=4)
+    for seconds in (1, 2, 3):
+        tracker.record(seconds)
+    assert policy.delay(tracker) == 10
+    tracker.record(4)
+    assert policy.delay(tracker) == 2
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.jobcache import JobCache, minhash_signature, normalise_job_description, shingles
+
+POSTING = (
+    "Senior Python developer to build FastAPI services on PostgreSQL and Kubernetes. "
+    "You will own data pipelines, mentor engineers, review code and improve latency "
+    "across our payments platform. We offer remote work, a learning budget, flexible hours and a "
+    "friendly team that values clear writing, careful testing and steady delivery. Apply at https://jobs.example.com/123?ref=feed. Posted 3 days ago."
+)
+SECTIONS = {"skills": {"skills": []}, "summary": {"summary": "Tailored."}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = JobCache(str(tmp_path / "jobs.sqlite3"), threshold=0.8)
+    yield cache
+    cache.close()
+
+
+def test_normalisation_drops_reposting_noise():
+    reposted = POSTING.replace("https://jobs.example.com/123?ref=feed", "https://jobs.example.com/999").replace(
+        "Posted 3 days ago", "Reposted on 2024-05-01"
+    )
+    assert normalise_job_description(POSTING) == normalise_job_description(reposted)
+
+
+def test_minhash_estimates_jaccard_similarity():
+    a = shingles(normalise_job_description(POSTING))
+    b = shingles(normalise_job_description(POSTING.replace("mentor engineers", "hire engineers")))
+    jaccard = len(a & b) / len(a | b)
+    estimate = (minhash_signature(a, 256) == minhash_signature(b, 256)).mean()
+    assert estimate == pytest.approx(jaccard, abs=0.1)
+    assert (minhash_signature(a) == minhash_signature(a)).all()
+
+
+def test_exact_and_near_duplicate_postings_hit(cache):
+    cache.store("scope", POSTING, SECTIONS)
+    assert cache.lookup("scope", POSTING.upper()) == (SECTIONS, 1.0)
+
+    sections, similarity = cache.lookup("scope", POSTING.replace("review code", "review designs"))
+    assert sections == SECTIONS
+    assert 0.8 <= similarity < 1.0
+    assert cache.stats()["near_duplicate_hits"] == 1
+
+
+def test_different_posting_or_scope_misses(cache):
+    cache.store("scope", POSTING, SECTIONS)
+    assert cache.lookup("scope", "Barista wanted for a busy downtown cafe, weekend shifts, latte art a plus.") is None
+    assert cache.lookup("other scope", POSTING) is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_oldest_postings_are_evicted_per_scope(tmp_path):
+    cache = JobCache(str(tmp_path / "jobs.sqlite3"), max_entries_per_scope=2)
+    for n in range(3):
+        cache.store("scope", f"posting number {n} " * 5 + POSTING[n * 40:], {"n": n})
+    cache.store("other", POSTING, SECTIONS)
+    assert cache.stats()["entries"] == 3
+    cache.close()
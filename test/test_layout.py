@@ -0,0 +1,56 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.layout import BULLET, CONTACT, HEADING, STYLES, TITLE, clean, layout_resume
+from src.services.rendering import WARMUP_RESUME
+
+
+def test_clean_collapses_whitespace_and_joins_lists():
+    assert clean("  two\n words ") == "two words"
+    assert clean(["a", " ", None, "b"]) == "a, b"
+    assert clean(None, "N/A") == "N/A"
+    assert clean("   ", "N/A") == "N/A"
+
+
+def test_layout_of_a_tailored_resume():
+    layout = layout_resume(WARMUP_RESUME)
+    assert [section.title for section in layout.sections] == [
+        None, "Summary", "Education", "Technical Skills", "Project Experience", "Work Experience", "Availability",
+    ]
+    blocks = list(layout.blocks())
+    assert blocks[0].kind == TITLE and blocks[0].text == "Warm Up"
+    assert blocks[1].kind == CONTACT and "warm@up.test" in blocks[1].text
+    assert [block.text for block in blocks if block.kind == HEADING][0] == "Summary"
+    assert [block.text for block in blocks if block.kind == BULLET] == ["Responsibility."]
+    assert any(block.text == "Skill: One, Two" for block in blocks)
+
+
+def test_every_section_ends_with_a_rule():
+    for section in layout_resume(WARMUP_RESUME).sections:
+        assert section.blocks[-1].rule_after
+        assert not any(block.rule_after for block in section.blocks[:-1])
+
+
+def test_blocks_take_their_metrics_from_the_named_style():
+    for block in layout_resume(WARMUP_RESUME).blocks():
+        spec = STYLES[block.style]
+        assert block.size == spec["size"]
+        assert block.space_after == spec["space_after"]
+
+
+def test_empty_sections_are_dropped_and_bare_lists_accepted():
+    layout = layout_resume({
+        "header": {"name": "Name"},
+        "summary": "  ",
+        "skills": [{"name": "Python", "description": "Django"}],
+        "experience": {"experiences": []},
+    })
+    assert [section.title for section in layout.sections] == [None, "Technical Skills"]
+
+
+def test_links_in_the_contact_line():
+    layout = layout_resume({"header": {"name": "N", "contact": {"email": "a@b.c", "linkedin": "linkedin.com/in/n"}}})
+    links = [run.link for run in layout.sections[0].blocks[1].runs if run.link]
+    assert links == ["linkedin.com/in/n", "mailto:a@b.c"]
@@ -0,0 +1,68 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.generate_pdfs import line_segments, token_width, wrap_runs
+from src.services.layout import Run
+
+TEXT = (
+    "Designed and shipped a FastAPI service backed by PostgreSQL that reduced report "
+    "latency by forty percent while mentoring two new engineers on the team"
+)
+
+
+def width(line, font="Helvetica", size=12):
+    return token_width(line, font, size)
+
+
+def wrap_plain(text, max_width, size=12):
+    # Lines of a single plain run as render_pdf draws them
+    return ["".join(segment[0] for segment in line_segments(line, 0)) for line in wrap_runs([Run(text)], max_width, size)]
+
+
+def test_wrapped_lines_keep_every_word_and_fit_the_width():
+    lines = wrap_plain(TEXT, 200)
+    assert len(lines) > 1
+    assert " ".join(lines).split() == TEXT.split()
+    assert all(width(line) <= 200 for line in lines)
+    # Greedy: the next word would not have fitted on the previous line
+    for line, following in zip(lines, lines[1:]):
+        assert width(f"{line} {following.split()[0]}") > 200
+
+
+def test_words_longer_than_a_line_are_broken():
+    word = "x" * 200
+    lines = wrap_plain(f"short {word} end", 100)
+    assert "".join(lines).replace(" ", "") == f"short{word}end"
+    assert all(width(line) <= 100 for line in lines)
+
+
+def test_wrapping_empty_text():
+    assert wrap_runs([Run("")], 100) == []
+    assert wrap_runs([Run("   ")], 100) == []
+
+
+def test_wrap_runs_keeps_adjacent_runs_together_as_one_word():
+    runs = [Run("Fast", bold=True), Run("API"), Run(" services")]
+    lines = wrap_runs(runs, token_width("FastAPI", "Helvetica-Bold", 12), size=12)
+    assert [[[fragment[0] for fragment in fragments] for _, fragments in line] for line in lines] == [
+        [["Fast", "API"]], [["services"]],
+    ]
+
+
+def test_line_segments_draw_each_run_once():
+    runs = [Run("Title: ", bold=True), Run("Python developer with FastAPI experience")]
+    lines = wrap_runs(runs, 1000, size=11)
+    assert len(lines) == 1
+    segments = list(line_segments(lines[0], 10))
+    assert [text for text, *_ in segments] == ["Title:", "Python developer with FastAPI experience"]
+    assert segments[0][1] == "Helvetica-Bold" and segments[1][1] == "Helvetica"
+    # Segments are laid out left to right without overlapping
+    assert segments[0][4] == 10
+    assert segments[1][4] >= segments[0][4] + segments[0][5]
+
+
+def test_wrap_runs_uses_the_run_size():
+    small, large = wrap_runs([Run(TEXT, size=8)], 200), wrap_runs([Run(TEXT, size=16)], 200)
+    assert len(small) < len(large)
@@ -0,0 +1,96 @@
+import os
+import sys
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services import ratelimit
+from src.services.ratelimit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(ratelimit.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_bucket_allows_a_full_minute_of_requests_at_once(clock):
+    bucket = TokenBucket(60)
+    assert [bucket.reserve() for _ in range(60)] == [0.0] * 60
+    # Refilled at one token per second
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+
+
+def test_bucket_refills_over_time_up_to_capacity(clock):
+    bucket = TokenBucket(60)
+    for _ in range(60):
+        bucket.reserve()
+    clock.now += 30
+    assert [bucket.reserve() for _ in range(30)] == [0.0] * 30
+    assert bucket.reserve() > 0
+    clock.now += 3600
+    assert bucket.reserve(60) == 0.0
+
+
+def test_oversized_request_waits_for_a_full_bucket_instead_of_forever(clock):
+    bucket = TokenBucket(100)
+    bucket.reserve(50)
+    assert bucket.reserve(1000) == pytest.approx(30.0)
+
+
+def test_unlimited_limiter_never_waits(clock):
+    limiter = RateLimiter()
+    for _ in range(1000):
+        limiter.acquire(10_000)
+    assert clock.sleeps == []
+
+
+def test_acquire_waits_for_the_tightest_quota(clock):
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=1200)
+    limiter.acquire(1200)
+    assert clock.sleeps == []
+    # Plenty of requests left, but 600 prompt tokens take 30s to refill
+    limiter.acquire(600)
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+
+def test_pause_holds_back_every_caller(clock):
+    limiter = RateLimiter(requests_per_minute=600)
+    limiter.pause(5)
+    limiter.pause(2)
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(5.0)]
+    limiter.acquire()
+    assert len(clock.sleeps) == 1
+
+
+def test_aacquire_waits_with_asyncio_sleep(clock, monkeypatch):
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter(requests_per_minute=1)
+    asyncio.run(limiter.aacquire())
+    asyncio.run(limiter.aacquire())
+    assert waits == [pytest.approx(60.0)]
+    assert clock.sleeps == []
@@ -0,0 +1,55 @@
+import os
+import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.rendering import WARMUP_RESUME, RenderQueueFull, RenderService
+
+
+def test_async_callers_wait_for_a_slot_without_holding_an_executor_thread():
+    service = RenderService(workers=0, max_pending=1, queue_timeout=0.2)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(1))
+        slots = await service._aacquire()
+        waiting = asyncio.ensure_future(service.arender_bytes(WARMUP_RESUME, ("pdf",)))
+        await asyncio.sleep(0)
+        # The only default-executor thread stays free for cache and tokenizer work
+        assert await asyncio.wait_for(loop.run_in_executor(None, lambda: "free"), 0.1) == "free"
+        with pytest.raises(RenderQueueFull):
+            await waiting
+        service._release(None, slots)
+        return await service.arender_bytes(WARMUP_RESUME, ("pdf",))
+
+    assert asyncio.run(run())["pdf"].startswith(b"%PDF")
+    assert service.snapshot()["rejected"] == 1
+    assert service.snapshot()["rendered"] == 1
+    assert service.snapshot()["in_flight"] == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    service = RenderService(workers=0, max_pending=1, queue_timeout=5)
+
+    async def run():
+        slots = await service._aacquire()
+        waiting = asyncio.ensure_future(service.arender_bytes(WARMUP_RESUME, ("pdf",)))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        service._release(None, slots)
+        await asyncio.wait_for(service._aacquire(), 0.1)
+
+    asyncio.run(run())
+    assert service.snapshot()["in_flight"] == 1
+
+
+def test_each_event_loop_gets_its_own_slots():
+    service = RenderService(workers=0, max_pending=1, queue_timeout=5)
+    for _ in range(2):
+        assert asyncio.run(service.arender_bytes(WARMUP_RESUME, ("pdf",)))["pdf"].startswith(b"%PDF")
@@ -0,0 +1,49 @@
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.replay import ReplayBackend, ReplayLLM, ReplayModel, record_response, replay_key
+from src.services.schemas import skills
+from src.services.structured import schema_instruction
+
+RECORDED = json.dumps({"skills": [{"name": "Recorded", "description": ["Python"]}]})
+
+
+@pytest.fixture
+def backend(tmp_path):
+    path = str(tmp_path / "recordings.jsonl")
+    record_response(path, "Tailor the skills.", RECORDED, skills)
+    return ReplayBackend(path)
+
+
+def user_message(text):
+    from llama_index.core.llms import ChatMessage, MessageRole
+
+    return [ChatMessage(role=MessageRole.SYSTEM, content="system"), ChatMessage(role=MessageRole.USER, content=text)]
+
+
+@pytest.mark.parametrize("prompt", ["Tailor the skills.", "Tailor the skills." + schema_instruction(skills)])
+def test_recording_is_served_whatever_the_strategy(backend, prompt):
+    # native/outlines send the section prompt as is; json appends the schema to it
+    response = ReplayLLM(backend).chat(user_message(prompt), schema_cls=skills)
+    assert response.message.content == RECORDED
+
+
+def test_outlines_model_uses_the_same_key(backend):
+    assert ReplayModel(backend)("Tailor the skills.", skills) == RECORDED
+
+
+def test_key_depends_on_prompt_and_schema():
+    assert replay_key("a", skills) == replay_key("a", skills)
+    assert replay_key("a", skills) != replay_key("b", skills)
+    assert replay_key("a", skills) != replay_key("a")
+
+
+def test_unrecorded_requests_are_synthesised_deterministically(backend):
+    first = json.loads(backend.respond("Another prompt.", skills))
+    assert skills.model_validate(first)
+    assert backend.respond("Another prompt.", skills) == ReplayBackend(seed=0).respond("Another prompt.", skills)
@@ -0,0 +1,75 @@
+import os
+import sys
+import asyncio
+import argparse
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services import core, extract_skills
+
+SKILLS = [{"name": "Languages", "description": ["Python"]}]
+PROJECTS = [{"name": "Project", "description": "Built it."}]
+EXPERIENCES = [{"title": "Engineer", "company": "Co", "duration": "2020", "responsibilities": ["Shipped."]}]
+SUMMARY = "Original summary."
+
+
+def fail(*args, **kwargs):
+    raise RuntimeError("backend down")
+
+
+async def afail(*args, **kwargs):
+    fail()
+
+
+@pytest.fixture
+def fallbacks(monkeypatch):
+    monkeypatch.setattr(core, "preselect_sections", lambda job, *sections: sections)
+    return core._original_sections(SKILLS, PROJECTS, EXPERIENCES, SUMMARY)
+
+
+def test_extract_functions_raise_instead_of_returning_an_empty_section(monkeypatch):
+    monkeypatch.setattr(extract_skills, "chat_completion", fail)
+    monkeypatch.setattr(extract_skills, "achat_completion", afail)
+    with pytest.raises(RuntimeError):
+        extract_skills.extract_experiences_from_job("job", EXPERIENCES)
+    with pytest.raises(RuntimeError):
+        asyncio.run(extract_skills.aextract_skills_from_job("job", SKILLS))
+
+
+@pytest.mark.parametrize("execution_mode", ["sequential", "threads"])
+def test_failing_stages_keep_their_original_section(monkeypatch, fallbacks, execution_mode):
+    tailored = {"projects": [{"name": "Tailored", "description": "Tailored."}]}
+    monkeypatch.setattr(core, "extract_projects_from_job", lambda job, projects: tailored)
+    for name in ("extract_experiences_from_job", "extract_skills_from_job", "extract_summary_from_job"):
+        monkeypatch.setattr(core, name, fail)
+    args = argparse.Namespace(job_description="job", execution_mode=execution_mode, stage_timeout=5, tailoring_mode="multi")
+
+    results = core._tailor_sections(args, SKILLS, PROJECTS, EXPERIENCES, SUMMARY, fallbacks)
+    assert results == {**fallbacks, "projects": tailored}
+    assert not core._fully_tailored(results, fallbacks)
+
+
+def test_failing_async_stages_keep_their_original_section(monkeypatch, fallbacks):
+    async def summary(*args):
+        raise RuntimeError("backend down")
+        yield
+
+    monkeypatch.setattr(core, "aextract_projects_from_job", afail)
+    monkeypatch.setattr(core, "aextract_experiences_from_job", afail)
+    monkeypatch.setattr(core, "aextract_skills_from_job", afail)
+    monkeypatch.setattr(core, "astream_summary_from_job", summary)
+
+    async def run():
+        events = [event async for event in core._astream_sections("job", SKILLS, PROJECTS, EXPERIENCES, SUMMARY, fallbacks, 5, "multi")]
+        return events[-1]
+
+    assert asyncio.run(run()) == ("results", fallbacks)
+
+
+def test_section_outcomes_tell_tailored_from_fallback_sections(fallbacks):
+    sections = {**fallbacks, "skills": {"skills": [{"name": "Tailored", "description": ["Go"]}]}, "summary": {"summary": ""}}
+    assert core._section_outcomes(sections, fallbacks) == {
+        "skills": "tailored", "projects": "fallback", "experiences": "fallback", "summary": "fallback",
+    }
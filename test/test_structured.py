@@ -0,0 +1,42 @@
+import os
+import sys
+import json
+
+import pytest
+from pydantic import ValidationError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.schemas import skills
+from src.services.structured import parse_structured, repair_json
+
+SKILLS = {"skills": [{"name": "Programming", "description": ["Python", "SQL"]}]}
+
+
+@pytest.mark.parametrize("text", [
+    "```json\n" + json.dumps(SKILLS) + "\n```",
+    "Here are the tailored skills:\n" + json.dumps(SKILLS, indent=2) + "\nLet me know if you need changes.",
+    '{"skills": [{"name": "Programming", "description": ["Python", "SQL",],},],}',
+])
+def test_repair_json_undoes_formatting_slips(text):
+    assert json.loads(repair_json(text)) == SKILLS
+
+
+def test_repair_json_leaves_clean_json_alone():
+    text = json.dumps(SKILLS)
+    assert repair_json(text) == text
+
+
+def test_parse_structured_validates_clean_and_repaired_answers():
+    assert parse_structured(json.dumps(SKILLS), skills).model_dump() == SKILLS
+    assert parse_structured("```json\n" + json.dumps(SKILLS) + ",\n```", skills).model_dump() == SKILLS
+
+
+@pytest.mark.parametrize("text", [
+    json.dumps({"skills": "Python"}),
+    "I cannot help with that.",
+    "```json\n{\"skills\": [{\"name\": 1}]}\n```",
+])
+def test_parse_structured_rejects_answers_that_do_not_match_the_schema(text):
+    with pytest.raises(ValidationError):
+        parse_structured(text, skills)
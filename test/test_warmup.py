@@ -0,0 +1,24 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.warmup import Readiness
+
+
+def test_worker_is_not_ready_before_warm_up():
+    assert not Readiness().ready
+
+
+def test_worker_without_warm_up_is_ready():
+    state = Readiness()
+    state.skip()
+    assert state.ready
+    assert state.snapshot()["rendering"] == {"ok": True, "skipped": True}
+
+
+def test_failed_rendering_warm_up_is_not_ready():
+    state = Readiness()
+    state.finished = True
+    state.rendering = {"ok": False, "error": "OSError: no fonts"}
+    assert not state.ready